@@ -38,11 +38,11 @@ Word Count
     >>> replaced = next(strreplace.pipe(page, **replace_kwargs))
     >>> words = tokenizer.pipe(replaced, **token_kwargs)
     >>> counts = count.pipe(words, conf={'count_key': 'content'})
-    >>> next(counts) == {'$': 2}
+    >>> next(counts) == {'Tidy': 1}
     True
-    >>> next(counts) == {'$Date:': 1}
+    >>> next(counts) == {'your': 1}
     True
-    >>> next(counts) == {'$Revision:': 1}
+    >>> next(counts) == {'HTML': 1}
     True
 
     >>> ### Alternatively, create a SyncPipe workflow ###
@@ -57,7 +57,7 @@ Word Count
     ...     .count(conf={'count_key': 'content'})
     ...     .output)
     >>>
-    >>> next(stream) == {'$': 2}
+    >>> next(stream) == {'Tidy': 1}
     True
 
 
@@ -10,33 +10,117 @@ Examples:
 
         >>> from riko import get_path
         >>> from riko.bado.io import async_url_open
+
+Attributes:
+    CHUNK_SIZE (int): The number of bytes to feed a consumer at a time when
+        reading local files
 """
 from __future__ import (
     absolute_import, division, print_function, unicode_literals)
 
 import pygogo as gogo
 
-from io import open
-from tempfile import NamedTemporaryFile
-from os import remove
+from io import open, BytesIO
 
 from builtins import *  # noqa # pylint: disable=unused-import
-from meza.compat import encode
+from meza.compat import encode, decode
 
 from . import coroutine, return_value
+from .requests import get_pool
+from riko.httpcache import get_cache, get_validators, make_record
 
 try:
     from twisted.test.proto_helpers import AccumulatingProtocol
 except ImportError:
-    AccumulatingProtocol = object
+    AccumulatingProtocol = Protocol = object
 else:
+    from twisted.internet import reactor
+    from twisted.internet.defer import Deferred, succeed
+    from twisted.internet.protocol import Protocol
     from twisted.internet.reactor import callLater
     from twisted.protocols.basic import FileSender
-    from twisted.web.client import getPage, downloadPage
+    from twisted.web.client import Agent, RedirectAgent, ResponseDone
+    from twisted.web.error import Error
+    from twisted.web.http import NOT_MODIFIED, PotentialDataLoss
+    from twisted.web.http_headers import Headers
     from twisted.test.proto_helpers import StringTransport
 
 logger = gogo.Gogo(__name__, monolog=True).logger
 
+CHUNK_SIZE = 2 ** 16
+
+
+class BufferConsumer(object):
+    """A consumer that collects the fed data into a file like object"""
+    def __init__(self):
+        self.f = BytesIO()
+
+    def feed(self, data):
+        self.f.write(data)
+
+    def close(self):
+        self.f.seek(0)
+        return self.f
+
+
+class TeeConsumer(object):
+    """Feeds a consumer while also collecting the fed data"""
+    def __init__(self, consumer):
+        self.consumer = consumer
+        self.f = BytesIO()
+
+    def feed(self, data):
+        self.f.write(data)
+        self.consumer.feed(data)
+
+    def close(self):
+        return self.consumer.close()
+
+
+def get_headers(response, names=('ETag', 'Last-Modified', 'Content-Type')):
+    """Returns the first value of a twisted response's headers"""
+    values = ((n, response.headers.getRawHeaders(encode(n))) for n in names)
+    return {name: decode(value[0]) for name, value in values if value}
+
+
+class BodyReceiver(Protocol):
+    """Feeds each chunk of a response body to a consumer as soon as it
+    arrives.
+
+    Args:
+        consumer (obj): An object with a `feed(data)` method that is called
+            with each chunk, and a `close()` method that is called (once the
+            body is complete) to get the result, e.g.,
+            `riko.parsers.XMLConsumer`.
+
+        finished (obj): A Deferred that fires with the consumer's result
+    """
+    def __init__(self, consumer, finished):
+        self.consumer = consumer
+        self.finished = finished
+
+    def dataReceived(self, data):
+        try:
+            self.consumer.feed(data)
+        except Exception as e:
+            self.transport.stopProducing()
+            self.finished, finished = None, self.finished
+            finished.errback(e)
+
+    def connectionLost(self, reason):
+        if self.finished is None:
+            # the consumer failed and the error was already reported
+            return
+        elif reason.check(ResponseDone, PotentialDataLoss):
+            try:
+                result = self.consumer.close()
+            except Exception as e:
+                self.finished.errback(e)
+            else:
+                self.finished.callback(result)
+        else:
+            self.finished.errback(reason)
+
 
 # http://stackoverflow.com/q/26314586/408556
 # http://stackoverflow.com/q/8157197/408556
@@ -102,27 +186,109 @@ def async_get_file(filename, transport, protocol=FileReader, **kwargs):
     return_value(proto.transport.io)
 
 
+def async_file_parse(filename, consumer, chunk_size=CHUNK_SIZE):
+    with open(filename.replace('file://', ''), 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            consumer.feed(chunk)
+
+    return succeed(consumer.close())
+
+
 @coroutine
-def async_url_open(url, timeout=0, **kwargs):
+def async_url_parse(url, consumer, timeout=0, revalidate=False, key=None,
+                    **kwargs):
+    """Incrementally parses a url with a consumer. Chunks are fed to the
+    consumer as soon as they arrive, so neither the response body nor a
+    temporary file are ever held in full (unless the consumer holds them).
+
+    Args:
+        url (str): The url to parse
+        consumer (obj): An object with a `feed(data)` and a `close()`
+            method, e.g., `riko.parsers.XMLConsumer` (see `BodyReceiver`)
+
+        timeout (int): The connection timeout in seconds (default: 0, i.e.,
+            no timeout)
+
+        revalidate (bool): Make a conditional request using the validators
+            of the cached response, and parse the cached body if the url
+            wasn't modified (see `riko.httpcache`). (default: False)
+
+        key (str): Identifies the consumer (and its options). If set, the
+            consumer's result (a list) is cached as well, and returned
+            directly if the url wasn't modified (default: None).
+
+    Kwargs:
+        chunk_size (int): The number of bytes to feed the consumer at a time
+            when reading local files (default: CHUNK_SIZE)
+
+    Returns:
+        Deferred: twisted.internet.defer.Deferred which fires with the
+            consumer's result (or fails with a twisted.web.error.Error if
+            the response status isn't 2xx)
+    """
     if url.startswith('http'):
-        page = NamedTemporaryFile(delete=False)
-        new_url = page.name
-        yield downloadPage(encode(url), page, timeout=timeout)
+        cache = get_cache() if revalidate else None
+        record = cache.get(url) if cache else None
+        validators = get_validators(record)
+        headers = {encode(k): [encode(v)] for k, v in validators.items()}
+        kwargs = {'connectTimeout': timeout or None, 'pool': get_pool()}
+        agent = RedirectAgent(Agent(reactor, **kwargs))
+        response = yield agent.request(b'GET', encode(url), Headers(headers))
+
+        if record and response.code == NOT_MODIFIED:
+            cache.hits += 1
+            result = cache.get_items(record, key) if key else None
+
+            if result is None:
+                consumer.feed(record['body'])
+                result = consumer.close()
+                cache.set_items(url, result, key) if key else None
+        elif not 200 <= response.code < 300:
+            # don't parse (or cache) error pages
+            finished = Deferred()
+            response.deliverBody(BodyReceiver(BufferConsumer(), finished))
+            f = yield finished
+            code = encode(str(response.code))
+            raise Error(code, response.phrase, f.getvalue())
+        else:
+            tee = TeeConsumer(consumer) if cache else consumer
+            finished = Deferred()
+            response.deliverBody(BodyReceiver(tee, finished))
+            result = yield finished
+
+            if cache:
+                cache.misses += 1
+                body = tee.f.getvalue()
+                record = make_record(url, get_headers(response), body)
+
+            if cache and record and key:
+                record['items'][key] = result
+
+            cache.set(url, record) if cache and record else None
     else:
-        page, new_url = None, url
+        result = yield async_file_parse(url, consumer, **kwargs)
 
-    f = yield async_get_file(new_url, StringTransport(), **kwargs)
+    return_value(result)
 
-    if page:
-        page.close()
-        remove(page.name)
+
+@coroutine
+def async_url_open(url, timeout=0, revalidate=False, **kwargs):
+    if url.startswith('http'):
+        consumer = BufferConsumer()
+        kwargs = {'timeout': timeout, 'revalidate': revalidate}
+        f = yield async_url_parse(url, consumer, **kwargs)
+    else:
+        f = open(url.replace('file://', ''), 'rb')
 
     return_value(f)
 
 
-def async_url_read(url, timeout=0, **kwargs):
+def async_url_read(url, timeout=0, revalidate=False, **kwargs):
     if url.startswith('http'):
-        content = getPage(encode(url), timeout=timeout)
+        consumer = BufferConsumer()
+        kwargs = {'timeout': timeout, 'revalidate': revalidate}
+        d = async_url_parse(url, consumer, **kwargs)
+        content = d.addCallback(lambda f: f.getvalue())
     else:
         content = async_read_file(url, StringTransport(), **kwargs)
 
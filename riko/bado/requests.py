@@ -5,22 +5,95 @@ riko.bado.requests
 ~~~~~~~~~~~~~~~~~~
 Provides functions for asynchronously fetching web pages
 
+Requests share a persistent connection pool, so connections to the same host
+are kept alive and reused.
+
 Examples:
     basic usage::
 
         >>> from riko import get_path
         >>> from riko.bado import requests as treq
+
+Attributes:
+    MAX_PER_HOST (int): The number of connections to keep alive per host
 """
 from __future__ import (
     absolute_import, division, print_function, unicode_literals)
 
 from builtins import *  # noqa # pylint: disable=unused-import
 
+MAX_PER_HOST = 16
+
+# the pool only needs twisted, while treq is an optional extra
+try:
+    from twisted.web.client import HTTPConnectionPool
+except ImportError:
+    HTTPConnectionPool = object
+
 try:
     import treq
 except ImportError:
     get = lambda _: lambda: None
     json_content = lambda _: lambda: None
 else:
-    get = treq.get
+    def get(url, **kwargs):
+        kwargs.setdefault('pool', get_pool())
+        return treq.get(url, **kwargs)
+
     json = treq.json_content
+    content = treq.content
+
+_POOL = None
+
+
+class CountingConnectionPool(HTTPConnectionPool):
+    """A persistent HTTPConnectionPool that counts the connection requests
+    and the new connections it makes"""
+    requests = connections = 0
+
+    def getConnection(self, key, endpoint):
+        self.requests += 1
+        return HTTPConnectionPool.getConnection(self, key, endpoint)
+
+    def _newConnection(self, key, endpoint):
+        self.connections += 1
+        return HTTPConnectionPool._newConnection(self, key, endpoint)
+
+
+def get_pool():
+    """Returns the connection pool shared by all asynchronous requests
+
+    Returns:
+        obj: A CountingConnectionPool instance
+    """
+    global _POOL
+
+    if _POOL is None:
+        from twisted.internet import reactor
+
+        _POOL = CountingConnectionPool(reactor, persistent=True)
+        _POOL.maxPersistentPerHost = MAX_PER_HOST
+
+    return _POOL
+
+
+def get_pool_stats(pool=None):
+    """Returns the statistics of a connection pool
+
+    Args:
+        pool (obj): A CountingConnectionPool instance (default: the shared
+            pool, see `get_pool`)
+
+    Returns:
+        dict: The number of `requests` made, `connections` created, `open`
+            (idle keep-alive) connections, and the `reuse_ratio`, i.e., the
+            fraction of requests that reused a connection.
+    """
+    pool = pool or get_pool()
+    reused = pool.requests - pool.connections
+
+    return {
+        'requests': pool.requests,
+        'connections': pool.connections,
+        'open': sum(map(len, pool._connections.values())),
+        'reuse_ratio': reused / pool.requests if reused > 0 else 0}
@@ -23,6 +23,7 @@ does not:
 from __future__ import (
     absolute_import, division, print_function, unicode_literals)
 
+import re
 import pygogo as gogo
 
 from builtins import *  # noqa # pylint: disable=unused-import
@@ -46,6 +47,14 @@ END_HANDLER = 2
 IDENTCHARS = '.-_:'
 LENIENT_IDENTCHARS = IDENTCHARS + ';+#/%~'
 
+# Runs of characters that the byte loop would simply append to a buffer. The
+# name pattern is (deliberately) ascii only, a subset of `isalnum()` plus
+# IDENTCHARS.
+BODYDATA_STOP = re.compile(r'[<&]')
+ENTITYREF_STOP = re.compile(r'[\s<;]')
+NAME_RUN = re.compile(r'[A-Za-z0-9_.:-]+')
+SPACE_RUN = re.compile(r'\s+')
+
 nop = lambda *args, **kwargs: None
 
 
@@ -55,6 +64,32 @@ def zipfndict(*args):
             yield (key, tuple(x.get(key, nop) for x in args))
 
 
+def _find(sub, content, pos):
+    found = content.find(sub, pos)
+    return len(content) if found < 0 else found
+
+
+def _find_terminator(terminator, content, pos):
+    # stop right before the terminator's final character, and leave a
+    # terminator split across chunks to the byte loop
+    for length in range(1, len(terminator)):
+        if content.startswith(terminator[-length:], pos):
+            return pos
+
+    found = content.find(terminator, pos)
+    return len(content) if found < 0 else found + len(terminator) - 1
+
+
+def _search(pattern, content, pos):
+    match = pattern.search(content, pos)
+    return match.start() if match else len(content)
+
+
+def _match(pattern, content, pos):
+    match = pattern.match(content, pos)
+    return match.end() if match else pos
+
+
 def get_method_obj_dict(obj, prefix):
     names = find_method_names(obj.__class__, prefix)
     return {name: getattr(obj, prefix + name) for name in names}
@@ -88,6 +123,7 @@ class XMLParser(Protocol):
         self.filename = filename
         self.lenient = kwargs.get('lenient')
         self.strict = not self.lenient
+        self.scan = kwargs.get('scan', True)
 
     # protocol methods
     def connectionMade(self):
@@ -104,19 +140,37 @@ class XMLParser(Protocol):
 
     def _build_state_table(self):
         '''Return a dictionary of begin, do, end state function tuples'''
-        # _build_state_table leaves something to be desired but it does what it
-        # does.. probably slowly, so I'm doing some evil caching so it doesn't
-        # get called more than once per class.
-        stateTable = getattr(self.__class__, '__stateTable', None)
-
-        if stateTable is None:
+        # The table holds bound methods, so it's cached per parser (rather
+        # than per class) in order to build it only once per document instead
+        # of once per chunk.
+        try:
+            stateTable = self._stateTable
+        except AttributeError:
             prefixes = ('begin_', 'do_', 'end_')
             fndicts = (get_method_obj_dict(self, p) for p in prefixes)
-            stateTable = dict(zipfndict(*fndicts))
-            self.__class__.__stateTable = stateTable
+            stateTable = self._stateTable = dict(zipfndict(*fndicts))
 
         return stateTable
 
+    def _build_scan_table(self):
+        '''Return a dictionary of state scanners
+
+        A scanner consumes the run of characters (starting at `pos`) that the
+        state's `do_` method would only append to a buffer, and returns the
+        position of the first character it didn't consume. States whose `do_`
+        method is overridden are left to the byte loop.
+        '''
+        try:
+            scanTable = self._scanTable
+        except AttributeError:
+            cls, scanners = self.__class__, get_method_obj_dict(self, 'scan_')
+            scanTable = self._scanTable = {
+                state: scanner for state, scanner in scanners.items()
+                if getattr(cls, 'do_' + state) == getattr(
+                    XMLParser, 'do_' + state)} if self.scan else {}
+
+        return scanTable
+
     def check_encoding(self, data):
         if self.encoding.startswith('UTF-16'):
             data = data[2:]
@@ -146,10 +200,12 @@ class XMLParser(Protocol):
 
     def dataReceived(self, data):
         stateTable = self._build_state_table()
+        scanTable = self._build_scan_table()
         self.encoding = self.encoding or detect(data)['encoding']
         self.check_encoding(data)
         self.state = self.state or 'begin'
         content = decode(data, self.encoding)
+        pos, length = 0, len(content)
 
         # bring state, lineno, colno into local scope
         lineno, colno = self.lineno, self.colno
@@ -161,9 +217,31 @@ class XMLParser(Protocol):
 
         # fetch functions from the stateTable
         beginFn, doFn, endFn = stateTable[curState]
+        scanFn = scanTable.get(curState)
 
         try:
-            for char in content:
+            while pos < length:
+                if scanFn:
+                    # consume the run of characters `doFn` would only buffer
+                    end = scanFn(content, pos)
+
+                    if end > pos:
+                        newlines = content.count('\n', pos, end)
+
+                        if newlines:
+                            lineno += newlines
+                            colno = end - content.rfind('\n', pos, end) - 1
+                        else:
+                            colno += end - pos
+
+                        pos = end
+
+                    if pos == length:
+                        break
+
+                char = content[pos]
+                pos += 1
+
                 # do newline stuff
                 if char == '\n':
                     lineno += 1
@@ -178,6 +256,7 @@ class XMLParser(Protocol):
                     endFn()
                     curState = newState
                     beginFn, doFn, endFn = stateTable[curState]
+                    scanFn = scanTable.get(curState)
                     beginFn(char)
         finally:
             self.saveMark = _saveMark
@@ -218,6 +297,11 @@ class XMLParser(Protocol):
             self.gotComment(self.commentbuf[:-3])
             return 'bodydata'
 
+    def scan_comment(self, content, pos):
+        end = _find_terminator('-->', content, pos)
+        self.commentbuf += content[pos:end]
+        return end
+
     def begin_tagstart(self, byte):
         self.tagName = ''               # name of the tag
         self.tagAttributes = {}         # attributes of the tag
@@ -277,6 +361,16 @@ class XMLParser(Protocol):
         self._update_tags(byte)
         return val
 
+    def scan_tagstart(self, content, pos):
+        # leave '!-' (comments) and the like to the byte loop
+        if self.tagName and self.tagName[0] not in '!?':
+            end = _match(NAME_RUN, content, pos)
+            self.tagName += content[pos:end]
+        else:
+            end = pos
+
+        return end
+
     def begin_unentity(self, byte):
         self.bodydata += byte
 
@@ -318,6 +412,11 @@ class XMLParser(Protocol):
             self.cdatabuf = self.cdatabuf[:-3]
             return 'bodydata'
 
+    def scan_cdata(self, content, pos):
+        end = _find_terminator(']]>', content, pos)
+        self.cdatabuf += content[pos:end]
+        return end
+
     def end_cdata(self):
         self.gotCData(self.cdatabuf)
         self.cdatabuf = ''
@@ -346,6 +445,9 @@ class XMLParser(Protocol):
 
         self._raise_parse_error("Unexpected character: %r" % byte)
 
+    def scan_attrs(self, content, pos):
+        return _match(SPACE_RUN, content, pos)
+
     def begin_doctype(self, byte):
         self.doctype = byte
 
@@ -355,6 +457,11 @@ class XMLParser(Protocol):
 
         self.doctype += byte
 
+    def scan_doctype(self, content, pos):
+        end = _find('>', content, pos)
+        self.doctype += content[pos:end]
+        return end
+
     def end_doctype(self):
         self.gotDoctype(self.doctype)
         self.doctype = None
@@ -366,6 +473,9 @@ class XMLParser(Protocol):
 
             return self.maybeBodyData()
 
+    def scan_waitforgt(self, content, pos):
+        return _find('>', content, pos)
+
     def begin_attrname(self, byte):
         self.attrname = byte
         self._attrname_termtag = 0
@@ -386,6 +496,11 @@ class XMLParser(Protocol):
 
         return val
 
+    def scan_attrname(self, content, pos):
+        end = _match(NAME_RUN, content, pos)
+        self.attrname += content[pos:end]
+        return end
+
     def do_attrname(self, byte):
         if byte.isalnum() or byte in IDENTCHARS:
             self.attrname += byte
@@ -468,6 +583,11 @@ class XMLParser(Protocol):
             return 'attrs'
         self.attrval += byte
 
+    def scan_attrval(self, content, pos):
+        end = _find(self.quotetype, content, pos)
+        self.attrval += content[pos:end]
+        return end
+
     def end_attrval(self):
         self.tagAttributes[self.attrname] = self.attrval
         self.attrname = self.attrval = ''
@@ -535,6 +655,11 @@ class XMLParser(Protocol):
             return 'entityref'
         self.bodydata += byte
 
+    def scan_bodydata(self, content, pos):
+        end = _search(BODYDATA_STOP, content, pos)
+        self.bodydata += content[pos:end]
+        return end
+
     def end_bodydata(self):
         self.gotText(self.bodydata)
         self.bodydata = ''
@@ -544,6 +669,11 @@ class XMLParser(Protocol):
             return 'waitscriptendtag'
         self.bodydata += byte
 
+    def scan_waitforendscript(self, content, pos):
+        end = _find('<', content, pos)
+        self.bodydata += content[pos:end]
+        return end
+
     def begin_waitscriptendtag(self, byte):
         self.temptagdata = ''
         self.tagName = ''
@@ -614,6 +744,11 @@ class XMLParser(Protocol):
         else:
             return 'bodydata'
 
+    def scan_entityref(self, content, pos):
+        end = _search(ENTITYREF_STOP, content, pos)
+        self.erefbuf += content[pos:end]
+        return end
+
     def end_entityref(self):
         self.gotEntityReference(self.erefbuf)
 
@@ -624,6 +759,7 @@ class XMLParser(Protocol):
         self.erefextra = None
 
     do_spacebodydata = do_bodydata
+    scan_spacebodydata = scan_bodydata
     end_spacebodydata = end_bodydata
 
     # Sorta SAX-ish API
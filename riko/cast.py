@@ -8,15 +8,19 @@ Provides type casting capabilities
 from __future__ import (
     absolute_import, division, print_function, unicode_literals)
 
+import re
+
+from collections import OrderedDict
 from decimal import Decimal
 from json import loads
 from operator import add, sub
 from time import gmtime
-from datetime import timedelta
+from datetime import timedelta, datetime as dt
 from calendar import timegm
 from six.moves.urllib.parse import quote, urlparse
 
 from dateutil import parser
+from dateutil.tz import tzoffset
 from meza.compat import decode
 from riko.dates import TODAY, gen_tzinfos, get_date, normalize_date, get_tt
 from riko.currencies import CURRENCY_CODES
@@ -37,6 +41,24 @@ DATES = {
 
 TZINFOS = dict(gen_tzinfos())
 
+# The date formats used by most feeds, i.e., ISO-8601 (Atom) and RFC-822 (RSS)
+ISO_DATE = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})'
+    r'(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?)?'
+    r'(Z|[+-]\d{2}(?::?\d{2})?)?$')
+
+RFC822_DATE = re.compile(
+    r'^(?:[A-Za-z]{3}, )?(\d{1,2}) ([A-Za-z]{3}) (\d{4}) '
+    r'(\d{2}):(\d{2})(?::(\d{2}))? (GMT|UTC|UT|Z|[+-]\d{4})$')
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6, 'jul': 7,
+    'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12}
+
+# `cast_date` results are memoized, keeping the most recently used ones
+MAX_CACHED_DATES = 4096
+_DATE_CACHE = OrderedDict()
+
 url_quote = lambda url: quote(url, safe=URL_SAFE)
 
 
@@ -92,7 +114,84 @@ def cast_location(address, loc_type='street_address'):
     return result
 
 
+def get_offset(zone):
+    """Converts a UTC offset, e.g., '+05:30', into a tzinfo"""
+    if zone in {'Z', 'GMT', 'UTC', 'UT'}:
+        offset = 0
+    else:
+        digits = zone[1:].replace(':', '')
+        hours, minutes = int(digits[:2]), int(digits[2:] or 0)
+        offset = (hours * 60 + minutes) * 60 * (-1 if zone[0] == '-' else 1)
+
+    return tzoffset(None, offset)
+
+
+def parse_date(date_str):
+    """Parses a date string. ISO-8601 and RFC-822 dates are parsed directly
+    and everything else is left to dateutil.
+
+    Examples:
+        >>> parse_date('2014-12-02T10:30:00.5+05:30').isoformat()
+        '2014-12-02T10:30:00.500000+05:30'
+        >>> parse_date('Tue, 02 Dec 2014 10:30:00 GMT').isoformat()
+        '2014-12-02T10:30:00+00:00'
+        >>> parse_date('12/2/2014').isoformat()
+        '2014-12-02T00:00:00'
+    """
+    iso_match = ISO_DATE.match(date_str)
+    rfc822_match = None if iso_match else RFC822_DATE.match(date_str)
+
+    try:
+        if iso_match:
+            year, month, day, hour, minute, sec, frac, zone = iso_match.groups()
+            usec = int((frac or '0').ljust(6, '0'))
+            time = (int(hour or 0), int(minute or 0), int(sec or 0), usec)
+            date = dt(int(year), int(month), int(day), *time)
+        elif rfc822_match:
+            day, month, year, hour, minute, sec, zone = rfc822_match.groups()
+            month = MONTHS[month.lower()]
+            time = (int(hour), int(minute), int(sec or 0))
+            date = dt(int(year), month, int(day), *time)
+    except (ValueError, KeyError):
+        iso_match = rfc822_match = None
+
+    if iso_match or rfc822_match:
+        date = date.replace(tzinfo=get_offset(zone)) if zone else date
+    else:
+        date = parser.parse(date_str, tzinfos=TZINFOS)
+
+    return date
+
+
 def cast_date(date_str):
+    """Converts a date string (or struct_time or timestamp) into a dict of
+    its components. Results for strings are memoized.
+
+    Examples:
+        >>> result = cast_date('2014-12-02T10:30:00Z')
+        >>> result['utime'], result['day_of_week'], result['timezone']
+        (1417516200, 2, 'UTC')
+        >>> cast_date('2014-12-02T10:30:00Z') == result
+        True
+    """
+    try:
+        result = _DATE_CACHE.pop(date_str)
+    except (KeyError, TypeError):
+        result = _cast_date(date_str)
+
+        if hasattr(date_str, 'split') and result:
+            if len(_DATE_CACHE) >= MAX_CACHED_DATES:
+                _DATE_CACHE.popitem(last=False)
+
+            _DATE_CACHE[date_str] = result
+    else:
+        # move to the end since it was recently used
+        _DATE_CACHE[date_str] = result
+
+    return dict(result)
+
+
+def _cast_date(date_str):
     try:
         words = date_str.split(' ')
     except AttributeError:
@@ -109,7 +208,7 @@ def cast_date(date_str):
         elif date_str in DATES:
             date = DATES.get(date_str)
         else:
-            date = parser.parse(date_str, tzinfos=TZINFOS)
+            date = parse_date(date_str)
 
     if date:
         normal = normalize_date(date)
@@ -32,12 +32,83 @@ Examples:
         ...     .tokenizer(conf=str_conf, **str_kwargs)
         ...     .count().list) == [{'count': 169}]
         True
+        >>> # adjacent processors are fused into a single per-item function
+        >>> rule = {'find': 'Android', 'replace': 'ANDROID'}
+        >>> title_conf = {'rule': {'transform': 'lower'}}
+        >>> pipe = (SyncPipe('fetchdata', conf=fconf)
+        ...     .strreplace(conf={'rule': rule}, field='title', assign='title')
+        ...     .strtransform(conf=title_conf, field='title', assign='title'))
+        >>> len(pipe.upstream)
+        1
+        >>> unfused = (SyncPipe('fetchdata', conf=fconf, fuse=False)
+        ...     .strreplace(conf={'rule': rule}, field='title', assign='title')
+        ...     .strtransform(conf=title_conf, field='title', assign='title'))
+        >>> len(unfused.upstream)
+        0
+        >>> pipe.list == unfused.list
+        True
+        >>> # sorting followed by truncate (or tail) only keeps the needed items
+        >>> truncated = (SyncPipe('fetchdata', conf=fconf)
+        ...     .sort(conf=sort_conf)
+        ...     .truncate(conf={'count': 3}))
+        >>> truncated.limit
+        3
+        >>> pipe = SyncPipe('fetchdata', conf=fconf).sort(conf=sort_conf)
+        >>> truncated.list == pipe.list[:3]
+        True
+        >>> from riko.pools import get_pool
+        >>>
         >>> fconf['type'] = 'fetchdata'
         >>> sources = [{'url': {'value': get_path('feed.xml')}}, fconf]
         >>> len(SyncCollection(sources).list)
         56
         >>> len(SyncCollection(sources, parallel=True).list)
         56
+        >>> collection = SyncCollection(sources, parallel=True, workers=2)
+        >>> len(collection.list)
+        56
+        >>> get_pool('default-2')._processes
+        2
+        >>> # parallel chunk sizes adapt to the measured cost of each item
+        >>> pipe = (SyncPipe('fetchdata', conf=fconf, parallel=True)
+        ...     .strtransform(conf=title_conf, field='title', assign='title'))
+        >>> items = pipe.list
+        >>> sum(pipe.sizer.sizes) == len(items)
+        True
+        >>> # parallel pipes share persistent (named) pools across runs
+        >>> title_kwargs = {'conf': title_conf, 'field': 'title'}
+        >>> kwargs = {'conf': fconf, 'parallel': True}
+        >>> pipe = SyncPipe('fetchdata', **kwargs).strtransform(**title_kwargs)
+        >>> kwargs['pool'] = 'titles'
+        >>> named = SyncPipe('fetchdata', **kwargs).strtransform(**title_kwargs)
+        >>> pipe.list == named.list
+        True
+        >>> named.get_mapper()[0] is get_pool('titles')
+        True
+        >>> # each stage can run in its own executor
+        >>> mixed = (SyncPipe('fetchdata', conf=fconf, executor='auto')
+        ...     .strtransform(executor='threads', workers=2, **title_kwargs)
+        ...     .tokenizer(conf=str_conf, **str_kwargs))
+        >>> (mixed.executor, mixed.parent.executor) == ('processes', 'threads')
+        True
+        >>> len(mixed.list)
+        169
+        >>> # pipelined stages overlap, passing items through bounded queues
+        >>> kwargs = {'conf': fconf, 'pipelined': True, 'queue_depth': 4}
+        >>> pipelined = (SyncPipe('fetchdata', **kwargs)
+        ...     .sort(conf=sort_conf)
+        ...     .tokenizer(conf=str_conf, **str_kwargs)
+        ...     .count())
+        >>> pipelined.list == [{'count': 169}]
+        True
+        >>> pipelined = (SyncPipe('fetchdata', **kwargs)
+        ...     .sort(conf=sort_conf)
+        ...     .truncate(conf={'count': 3}))
+        >>> pipelined.source.__name__
+        'gen_pipelined'
+        >>> pipe = SyncPipe('fetchdata', conf=fconf).sort(conf=sort_conf)
+        >>> pipelined.list == pipe.list[:3]
+        True
 
     async usage::
 
@@ -77,27 +148,71 @@ Examples:
         ...         pass
         True
         56
+
+Attributes:
+    TARGET_CHUNK_TIME (flt): The number of seconds a worker should spend
+        processing each chunk of a parallel pipe (see `ChunkSizer`)
+
+    MAX_CHUNKSIZE (int): The max number of items in a chunk
+    OVERHEAD_RATIO (int): The min ratio of the time spent processing a
+        chunk to the time spent sending it to (and from) a worker
+
+    MAX_PIPELINES (int): The max number of pipelines a shared process pool
+        worker keeps resolved
+
+    EXECUTORS (set): The executors a stage can run in
+    IO_BOUND (set): The processors the 'auto' executor runs in threads
+        (along with all other sources)
+
+    CPU_BOUND (set): The processors the 'auto' executor runs in processes
+
+    QUEUE_DEPTH (int): The default max number of batches a pipelined stage
+        buffers for the next one (see `gen_pipelined`)
+
+    PIPE_BATCH (int): The max number of items in a batch
 """
 from __future__ import (
     absolute_import, division, print_function, unicode_literals)
 
+from collections import deque
 from functools import partial
-from itertools import repeat
+from itertools import repeat, islice
 from importlib import import_module
+from math import ceil
+from timeit import default_timer as timer
 from multiprocessing.dummy import Pool as ThreadPool
 from multiprocessing import Pool, cpu_count
+from threading import Event, Thread
 
+import warnings
 import pygogo as gogo
 
 from builtins import *  # noqa # pylint: disable=unused-import
+from six.moves.queue import Queue, Full
 
+from riko import pools
 from riko.utils import multiplex, multi_try
+from riko.dotdict import DotDict
 from riko.bado import coroutine, return_value
 from riko.bado import util, itertools as ait
 from meza.process import merge
 
 logger = gogo.Gogo(__name__, monolog=True).logger
 
+TARGET_CHUNK_TIME = 0.05
+MAX_CHUNKSIZE = 4096
+OVERHEAD_RATIO = 20
+MAX_PIPELINES = 128
+EXECUTORS = {'serial', 'threads', 'processes'}
+IO_BOUND = {'exchangerate', 'fetch', 'fetchpage'}
+CPU_BOUND = {'regex', 'tokenizer', 'xpathfetchpage'}
+QUEUE_DEPTH = 16
+PIPE_BATCH = 64
+
+# The pipeline(s) installed in a process pool worker (see `install_pipeline`)
+_PIPELINE = None
+_PIPELINES = {}
+
 
 class PyPipe(object):
     """A riko module fetching object"""
@@ -118,64 +233,231 @@ class PyPipe(object):
 
 
 class SyncPipe(PyPipe):
-    """A synchronous Pipe object"""
+    """A synchronous Pipe object
+
+    Each stage runs in its own executor (see `get_executor`). The `executor`
+    and `workers` a pipe is created with apply to all its stages, and can be
+    overridden per stage, e.g., `pipe.regex(conf=conf, executor='processes')`.
+
+    With `pipelined=True`, each stage (or run of fused stages) is driven by
+    its own thread and hands its items to the next stage through a bounded
+    queue of `queue_depth` batches (see `gen_pipelined`), so the stages
+    overlap instead of running one after another.
+    """
     def __init__(self, name=None, source=None, workers=None, **kwargs):
+        parent = kwargs.pop('parent', None)
+        registry = kwargs.pop('registry', None)
         super(SyncPipe, self).__init__(name, source, **kwargs)
         chunksize = kwargs.get('chunksize')
 
         self.threads = kwargs.get('threads', True)
         self.reuse_pool = kwargs.get('reuse_pool', True)
         self.pool = kwargs.get('pool')
+        self.registry = registry or pools.registry
+        self.default_executor = kwargs.get('executor')
+        self.default_workers = workers
+        self.pipelined = kwargs.get('pipelined', False)
+        self.queue_depth = kwargs.get('queue_depth') or QUEUE_DEPTH
+        self.fuse = kwargs.get('fuse', True)
+        self.parent = parent
+        self.upstream = []
+        self.limit = 0
 
         if self.name:
             self.pipe = import_module('riko.modules.%s' % self.name).pipe
             self.is_processor = self.pipe.__dict__.get('type') == 'processor'
-            self.mapify = self.is_processor and self.source
-            self.parallelize = self.parallel and self.mapify
         else:
             self.pipe = lambda source, **kw: source
-            self.mapify = False
-            self.parallelize = False
+            self.is_processor = False
 
-        if self.parallelize:
-            ordered = kwargs.get('ordered')
-            length = lenish(self.source)
-            def_pool = ThreadPool if self.threads else Pool
+        self.ordered = kwargs.get('ordered')
+        self.chunksize = chunksize
+        self.sizer = None
+        self.wired = False
+        self.wire(self.default_executor, workers)
 
-            self.workers = workers or get_worker_cnt(length, self.threads)
-            self.chunksize = chunksize or get_chunksize(length, self.workers)
-            self.pool = self.pool or def_pool(self.workers)
-            self.map = self.pool.imap if ordered else self.pool.imap_unordered
-        else:
-            self.workers = workers
-            self.chunksize = chunksize
-            self.map = map
+    def __call__(self, **kwargs):
+        executor = kwargs.pop('executor', None)
+        workers = kwargs.pop('workers', None)
+        super(SyncPipe, self).__call__(**kwargs)
+
+        if executor or workers:
+            self.wire(executor or self.default_executor, workers)
+
+        limit = get_limit(self.name, **kwargs) if self.fuse else 0
+
+        if limit and self.parent and self.parent.name == 'sort':
+            # Only the first (or last) `limit` sorted items are needed, so
+            # tell the preceding sort to keep just those
+            self.limit = limit
+            conf = dict(self.parent.kwargs.get('conf') or {}, limit=limit)
+            parent_kwargs = dict(self.parent.kwargs, conf=conf)
+            self.source = self.parent.pipe(self.parent.source, **parent_kwargs)
+
+            if self.pipelined:
+                self.source = gen_pipelined(self.source, self.queue_depth)
+
+        return self
 
     def __getattr__(self, name):
         kwargs = {
             'parallel': self.parallel,
             'threads': self.threads,
+            'executor': self.default_executor,
             'pool': self.pool if self.reuse_pool else None,
             'reuse_pool': self.reuse_pool,
-            'workers': self.workers}
+            'registry': self.registry,
+            'workers': self.default_workers,
+            'chunksize': self.chunksize,
+            'pipelined': self.pipelined,
+            'queue_depth': self.queue_depth,
+            'fuse': self.fuse}
+
+        return SyncPipe(name, parent=self, **kwargs)
+
+    def wire(self, executor=None, workers=None):
+        """Selects the executor of this stage, and connects the stage to its
+        parent. Adjacent processors sharing an executor are fused.
+
+        Args:
+            executor (str): One of 'serial', 'threads', 'processes', or
+                'auto' (default: see `get_executor`)
+
+            workers (int): The number of workers of this stage (default:
+                the pipe's `workers`)
+        """
+        parent = self.parent
+        args = (executor, self.parallel, self.threads)
+        self.executor = get_executor(self.pipe, *args)
+        self.pool_size = workers or self.default_workers
+
+        if parent and self.is_processor and parent.fusable:
+            same_executor = parent.executor == self.executor
+            fuse = same_executor and parent.pool_size == self.pool_size
+        else:
+            fuse = False
+
+        if fuse:
+            # Run this stage and the preceding processor(s) as one per-item
+            # function instead of stacking another `map` over their output
+            self.upstream = parent.upstream + [parent]
+            self.source = parent.source
+        elif parent and (self.upstream or not self.wired):
+            self.upstream = []
+            self.source = parent.output
+
+            if self.pipelined:
+                self.source = gen_pipelined(self.source, self.queue_depth)
+
+        self.mapify = self.is_processor and self.source
+        self.parallelize = self.executor != 'serial' and self.mapify
+
+        if self.parallelize:
+            length = lenish(self.source)
+            threads = self.executor == 'threads'
+            self.workers = self.pool_size or get_worker_cnt(length, threads)
+        else:
+            self.workers = self.pool_size
 
-        return SyncPipe(name, source=self.output, **kwargs)
+        self.wired = True
 
     @property
-    def output(self):
-        pipeline = partial(self.pipe, **self.kwargs)
+    def fusable(self):
+        return bool(self.fuse and self.mapify)
+
+    @property
+    def pipeline(self):
+        """The function to apply to the source. Processors resolve their
+        options once (see `riko.modules.processor.get_plan`) so that only
+        the item dependent work is done per item. Processes can't share the
+        plan since it isn't picklable (see `install_pipeline`).
+        """
+        in_procs = self.parallelize and self.executor == 'processes'
+
+        if self.mapify and not in_procs:
+            pipeline = get_pipeline(self.name, **self.kwargs)
+        else:
+            pipeline = partial(self.pipe, **self.kwargs)
+
+        return pipeline
+
+    @property
+    def fused_pipeline(self):
+        """The pipeline of this stage and the processors fused into it"""
+        if self.upstream:
+            pipelines = [p.pipeline for p in self.upstream + [self]]
+            pipeline = partial(fusedpipe, pipelines=pipelines)
+        else:
+            pipeline = self.pipeline
+
+        return pipeline
+
+    @property
+    def specs(self):
+        """The name and keyword arguments of this stage and the processors
+        fused into it (see `install_pipeline`)"""
+        return [(p.name, p.kwargs) for p in self.upstream + [self]]
+
+    def get_mapper(self):
+        """Returns the pool to run this stage in, the function to apply to
+        each chunk, and whether to close the pool once the stage is done.
 
+        A named (or the 'default') pool is fetched from the registry, so it
+        outlives the pipe. Stages with a fixed number of workers share a
+        default pool of that size. With `reuse_pool=False`, the stage gets
+        its own pool instead. Process pool workers resolve the pipeline once
+        (either when the pool starts or when the worker first sees it), so
+        that only the items are pickled for each chunk.
+        """
+        threads = self.executor == 'threads'
+        by_spec = not (threads or hasattr(self.pool, 'apply_async'))
+        private = not (self.pool or self.reuse_pool)
+
+        if private and by_spec:
+            initargs = (self.specs,)
+            pool = Pool(self.workers, install_pipeline, initargs)
+        elif private:
+            pool = ThreadPool(self.workers)
+        elif hasattr(self.pool, 'apply_async'):
+            pool = self.pool
+        elif self.pool:
+            pool = self.registry.get(self.pool, threads, self.pool_size)
+        elif self.pool_size:
+            name = 'default-%i' % self.pool_size
+            pool = self.registry.get(name, threads, self.pool_size)
+        else:
+            pool = self.registry.get('default', threads)
+
+        if private and by_spec:
+            func = batchpipe
+        elif by_spec:
+            func = partial(batchpipe, specs=self.specs)
+        else:
+            func = partial(batchpipe, pipeline=self.fused_pipeline)
+
+        return pool, func, private
+
+    def gen_chunks(self):
+        """Generates the processed chunks of a parallel stage. The pool is
+        only acquired once the first chunk is requested."""
+        pool, func, close = self.get_mapper()
+        length = lenish(self.source, None)
+        self.sizer = ChunkSizer(self.workers, length, self.chunksize)
+        args = (pool, func, self.source, self.sizer)
+
+        for chunk in gen_mapped(*args, ordered=self.ordered, close=close):
+            yield chunk
+
+    @property
+    def output(self):
         if self.parallelize:
-            zipped = zip(self.source, repeat(pipeline))
-            mapped = self.map(listpipe, zipped, chunksize=self.chunksize)
+            output = multiplex(self.gen_chunks())
         elif self.mapify:
-            mapped = self.map(pipeline, self.source)
-
-        if self.parallelize and not self.reuse_pool:
-            self.pool.close()
-            self.pool.join()
+            output = multiplex(map(self.fused_pipeline, self.source))
+        else:
+            output = self.fused_pipeline(self.source)
 
-        return multiplex(mapped) if self.mapify else pipeline(self.source)
+        return output
 
     @property
     def list(self):
@@ -194,20 +476,39 @@ class PyCollection(object):
 
 class SyncCollection(PyCollection):
     """A synchronous PyCollection object"""
-    def __init__(self, *args, **kwargs):
+    def __init__(self, sources, parallel=False, workers=None, **kwargs):
+        args = (sources, parallel, workers)
         super(SyncCollection, self).__init__(*args, **kwargs)
+        self.pool = kwargs.get('pool')
+        self.reuse_pool = kwargs.get('reuse_pool', True)
+        self.registry = kwargs.get('registry') or pools.registry
+        self.pool_size = workers
+        self.sizer = None
 
+    def fetch(self):
+        """Fetch all source urls"""
         if self.parallel:
-            self.chunksize = get_chunksize(self.length, self.workers)
-            self.pool = ThreadPool(self.workers)
-            self.map = self.pool.imap_unordered
+            private = not (self.pool or self.reuse_pool)
+
+            if private:
+                pool = ThreadPool(self.workers)
+            elif hasattr(self.pool, 'apply_async'):
+                pool = self.pool
+            elif self.pool:
+                pool = self.registry.get(self.pool, True, self.pool_size)
+            elif self.pool_size:
+                name = 'default-%i' % self.pool_size
+                pool = self.registry.get(name, True, self.pool_size)
+            else:
+                pool = self.registry.get('default')
+
+            self.sizer = ChunkSizer(self.workers, self.length)
+            func = partial(batchpipe, pipeline=getpipe)
+            args = (pool, func, self.zargs, self.sizer)
+            mapped = gen_mapped(*args, close=private)
         else:
-            self.map = map
+            mapped = map(getpipe, self.zargs)
 
-    def fetch(self):
-        """Fetch all source urls"""
-        kwargs = {'chunksize': self.chunksize} if self.parallel else {}
-        mapped = self.map(getpipe, self.zargs, **kwargs)
         return multiplex(mapped)
 
     def pipe(self, **kwargs):
@@ -285,25 +586,509 @@ class AsyncCollection(PyCollection):
         return_value(list(result))
 
 
+class ChunkSizer(object):
+    """Chooses the number of items to send to a worker at a time. The first
+    chunk holds a single item and is timed to measure the cost of
+    processing an item and the overhead of sending a chunk to (and from) a
+    worker. Chunks are then sized so that each takes about `target` seconds
+    (or `OVERHEAD_RATIO` times the overhead, whichever is longer). If the
+    number of items is known, the last chunks are split evenly among the
+    workers.
+
+    Args:
+        workers (int): The number of workers
+        length (int): The number of items (default: None, i.e., unknown)
+        chunksize (int): A fixed chunk size (default: None, i.e., adapt the
+            size)
+
+        target (flt): The number of seconds a chunk should take to process
+            (default: TARGET_CHUNK_TIME)
+
+    Attributes:
+        sizes (List[int]): The size of each chunk taken so far
+        item_cost (flt): The estimated seconds it takes to process an item
+        overhead (flt): The estimated seconds it takes to send a chunk to
+            (and from) a worker
+
+    Examples:
+        >>> sizer = ChunkSizer(2, 1000)
+        >>> items = iter(range(1000))
+        >>> sizer.take(items)
+        [0]
+        >>> sizer.update(1, 0.001, 0.0015)
+        >>> len(sizer.take(items))
+        50
+        >>> sizer.update(50, 0.1)
+        >>> sizer.item_cost
+        0.0015
+        >>> sizer.take(items)[0]
+        51
+        >>> sizer.sizes
+        [1, 50, 33]
+    """
+    def __init__(self, workers, length=None, chunksize=None, target=None):
+        self.workers = workers
+        self.remaining = length
+        self.chunksize = chunksize
+        self.target = target or TARGET_CHUNK_TIME
+        self.sizes = []
+        self.item_cost = self.overhead = None
+
+    @property
+    def probing(self):
+        """Whether the first chunk is still being timed"""
+        return not self.chunksize and self.item_cost is None
+
+    def get_size(self):
+        if self.chunksize:
+            size = self.chunksize
+        elif self.probing:
+            size = 1
+        else:
+            target = max(self.target, self.overhead * OVERHEAD_RATIO)
+            cost = self.item_cost or target / MAX_CHUNKSIZE
+            size = min(max(int(target / cost), 1), MAX_CHUNKSIZE)
+
+        if self.remaining and not self.chunksize:
+            # don't leave a single worker with the last big chunk
+            size = min(size, int(ceil(self.remaining / self.workers)))
+
+        return size
+
+    def take(self, iterator):
+        """Takes the next chunk of items from an iterator
+
+        Args:
+            iterator (Iter[obj]): The items
+
+        Returns:
+            List[obj]: The chunk (empty once the iterator is exhausted)
+        """
+        items = list(islice(iterator, self.get_size()))
+
+        if items:
+            self.sizes.append(len(items))
+
+        if items and self.remaining:
+            self.remaining = max(self.remaining - len(items), 0)
+
+        return items
+
+    def update(self, size, elapsed, roundtrip=None):
+        """Updates the estimates with the time a chunk took to process
+
+        Args:
+            size (int): The number of items in the chunk
+            elapsed (flt): The number of seconds the worker spent processing
+                the chunk
+
+            roundtrip (flt): The number of seconds between sending the chunk
+                and receiving its result (only meaningful if no other chunks
+                were being processed at the same time)
+        """
+        cost = elapsed / size
+
+        if self.item_cost is None:
+            self.item_cost = cost
+        else:
+            # a moving average that favors the recent chunks
+            self.item_cost = (self.item_cost + cost) / 2
+
+        if roundtrip is not None:
+            self.overhead = max(roundtrip - elapsed, 0)
+
+
 def get_chunksize(length, workers):
+    """Returns a fixed chunk size of a quarter of each worker's share of the
+    items. Deprecated: parallel pipes now size their chunks with
+    `ChunkSizer`, which adapts to the measured cost of each item.
+
+    Args:
+        length (int): The number of items
+        workers (int): The number of workers
+
+    Returns:
+        int: The chunk size
+
+    Examples:
+        >>> get_chunksize(100, 5)
+        5
+    """
+    msg = 'get_chunksize is deprecated, use ChunkSizer instead'
+    warnings.warn(msg, DeprecationWarning)
     return (length // (workers * 4)) or 1
 
 
+def get_executor(pipe, executor=None, parallel=False, threads=True):
+    """Selects the executor a pipe runs in
+
+    Args:
+        pipe (func): A riko pipe
+        executor (str): One of 'serial', 'threads', 'processes', or 'auto'.
+            'auto' runs CPU bound processors (see `CPU_BOUND`) in
+            processes, sources and I/O bound processors (see `IO_BOUND`) in
+            threads, and everything else serially. (default: None, i.e., the
+            executor selected by `parallel` and `threads`)
+
+        parallel (bool): Run in a pool (default: False)
+        threads (bool): Use a thread pool instead of a process pool
+            (default: True)
+
+    Returns:
+        str: One of 'serial', 'threads', or 'processes'
+
+    Examples:
+        >>> from riko.modules import fetch, regex, strtransform
+        >>>
+        >>> get_executor(fetch.pipe, parallel=True) == 'threads'
+        True
+        >>> get_executor(regex.pipe, 'processes') == 'processes'
+        True
+        >>> [get_executor(pipe, 'auto') for pipe in (
+        ...     fetch.pipe, regex.pipe, strtransform.pipe)] == [
+        ...     'threads', 'processes', 'serial']
+        True
+    """
+    if executor == 'auto':
+        name = pipe.__dict__.get('name')
+
+        if name in CPU_BOUND:
+            executor = 'processes'
+        elif pipe.__dict__.get('sub_type') == 'source' or name in IO_BOUND:
+            executor = 'threads'
+        else:
+            executor = 'serial'
+    elif executor not in EXECUTORS:
+        executor = ('threads' if threads else 'processes') if parallel else (
+            'serial')
+
+    return executor
+
+
 def get_worker_cnt(length, threads=True):
     multiplier = 2 if threads else 1
     return min(length or 1, cpu_count() * multiplier)
 
 
+def get_limit(name, conf=None, **kwargs):
+    """Determines how many items of its source a pipe needs from the front
+    (positive) or back (negative) of the stream.
+
+    Examples:
+        >>> get_limit('truncate', conf={'count': 3, 'start': 2})
+        5
+        >>> get_limit('tail', conf={'count': '3'})
+        -3
+        >>> get_limit('truncate', conf={'count': {'subkey': 'x'}})
+        0
+    """
+    conf = DotDict(conf)
+
+    try:
+        count = int(conf.get('count'))
+        start = int(conf.get('start') or 0)
+    except (TypeError, ValueError):
+        # the options aren't known until the pipe runs
+        limit = 0
+    else:
+        limit = {'truncate': start + count, 'tail': -count}.get(name, 0)
+
+    return limit
+
+
 def lenish(source, default=50):
+    """Returns the length of a source (or `default` if it's unknown)"""
     funcs = (len, lambda x: x.__length_hint__())
     errors = (TypeError, AttributeError)
     zipped = list(zip(funcs, errors))
     return multi_try(source, zipped, default)
 
 
-def listpipe(args):
-    source, pipeline = args
-    return list(pipeline(source))
+def timedpipe(func, items):
+    """Calls a function with a chunk of items and times it
+
+    Returns:
+        Tuple[obj, flt]: The function's result and the number of seconds it
+            took
+    """
+    start = timer()
+    result = func(items)
+    return result, timer() - start
+
+
+def gen_mapped(pool, func, source, sizer, ordered=False, close=False):
+    """Lazily applies a function to chunks of a source in a pool. The chunks
+    are sized by a ChunkSizer as the results come in, and only a couple of
+    chunks per worker are read ahead, so the source is never materialized.
+
+    Args:
+        pool (obj): A multiprocessing(.dummy) Pool
+        func (func): The function to apply to each chunk
+        source (Iter[obj]): The items
+        sizer (obj): A ChunkSizer instance
+        ordered (bool): Yield the results in the order of the chunks
+            (default: False, i.e., as soon as they are ready)
+
+        close (bool): Close the pool once all results have been yielded
+            (default: False)
+
+    Yields:
+        obj: The result of each chunk
+
+    Examples:
+        >>> pool = ThreadPool(2)
+        >>> sizer = ChunkSizer(2)
+        >>> mapped = gen_mapped(pool, sum, range(100), sizer, close=True)
+        >>> sum(mapped)
+        4950
+        >>> sum(sizer.sizes)
+        100
+    """
+    iterator, pending, exhausted = iter(source), deque(), False
+
+    try:
+        while True:
+            window = 1 if sizer.probing else sizer.workers * 2
+
+            while len(pending) < window and not exhausted:
+                items = sizer.take(iterator)
+                exhausted = not items
+
+                if items:
+                    result = pool.apply_async(timedpipe, (func, items))
+                    pending.append((len(items), timer(), result))
+
+            if not pending:
+                break
+
+            if ordered:
+                task = pending[0]
+            else:
+                ready = (t for t in pending if t[2].ready())
+                task = next(ready, pending[0])
+
+            pending.remove(task)
+            size, start, result = task
+            value, elapsed = result.get()
+
+            # the probe is the only chunk in flight, so its round trip
+            # measures the overhead
+            roundtrip = timer() - start if sizer.probing else None
+            sizer.update(size, elapsed, roundtrip)
+            yield value
+    finally:
+        pool.close() if close else None
+
+
+def put_message(queue, stop, message):
+    """Puts a message into a queue, waiting for a free slot until the
+    consumer stops
+
+    Returns:
+        bool: Whether the message was put
+    """
+    while not stop.is_set():
+        try:
+            queue.put(message, timeout=0.1)
+        except Full:
+            pass
+        else:
+            return True
+
+    return False
+
+
+def produce(source, queue, stop, batch=PIPE_BATCH):
+    """Puts batches of a source's items into a queue until the source is
+    exhausted (then puts None) or the consumer stops. Errors are put into
+    the queue so the consumer can raise them."""
+    put = partial(put_message, queue, stop)
+
+    try:
+        items = []
+
+        for item in source:
+            items.append(item)
+
+            # Send a partial batch rather than keep an idle consumer waiting
+            if len(items) >= batch or queue.empty():
+                if not put(items):
+                    return
+
+                items = []
+
+        if items and not put(items):
+            return
+    except Exception as e:
+        put(e)
+    else:
+        put(None)
+
+
+def gen_pipelined(source, depth=QUEUE_DEPTH, batch=PIPE_BATCH):
+    """Iterates over a source in a background thread, so that producing the
+    items overlaps with consuming them. Once `depth` batches are waiting,
+    the producer blocks until the consumer catches up (backpressure).
+
+    Args:
+        source (Iter[obj]): The items
+        depth (int): The max number of buffered batches (default:
+            QUEUE_DEPTH)
+
+        batch (int): The max number of items in a batch (default:
+            PIPE_BATCH)
+
+    Yields:
+        obj: The items of the source
+
+    Examples:
+        >>> sum(gen_pipelined(range(100), depth=2, batch=8))
+        4950
+        >>> stream = gen_pipelined(repeat(1), depth=2)
+        >>> next(stream)
+        1
+        >>> stream.close()  # stops the producer
+    """
+    queue, stop = Queue(depth), Event()
+    thread = Thread(target=produce, args=(source, queue, stop, batch))
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            items = queue.get()
+
+            if items is None:
+                break
+            elif isinstance(items, Exception):
+                raise items
+
+            for item in items:
+                yield item
+    finally:
+        stop.set()
+
+
+def get_pipeline(name, **kwargs):
+    """Returns the function that applies a processor to a single item
+
+    Args:
+        name (str): The processor module name
+        kwargs (dict): The processor keyword arguments
+
+    Returns:
+        func: The processor with its options resolved (if the processor
+            supports execution plans)
+
+    Examples:
+        >>> conf = {'rule': {'transform': 'title'}}
+        >>> pipeline = get_pipeline('strtransform', conf=conf, assign='x')
+        >>> next(pipeline({'content': 'hello'}))['x'] == 'Hello'
+        True
+    """
+    pipe = import_module('riko.modules.%s' % name).pipe
+    plan = pipe.__dict__.get('plan')
+
+    if plan:
+        pipeline = partial(pipe.__dict__['execute'], plan=plan(**kwargs))
+    else:
+        pipeline = partial(pipe, **kwargs)
+
+    return pipeline
+
+
+def make_pipeline(specs):
+    """Returns the (fused) pipeline of a run of processors
+
+    Args:
+        specs (List[Tuple[str, dict]]): The name and keyword arguments of
+            each processor
+    """
+    pipelines = [get_pipeline(name, **kwargs) for name, kwargs in specs]
+
+    if len(pipelines) > 1:
+        pipeline = partial(fusedpipe, pipelines=pipelines)
+    else:
+        pipeline = pipelines[0]
+
+    return pipeline
+
+
+def install_pipeline(specs):
+    """Process pool initializer that resolves the pipeline `batchpipe`
+    applies (when it isn't passed one) once per worker.
+
+    Args:
+        specs (List[Tuple[str, dict]]): The name and keyword arguments of
+            each (fused) processor
+    """
+    global _PIPELINE
+    _PIPELINE = make_pipeline(specs)
+
+
+def get_installed(specs):
+    """Returns the pipeline of a run of processors, resolving it only the
+    first time a (shared) process pool worker sees it"""
+    key = repr(specs)
+
+    if key not in _PIPELINES:
+        if len(_PIPELINES) >= MAX_PIPELINES:
+            _PIPELINES.clear()
+
+        _PIPELINES[key] = make_pipeline(specs)
+
+    return _PIPELINES[key]
+
+
+def batchpipe(items, pipeline=None, specs=None):
+    """Sends a batch of items through a pipeline
+
+    Args:
+        items (List[dict]): The items
+        pipeline (func): The pipeline to apply to each item (default: the
+            pipeline installed by `install_pipeline`)
+
+        specs (List[Tuple[str, dict]]): Resolve the pipeline of a run of
+            processors instead (see `get_installed`)
+
+    Examples:
+        >>> from riko.modules import strtransform
+        >>>
+        >>> items = [{'content': 'hello'}, {'content': 'world'}]
+        >>> conf = {'rule': {'transform': 'title'}}
+        >>> pipeline = partial(strtransform.pipe, conf=conf, assign='content')
+        >>> batchpipe(items, pipeline) == [
+        ...     {'content': 'Hello'}, {'content': 'World'}]
+        True
+    """
+    if specs:
+        pipeline = get_installed(specs)
+
+    pipeline = pipeline or _PIPELINE
+    return [i for item in items for i in pipeline(item)]
+
+
+def fusedpipe(item, pipelines=None):
+    """Sends an item through a run of processor pipelines in a single call
+
+    Examples:
+        >>> from riko.modules import strtransform, strreplace
+        >>>
+        >>> item = {'content': 'hello world'}
+        >>> rule = {'find': 'hello', 'replace': 'bye'}
+        >>> tconf = {'rule': {'transform': 'title'}}
+        >>> pipelines = [
+        ...     partial(strreplace.pipe, conf={'rule': rule}, assign='content'),
+        ...     partial(strtransform.pipe, conf=tconf, assign='content')]
+        >>> fusedpipe(item, pipelines) == [{'content': 'Bye World'}]
+        True
+    """
+    items = [item]
+
+    for pipeline in pipelines:
+        items = [i for item in items for i in pipeline(item)]
+
+    return items
 
 
 def getpipe(args, pipe=SyncPipe):
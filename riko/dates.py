@@ -9,7 +9,7 @@ from __future__ import (
     absolute_import, division, print_function, unicode_literals)
 
 from datetime import timedelta, datetime as dt
-from time import strptime
+from time import struct_time
 
 import pytz
 
@@ -86,12 +86,18 @@ def normalize_date(date):
 
 
 def get_tt(date):
-    formatted = ''.join(date.isoformat().rsplit(':', 1))
-    sformat = '%Y-%m-%d' if len(formatted) == 10 else '%Y-%m-%dT%H:%M:%S%z'
+    """Converts a (UTC) date into a `time.struct_time`
 
+    Examples:
+        >>> tt = get_tt(dt(2014, 12, 2, 10, 30, 15))
+        >>> tuple(tt)
+        (2014, 12, 2, 10, 30, 15, 1, 336, -1)
+    """
     try:
-        tt = strptime(formatted, sformat)
-    except ValueError:
-        tt = strptime(formatted[:19], '%Y-%m-%dT%H:%M:%S')
+        time = (date.hour, date.minute, date.second)
+    except AttributeError:
+        time = (0, 0, 0)
 
-    return tt
+    yday = date.toordinal() - date.replace(month=1, day=1).toordinal() + 1
+    fields = (date.year, date.month, date.day) + time
+    return struct_time(fields + (date.weekday(), yday, -1))
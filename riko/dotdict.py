@@ -11,10 +11,95 @@ from __future__ import (
 import pygogo as gogo
 
 from functools import reduce
+from operator import getitem as _getitem
 from builtins import *  # noqa # pylint: disable=unused-import
 
 logger = gogo.Gogo(__name__, monolog=True).logger
 
+MAX_CACHED_KEYS = 4096
+_KEY_CACHE = {}
+
+
+def compile_key(key=None):
+    """Converts a (dotted) key into a tuple of the keys to look up at each
+    level. Numeric parts are converted to ints so they can index lists.
+    String keys are cached.
+
+    Args:
+        key (str): The key, e.g., 'author.name', or a dict with a 'subkey'
+
+    Returns:
+        Tuple[str, int]: The keys
+
+    Examples:
+        >>> compile_key('author.name') == ('author', 'name')
+        True
+        >>> compile_key('links.0.href') == ('links', 0, 'href')
+        True
+        >>> compile_key({'subkey': 'author'}) == ('author',)
+        True
+        >>> compile_key()
+        ()
+    """
+    try:
+        return _KEY_CACHE[key]
+    except (KeyError, TypeError):
+        pass
+
+    try:
+        keys = key.rstrip('.').split('.') if key else []
+    except AttributeError:
+        keys = [key['subkey']] if key else []
+        cacheable = False
+    else:
+        cacheable = True
+
+    compiled = tuple(_intify(k) for k in keys)
+
+    if cacheable:
+        if len(_KEY_CACHE) >= MAX_CACHED_KEYS:
+            _KEY_CACHE.clear()
+
+        _KEY_CACHE[key] = compiled
+
+    return compiled
+
+
+def _intify(key):
+    try:
+        return int(key)
+    except ValueError:
+        return key
+
+
+def _is_dotted(value):
+    """Returns True if wrapping `value` in a DotDict would change its
+    structure, i.e., if any of its keys contain a '.'
+    """
+    if isinstance(value, DotDict):
+        return value.dotted
+
+    try:
+        return any('.' in k for k in value)
+    except TypeError:
+        return True
+
+
+def _dot_getitem(value, key):
+    """Looks up `DotDict(value)[key]` without copying `value`"""
+    if not (hasattr(key, 'split') and key):
+        # DotDict.__getitem__ can't parse non string or empty keys
+        raise TypeError(key)
+    elif '.' in key or _is_dotted(value):
+        return DotDict(value)[key]
+
+    parsed = dict.__getitem__(value, key)
+
+    if hasattr(parsed, 'keys') and 'value' in parsed:
+        parsed = parsed['value']
+
+    return parsed
+
 
 class DotDict(dict):
     """A dictionary whose keys can be accessed using dot notation
@@ -24,9 +109,18 @@ class DotDict(dict):
     >>> r['a.content'] == 'value'
     True
     """
+    # True if a key containing a '.' was set directly, i.e., not via `set`
+    dotted = False
+
     def __init__(self, data=None, **kwargs):
         self.update(data)
 
+    def __setitem__(self, key, value):
+        if hasattr(key, 'split') and '.' in key:
+            self.dotted = True
+
+        super(DotDict, self).__setitem__(key, value)
+
     def _parse_key(self, key=None):
         try:
             keys = key.rstrip('.').split('.') if key else []
@@ -62,24 +156,68 @@ class DotDict(dict):
 
         return DotDict(value) if hasattr(value, 'keys') else value
 
-    def get(self, key=None, default=None, **kwargs):
-        keys = self._parse_key(key)
-        value = DotDict(self.copy())
+    def _walk(self, keys, default=None):
+        """Looks up each key in turn, treating nested dicts as if they were
+        DotDict instances but without copying them. The equivalent of
+        repeatedly calling `_parse_value` on `DotDict(self.copy())`.
+        """
+        value, wrapped = self, True
 
         for key in keys:
+            if isinstance(value, DotDict) and not value.dotted:
+                # no need to copy since `DotDict(value) == value`
+                wrapped = True
+
+            getitem = _dot_getitem if wrapped else _getitem
+
             try:
-                key = int(key)
-            except ValueError:
-                pass
+                parsed = getitem(value, key)
+            except KeyError:
+                try:
+                    parsed = getitem(value, 'value')
+                except KeyError:
+                    parsed, wrapped = default, False
+            except (TypeError, IndexError):
+                if hasattr(value, 'append'):
+                    parsed, wrapped = [v[key] for v in value], False
+                else:
+                    parsed = value
+            else:
+                # `DotDict.__getitem__` doesn't wrap the result of a dotted
+                # (sub)key lookup
+                wrapped = wrapped and '.' not in key
 
-            value = self._parse_value(value, key, default)
+            value = default if parsed is None else parsed
+            wrapped = wrapped and hasattr(value, 'keys')
 
-        if hasattr(value, 'keys') and 'terminal' in value:
+        return value, wrapped
+
+    def get(self, key=None, default=None, **kwargs):
+        """
+        Examples:
+            >>> r = DotDict({'a': {'b': {'value': 'c'}}, 'd': [{'e': 1}]})
+            >>> r.get('a.b') == 'c'
+            True
+            >>> r.get('d.e') == [1]
+            True
+            >>> r.get('d.0') == {'e': 1}
+            True
+            >>> r.get('x', 'default') == 'default'
+            True
+        """
+        value, wrapped = self._walk(compile_key(key), default)
+        is_dict = hasattr(value, 'keys')
+
+        if wrapped and _is_dotted(value):
+            value = DotDict(value)
+
+        if is_dict and 'terminal' in value:
             # value fed in from another module
+            value = DotDict(value) if wrapped else value
             stream = kwargs[value['terminal']]
             value = next(stream)[value.get('path', 'content')]
-        elif hasattr(value, 'keys') and 'value' in value:
-            value = value['value']
+        elif is_dict and 'value' in value:
+            value = _dot_getitem(value, 'value') if wrapped else value['value']
 
         return DotDict(value) if hasattr(value, 'keys') else value
 
@@ -96,9 +234,7 @@ class DotDict(dict):
         keys = self._parse_key(key)
         first = keys[:-1]
         last = keys[-1]
-        item = self.copy()
-        reduce(lambda i, k: i.setdefault(k, {}), first, item)[last] = value
-        super(DotDict, self).update(item)
+        reduce(lambda i, k: i.setdefault(k, {}), first, self)[last] = value
 
     def update(self, data=None):
         if not data:
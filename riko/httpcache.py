@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+# vim: sw=4:ts=4:expandtab
+"""
+riko.httpcache
+~~~~~~~~~~~~~~
+Provides an on-disk HTTP response cache for conditional GETs
+
+Responses with an `ETag` or `Last-Modified` header are stored along with the
+items parsed from them. Subsequent requests send `If-None-Match` and
+`If-Modified-Since` headers, and a `304 Not Modified` response reuses both the
+stored body and the stored items.
+
+Examples:
+    basic usage::
+
+        >>> from tempfile import mkdtemp
+        >>> from riko.httpcache import HTTPCache
+        >>>
+        >>> cache = HTTPCache(mkdtemp())
+        >>> url = 'http://example.com/feed.xml'
+        >>> record = make_record(url, {'ETag': '"abc"'}, b'<rss/>')
+        >>> cache.set(url, record)
+        >>> get_validators(cache.get(url)) == {'If-None-Match': '"abc"'}
+        True
+
+Attributes:
+    CACHE_DIR (str): The default cache directory (overridden by the
+        `RIKO_HTTP_CACHE_DIR` environment variable)
+
+    MAX_CACHE_SIZE (int): The default max number of bytes to store. The least
+        recently used responses are evicted once it's exceeded.
+"""
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals)
+
+import pickle
+import pygogo as gogo
+
+from collections import OrderedDict
+from hashlib import sha1
+from os import environ, listdir, makedirs, remove, rename, getpid, path as p
+from threading import Lock
+
+from builtins import *  # noqa # pylint: disable=unused-import
+from meza.compat import encode
+
+logger = gogo.Gogo(__name__, monolog=True).logger
+
+CACHE_DIR = environ.get(
+    'RIKO_HTTP_CACHE_DIR', p.join(p.expanduser('~'), '.cache', 'riko', 'http'))
+
+MAX_CACHE_SIZE = 2 ** 26
+
+# The errors raised while storing a record. Records holding items that
+# can't be pickled raise TypeError, AttributeError, or PicklingError.
+CACHE_ERRORS = (
+    IOError, OSError, TypeError, AttributeError, pickle.PicklingError)
+
+_CACHES = {}
+_CACHE_LOCK = Lock()
+
+
+def make_record(url, headers, body):
+    """Creates a cache record from a response
+
+    Args:
+        url (str): The requested url
+        headers (dict): The response headers (any object with a `get` method)
+        body (bytes): The response body
+
+    Returns:
+        dict: The record (or None if the response doesn't have a validator)
+
+    Examples:
+        >>> make_record('http://a.com', {}, b'') is None
+        True
+        >>> headers = {'Last-Modified': 'Tue, 02 Dec 2014 10:30:00 GMT'}
+        >>> record = make_record('http://a.com', headers, b'hi')
+        >>> record['last_modified'] == 'Tue, 02 Dec 2014 10:30:00 GMT'
+        True
+    """
+    etag = headers.get('ETag')
+    last_modified = headers.get('Last-Modified')
+
+    if etag or last_modified:
+        record = {
+            'url': url, 'etag': etag, 'last_modified': last_modified,
+            'content_type': headers.get('Content-Type'), 'body': body,
+            'items': {}}
+    else:
+        record = None
+
+    return record
+
+
+def get_validators(record=None):
+    """Returns the conditional request headers for a cache record
+
+    Args:
+        record (dict): The cache record
+
+    Returns:
+        dict: The request headers
+    """
+    record = record or {}
+    headers = {}
+
+    if record.get('etag'):
+        headers['If-None-Match'] = record['etag']
+
+    if record.get('last_modified'):
+        headers['If-Modified-Since'] = record['last_modified']
+
+    return headers
+
+
+class HTTPCache(object):
+    """A size bounded, least recently used, on-disk response cache
+
+    Args:
+        path (str): The cache directory (default: CACHE_DIR)
+        max_size (int): The max number of bytes to store (default:
+            MAX_CACHE_SIZE)
+
+    Attributes:
+        hits (int): The number of `304 Not Modified` responses
+        misses (int): The number of full responses
+        evictions (int): The number of evicted records
+    """
+    def __init__(self, path=None, max_size=None):
+        self.path = path or CACHE_DIR
+        self.max_size = max_size or MAX_CACHE_SIZE
+        self.hits = self.misses = self.evictions = 0
+        self.lock = Lock()
+        self.index = None
+
+    def _load_index(self):
+        try:
+            names = [n for n in listdir(self.path) if n.endswith('.pickle')]
+        except OSError:
+            makedirs(self.path)
+            names = []
+
+        paths = (p.join(self.path, n) for n in names)
+        stats = sorted((p.getmtime(path), path) for path in paths)
+        return OrderedDict((path, p.getsize(path)) for _, path in stats)
+
+    def _get_path(self, url):
+        name = '%s.pickle' % sha1(encode(url)).hexdigest()
+        return p.join(self.path, name)
+
+    def _touch(self, path):
+        if self.index is None:
+            self.index = self._load_index()
+
+        # move to the most recently used end
+        size = self.index.pop(path, None)
+
+        if size is not None:
+            self.index[path] = size
+
+    def _evict(self):
+        while self.index and sum(self.index.values()) > self.max_size:
+            path, _ = self.index.popitem(last=False)
+            self.evictions += 1
+
+            try:
+                remove(path)
+            except OSError:
+                pass
+
+    @property
+    def size(self):
+        if self.index is None:
+            self.index = self._load_index()
+
+        return sum(self.index.values())
+
+    def get(self, url):
+        """Returns the cache record of a url (or None)"""
+        path = self._get_path(url)
+
+        with self.lock:
+            try:
+                with open(path, 'rb') as f:
+                    record = pickle.load(f)
+            except (IOError, OSError, EOFError, pickle.UnpicklingError):
+                record = None
+            else:
+                self._touch(path)
+
+        return record
+
+    def set(self, url, record):
+        """Stores the cache record of a url"""
+        path = self._get_path(url)
+        tmp_path = '%s.%i.tmp' % (path, getpid())
+
+        with self.lock:
+            self._touch(path)
+
+            try:
+                data = pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+
+                rename(tmp_path, path)
+            except CACHE_ERRORS as e:
+                logger.warning('Failed to cache %s: %s', url, e)
+            else:
+                self.index[path] = len(data)
+                self._evict()
+
+    def get_items(self, record, key=''):
+        """Returns the items parsed from a cached response (or None)
+
+        Args:
+            record (dict): The cache record
+            key (str): Identifies the parser (and its options) that produced
+                the items
+        """
+        return (record or {}).get('items', {}).get(key)
+
+    def set_items(self, url, items, key=''):
+        """Stores the items parsed from a cached response
+
+        Args:
+            url (str): The requested url
+            items (List[dict]): The parsed items
+            key (str): Identifies the parser (and its options) that produced
+                the items
+        """
+        record = self.get(url)
+
+        if record:
+            record['items'][key] = items
+            self.set(url, record)
+
+    def stats(self):
+        """Returns the number of hits, misses, evictions, and stored bytes
+
+        Examples:
+            >>> from tempfile import mkdtemp
+            >>> HTTPCache(mkdtemp()).stats() == {
+            ...     'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0}
+            True
+        """
+        return {
+            'hits': self.hits, 'misses': self.misses,
+            'evictions': self.evictions, 'size': self.size}
+
+
+def get_cache(path=None):
+    """Returns the cache shared by all fetches in this process
+
+    Args:
+        path (str): The cache directory (default: CACHE_DIR)
+
+    Examples:
+        >>> get_cache() is get_cache()
+        True
+    """
+    path = path or CACHE_DIR
+
+    if path not in _CACHES:
+        with _CACHE_LOCK:
+            _CACHES.setdefault(path, HTTPCache(path))
+
+    return _CACHES[path]
@@ -9,6 +9,7 @@ from __future__ import (
 
 import pygogo as gogo
 
+from collections import namedtuple
 from functools import partial, wraps
 from itertools import chain
 
@@ -17,7 +18,7 @@ from builtins import iter, list, map, next
 from riko.bado import coroutine, return_value
 from riko.cast import cast
 from riko.utils import multiplex, broadcast, dispatch
-from riko.parsers import parse_conf, get_skip, get_field
+from riko.parsers import get_conf_parser, get_skip, get_field
 from riko.dotdict import DotDict
 from meza.fntools import remove_keys, listize, Objectify
 from meza.process import merge
@@ -41,9 +42,10 @@ __sources__ = [
 __aggregators__ = [
     'count',
     'sum',
-    # 'mean',
-    # 'min',
-    # 'max',
+    'mean',
+    'min',
+    'max',
+    'aggregate',
 ]
 
 __composers__ = [
@@ -89,6 +91,10 @@ __transformers__ = [
 
 __all__ = __sources__ + __composers__ + __transformers__ + __aggregators__
 
+# The parts of a pipe invocation that are independent of the input item
+PLAN_FIELDS = ['combined', 'kwargs', 'bfuncs', 'dfuncs', 'skip_if']
+Plan = namedtuple('Plan', PLAN_FIELDS)
+
 
 def get_assignment(result, skip=False, **kwargs):
     # print(result)
@@ -243,6 +249,59 @@ class processor(object):
         self.async = isasync
         self.debug = debug
 
+    def get_plan(self, module_name, **kwargs):
+        """Resolves everything about a pipe invocation that doesn't depend on
+        the input item, i.e., the combined options, `conf`, and the broadcast
+        and dispatch functions.
+
+        Args:
+            module_name (str): The name of the wrapped pipe's module
+            kwargs (dict): The keyword arguments passed to the wrapper
+
+        Returns:
+            Plan: The pipe's execution plan
+
+        Examples:
+            >>> plan = processor({'times': 1}).get_plan('say', field='content')
+            >>> plan.combined['assign']
+            'say'
+            >>> plan.kwargs['conf'] == {'times': 1}
+            True
+            >>> plan.dfuncs is None
+            True
+        """
+        defaults = {
+            'dictize': True, 'ftype': 'pass', 'ptype': 'pass',
+            'objectify': True}
+
+        combined = merge([self.defaults, defaults, self.opts, kwargs])
+        is_source = combined['ftype'] == 'none'
+        def_assign = 'content' if is_source else module_name
+        extracted = 'extract' in combined
+        pdictize = combined.get('listize') if extracted else True
+
+        combined.setdefault('assign', def_assign)
+        combined.setdefault('emit', is_source)
+        combined.setdefault('pdictize', pdictize)
+        conf = {k: combined[k] for k in self.defaults}
+        conf.update(kwargs.get('conf', {}))
+        combined.update({'conf': conf})
+
+        uconf = DotDict(conf) if combined.get('dictize') else conf
+        updates = {'conf': uconf, 'assign': combined.get('assign')}
+        kwargs.update(updates)
+
+        bfuncs = get_broadcast_funcs(**combined)
+        types = {combined['ftype'], combined['ptype']}
+
+        if types.difference({'pass', 'none'}):
+            dfuncs = get_dispatch_funcs(**combined)
+        else:
+            dfuncs = None
+
+        skip_if = combined.get('skip_if')
+        return Plan(combined, kwargs, bfuncs, dfuncs, skip_if)
+
     def __call__(self, pipe):
         """Creates a sync/async pipe that processes individual items
 
@@ -306,44 +365,20 @@ class processor(object):
             ...         pass
             True
         """
-        @wraps(pipe)
-        def wrapper(item=None, **kwargs):
-            module_name = wrapper.__module__.split('.')[-1]
-
-            defaults = {
-                'dictize': True, 'ftype': 'pass', 'ptype': 'pass',
-                'objectify': True}
-
-            combined = merge([self.defaults, defaults, self.opts, kwargs])
-            is_source = combined['ftype'] == 'none'
-            def_assign = 'content' if is_source else module_name
-            extracted = 'extract' in combined
-            pdictize = combined.get('listize') if extracted else True
-
-            combined.setdefault('assign', def_assign)
-            combined.setdefault('emit', is_source)
-            combined.setdefault('pdictize', pdictize)
-            conf = {k: combined[k] for k in self.defaults}
-            conf.update(kwargs.get('conf', {}))
-            combined.update({'conf': conf})
-
-            uconf = DotDict(conf) if combined.get('dictize') else conf
-            updates = {'conf': uconf, 'assign': combined.get('assign')}
-            kwargs.update(updates)
-
+        module_name = pipe.__module__.split('.')[-1]
+
+        def execute(item, plan):
+            """Processes a single item according to a pre-compiled plan. Only
+            the item dependent work (field extraction, parsing, and
+            assignment) is done here.
+            """
+            combined = plan.combined
             item = item or {}
             _input = DotDict(item) if combined.get('dictize') else item
-            bfuncs = get_broadcast_funcs(**combined)
-            skip = get_skip(_input, **combined)
-            types = set([]) if skip else {combined['ftype'], combined['ptype']}
-
-            if types.difference({'pass', 'none'}):
-                dfuncs = get_dispatch_funcs(**combined)
-            else:
-                dfuncs = None
-
-            parsed, orig_item = _dispatch(_input, bfuncs, dfuncs=dfuncs)
-            kwargs.update({'skip': skip, 'stream': orig_item})
+            skip = get_skip(_input, plan.skip_if)
+            dfuncs = None if skip else plan.dfuncs
+            parsed, orig_item = _dispatch(_input, plan.bfuncs, dfuncs=dfuncs)
+            kwargs = dict(plan.kwargs, skip=skip, stream=orig_item)
 
             if self.async:
                 stream = yield pipe(*parsed, **kwargs)
@@ -363,10 +398,25 @@ class processor(object):
                 for s in stream:
                     yield s
 
+        execute = coroutine(execute) if self.async else execute
+
+        @wraps(pipe)
+        def wrapper(item=None, **kwargs):
+            plan = self.get_plan(module_name, **kwargs)
+
+            if self.async:
+                stream = yield execute(item, plan)
+                return_value(stream)
+            else:
+                for s in execute(item, plan):
+                    yield s
+
         is_source = self.opts.get('ftype') == 'none'
-        wrapper.__dict__['name'] = wrapper.__module__.split('.')[-1]
+        wrapper.__dict__['name'] = module_name
         wrapper.__dict__['type'] = 'processor'
         wrapper.__dict__['sub_type'] = 'source' if is_source else 'transformer'
+        wrapper.__dict__['plan'] = partial(self.get_plan, module_name)
+        wrapper.__dict__['execute'] = execute
         return coroutine(wrapper) if self.async else wrapper
 
 
@@ -493,6 +543,51 @@ class operator(object):
         self.opts = opts or {}
         self.async = isasync
 
+    def get_plan(self, module_name, **kwargs):
+        """Resolves the combined options, `conf`, and the broadcast and
+        dispatch functions of a pipe invocation.
+
+        Args:
+            module_name (str): The name of the wrapped pipe's module
+            kwargs (dict): The keyword arguments passed to the wrapper
+
+        Returns:
+            Plan: The pipe's execution plan
+
+        Examples:
+            >>> plan = operator({'times': 1}).get_plan('say')
+            >>> plan.combined['assign']
+            'say'
+            >>> plan.combined['emit']
+            True
+        """
+        defaults = {
+            'dictize': True, 'ftype': 'pass', 'ptype': 'pass',
+            'objectify': True, 'emit': True, 'assign': module_name}
+
+        combined = merge([self.defaults, defaults, self.opts, kwargs])
+        extracted = 'extract' in combined
+        pdictize = combined.get('listize') if extracted else True
+
+        combined.setdefault('pdictize', pdictize)
+        conf = {k: combined[k] for k in self.defaults}
+        conf.update(kwargs.get('conf', {}))
+        combined.update({'conf': conf})
+
+        uconf = DotDict(conf) if combined.get('dictize') else conf
+        updates = {'conf': uconf, 'assign': combined.get('assign')}
+        kwargs.update(updates)
+
+        bfuncs = get_broadcast_funcs(**combined)
+        types = {combined['ftype'], combined['ptype']}
+
+        if types.difference({'pass', 'none'}):
+            dfuncs = get_dispatch_funcs(**combined)
+        else:
+            dfuncs = None
+
+        return Plan(combined, kwargs, bfuncs, dfuncs, None)
+
     def __call__(self, pipe):
         """Creates a wrapper that allows a sync/async pipe to processes a
         stream of items
@@ -574,48 +669,32 @@ class operator(object):
             True
             True
         """
+        module_name = pipe.__module__.split('.')[-1]
+
         @wraps(pipe)
         def wrapper(items=None, **kwargs):
-            module_name = wrapper.__module__.split('.')[-1]
             wrapper.__dict__['name'] = module_name
-
-            defaults = {
-                'dictize': True, 'ftype': 'pass', 'ptype': 'pass',
-                'objectify': True, 'emit': True, 'assign': module_name}
-
-            combined = merge([self.defaults, defaults, self.opts, kwargs])
-            extracted = 'extract' in combined
-            pdictize = combined.get('listize') if extracted else True
-
-            combined.setdefault('pdictize', pdictize)
-            conf = {k: combined[k] for k in self.defaults}
-            conf.update(kwargs.get('conf', {}))
-            combined.update({'conf': conf})
-
-            uconf = DotDict(conf) if combined.get('dictize') else conf
-            updates = {'conf': uconf, 'assign': combined.get('assign')}
-            kwargs.update(updates)
+            plan = self.get_plan(module_name, **kwargs)
+            combined, kwargs = plan.combined, plan.kwargs
+            bfuncs, dfuncs = plan.bfuncs, plan.dfuncs
 
             items = items or iter([])
             _INPUT = map(DotDict, items) if combined.get('dictize') else items
-            bfuncs = get_broadcast_funcs(**combined)
-            types = {combined['ftype'], combined['ptype']}
-
-            if types.difference({'pass', 'none'}):
-                dfuncs = get_dispatch_funcs(**combined)
-            else:
-                dfuncs = None
-
             pairs = (_dispatch(item, bfuncs, dfuncs=dfuncs) for item in _INPUT)
             parsed, _ = _dispatch(DotDict(), bfuncs, dfuncs=dfuncs)
 
+            # `orig_stream` only needs the item field, so skip the (costly)
+            # item dependent `conf` parsing
+            ffuncs, fdfuncs = bfuncs[:1], dfuncs[:1] if dfuncs else None
+            fields = (_dispatch(i, ffuncs, dfuncs=fdfuncs) for i in _INPUT)
+
             # - operators can't skip items
             # - purposely setting both variables to maps of the same iterable
             #   since only one is intended to be used at any given time
             # - `tuples` is an iterator of tuples of the first two `parsed`
             #   elements
             tuples = ((p[0][0], p[0][1]) for p in pairs)
-            orig_stream = (p[0][0] for p in pairs)
+            orig_stream = (f[0][0] for f in fields)
             objconf = parsed[1]
 
             if self.async:
@@ -663,12 +742,11 @@ def get_broadcast_funcs(**kwargs):
     if kw.listize:
         listed = listize(pieces)
         piece_defs = map(DotDict, listed) if kw.pdictize else listed
-        parser = partial(parse_conf, **no_conf)
-        pfuncs = [partial(parser, conf=conf) for conf in piece_defs]
+        pfuncs = [get_conf_parser(conf, **no_conf) for conf in piece_defs]
         get_pieces = lambda item: broadcast(item, *pfuncs)
     elif kw.ptype != 'none':
         conf = DotDict(pieces) if kw.pdictize and pieces else pieces
-        get_pieces = partial(parse_conf, conf=conf, **no_conf)
+        get_pieces = get_conf_parser(conf, **no_conf)
     else:
         get_pieces = noop
 
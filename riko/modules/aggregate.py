@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+# vim: sw=4:ts=4:expandtab
+"""
+riko.modules.aggregate
+~~~~~~~~~~~~~~~~~~~~~~
+Provides functions for computing several aggregates (count, sum, mean, min,
+and max) of the items in a stream in a single pass.
+
+Examples:
+    basic usage::
+
+        >>> from riko.modules.aggregate import pipe
+        >>>
+        >>> stream = pipe({'content': x} for x in range(5))
+        >>> next(stream) == {'aggregate': {
+        ...     'count': 5, 'sum': Decimal('10'), 'mean': Decimal('2'),
+        ...     'min': Decimal('0'), 'max': Decimal('4')}}
+        True
+
+Attributes:
+    OPTS (dict): The default pipe options
+    DEFAULTS (dict): The default parser options
+    AGGREGATES (List[str]): The supported aggregates
+"""
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals)
+
+import pygogo as gogo
+
+from decimal import Decimal
+from builtins import *  # noqa # pylint: disable=unused-import
+from meza.fntools import listize
+
+from . import operator
+from riko.utils import aggregate
+
+AGGREGATES = ['count', 'sum', 'mean', 'min', 'max']
+OPTS = {}
+DEFAULTS = {
+    'aggregates': AGGREGATES, 'aggregate_key': 'content', 'group_key': None}
+
+logger = gogo.Gogo(__name__, monolog=True).logger
+
+
+def aggregate_stream(stream, aggregates, value_key, group_key=None):
+    """Computes aggregates of an item attribute, either over the whole stream
+    or for each group (in the order the groups were first seen)
+
+    Args:
+        stream (Iter[dict]): The items
+        aggregates (Seq[str]): The aggregates to compute (see `AGGREGATES`)
+        value_key (str): Item attribute to aggregate
+        group_key (str): Item attribute to group by (default: None)
+
+    Returns:
+        OrderedDict: The aggregates of each group. Without a `group_key`,
+            the aggregates are keyed by None.
+
+    Examples:
+        >>> stream = [{'x': 2, 'y': 'b'}, {'x': 1, 'y': 'a'}, {'x': 3}]
+        >>> aggregated = aggregate_stream(stream, ['max'], 'x', 'y')
+        >>> list(aggregated) == ['b', 'a', None]
+        True
+        >>> aggregated['b'] == {'max': Decimal('2')}
+        True
+    """
+    keyfunc = (lambda item: item.get(group_key)) if group_key else None
+    valuefunc = lambda item: item.get(value_key)
+    aggregated = aggregate(stream, aggregates, keyfunc, valuefunc)
+
+    if not (group_key or aggregated):
+        # an empty stream
+        totals = {'count': 0, 'sum': Decimal(0), 'mean': None}
+        totals.update(min=None, max=None)
+        aggregated[None] = {name: totals[name] for name in aggregates}
+
+    return aggregated
+
+
+def make_parser(name):
+    """Creates the parser of a module that computes a single aggregate, e.g.,
+    `riko.modules.mean`. The module's `<name>_key` option selects the item
+    attribute to aggregate.
+
+    Args:
+        name (str): The aggregate (see `AGGREGATES`)
+
+    Returns:
+        func: The parser
+
+    Examples:
+        >>> from itertools import repeat
+        >>> from meza.fntools import Objectify
+        >>>
+        >>> parser = make_parser('min')
+        >>> stream = [{'amount': 2, 'x': 'two'}, {'amount': 1, 'x': 'one'}]
+        >>> objconf = Objectify({'min_key': 'amount', 'group_key': None})
+        >>> tuples = zip(stream, repeat(objconf))
+        >>> parser(stream, objconf, tuples, assign='min') == {
+        ...     'min': Decimal('1')}
+        True
+        >>> objconf = Objectify({'min_key': 'amount', 'group_key': 'x'})
+        >>> tuples = zip(stream, repeat(objconf))
+        >>> lowest = parser(stream, objconf, tuples)
+        >>> next(lowest) == {'two': Decimal('2')}
+        True
+    """
+    def parser(stream, objconf, tuples, **kwargs):
+        """ Parses the pipe content
+
+        Args:
+            stream (Iter[dict]): The source. Note: this shares the `tuples`
+                iterator, so consuming it will consume `tuples` as well.
+
+            objconf (obj): The pipe configuration (an Objectify instance)
+            tuples (Iter[(dict, obj)]): Iterable of tuples of (item, objconf)
+
+        Returns:
+            mixed: The output either a dict or iterable of dicts
+        """
+        group_key = objconf.group_key
+        value_key = getattr(objconf, '%s_key' % name)
+        aggregated = aggregate_stream(stream, [name], value_key, group_key)
+
+        if group_key:
+            parsed = ({k: v[name]} for k, v in aggregated.items())
+        else:
+            parsed = {kwargs['assign']: aggregated[None][name]}
+
+        return parsed
+
+    return parser
+
+
+def parser(stream, objconf, tuples, **kwargs):
+    """ Parses the pipe content
+
+    Args:
+        stream (Iter[dict]): The source. Note: this shares the `tuples`
+            iterator, so consuming it will consume `tuples` as well.
+
+        objconf (obj): The pipe configuration (an Objectify instance)
+
+        tuples (Iter[(dict, obj)]): Iterable of tuples of (item, objconf)
+            `item` is an element in the source stream and `objconf` is the item
+            configuration (an Objectify instance). Note: this shares the
+            `stream` iterator, so consuming it will consume `stream` as well.
+
+        kwargs (dict): Keyword arguments.
+
+    Kwargs:
+        conf (dict): The pipe configuration.
+
+    Returns:
+        mixed: The output either a dict or iterable of dicts
+
+    Examples:
+        >>> from itertools import repeat
+        >>> from meza.fntools import Objectify
+        >>>
+        >>> conf = {'aggregates': ['count', 'mean'], 'aggregate_key': 'amount'}
+        >>> objconf = Objectify(dict(conf, group_key='x'))
+        >>> stream = [
+        ...     {'amount': 2, 'x': 'two'},
+        ...     {'amount': 1, 'x': 'one'},
+        ...     {'amount': 4, 'x': 'two'}]
+        >>> tuples = zip(stream, repeat(objconf))
+        >>> aggregated = parser(stream, objconf, tuples)
+        >>> next(aggregated) == {'two': {'count': 2, 'mean': Decimal('3')}}
+        True
+        >>> next(aggregated) == {'one': {'count': 1, 'mean': Decimal('1')}}
+        True
+    """
+    group_key, aggregates = objconf.group_key, listize(objconf.aggregates)
+    args = (stream, aggregates, objconf.aggregate_key, group_key)
+    aggregated = aggregate_stream(*args)
+
+    if group_key:
+        parsed = ({k: v} for k, v in aggregated.items())
+    else:
+        parsed = {kwargs['assign']: aggregated[None]}
+
+    return parsed
+
+
+@operator(DEFAULTS, isasync=True, **OPTS)
+def async_pipe(*args, **kwargs):
+    """An aggregator that asynchronously and eagerly computes several
+    aggregates of fields of items in a stream. Note that this pipe is not
+    lazy.
+
+    Args:
+        items (Iter[dict]): The source.
+        kwargs (dict): The keyword arguments passed to the wrapper
+
+    Kwargs:
+        conf (dict): The pipe configuration. May contain the keys
+            'aggregates', 'aggregate_key', or 'group_key' (see `pipe`).
+
+        assign (str): Attribute to assign parsed content. If `group_key` is
+            set, this is ignored and the group keys are used instead.
+            (default: aggregate)
+
+    Returns:
+        Deferred: twisted.internet.defer.Deferred iterator of the aggregates
+
+    Examples:
+        >>> from riko.bado import react
+        >>> from riko.bado.mock import FakeReactor
+        >>>
+        >>> def run(reactor):
+        ...     conf = {'aggregates': ['sum', 'max']}
+        ...     callback = lambda x: print(next(x) == {
+        ...         'aggregate': {'sum': Decimal('10'), 'max': Decimal('4')}})
+        ...     items = ({'content': x} for x in range(5))
+        ...     d = async_pipe(items, conf=conf)
+        ...     return d.addCallbacks(callback, logger.error)
+        >>>
+        >>> try:
+        ...     react(run, _reactor=FakeReactor())
+        ... except SystemExit:
+        ...     pass
+        ...
+        True
+    """
+    return parser(*args, **kwargs)
+
+
+@operator(DEFAULTS, **OPTS)
+def pipe(*args, **kwargs):
+    """An aggregator that eagerly computes several aggregates of fields of
+    items in a stream in a single pass. Note that this pipe is not lazy.
+
+    Args:
+        items (Iter[dict]): The source.
+        kwargs (dict): The keyword arguments passed to the wrapper
+
+    Kwargs:
+        conf (dict): The pipe configuration. May contain the keys
+            'aggregates', 'aggregate_key', or 'group_key'.
+
+            aggregates (List[str]): The aggregates to compute. Any of
+                'count', 'sum', 'mean', 'min', or 'max' (default: all).
+
+            aggregate_key (str): Item attribute to aggregate (default:
+                'content').
+
+            group_key (str): Item attribute to group by. This will group
+                items in the stream by the given key and report the
+                aggregates of each group, in the order the groups were first
+                seen (default: None).
+
+        assign (str): Attribute to assign parsed content. If `group_key` is
+            set, this is ignored and the group keys are used instead.
+            (default: aggregate)
+
+    Yields:
+        dict: the aggregates
+
+    Examples:
+        >>> stream = [
+        ...     {'amount': 2, 'x': 'two'},
+        ...     {'amount': 1, 'x': 'one'},
+        ...     {'amount': 4, 'x': 'two'}]
+        >>> conf = {
+        ...     'aggregates': ['min', 'max'], 'aggregate_key': 'amount',
+        ...     'group_key': 'x'}
+        >>> aggregated = pipe(stream, conf=conf)
+        >>> next(aggregated) == {
+        ...     'two': {'min': Decimal('2'), 'max': Decimal('4')}}
+        True
+        >>> next(pipe([], conf={'aggregates': ['count']})) == {
+        ...     'aggregate': {'count': 0}}
+        True
+    """
+    return parser(*args, **kwargs)
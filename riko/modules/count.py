@@ -20,13 +20,12 @@ Attributes:
 from __future__ import (
     absolute_import, division, print_function, unicode_literals)
 
-import itertools as it
 import pygogo as gogo
 
-from operator import itemgetter
 from builtins import *  # noqa # pylint: disable=unused-import
 
 from . import operator
+from riko.utils import aggregate
 
 OPTS = {'extract': 'count_key'}
 DEFAULTS = {'count_key': None}
@@ -67,18 +66,17 @@ def parser(stream, key, tuples, **kwargs):
         >>> stream = [{'word': 'two'}, {'word': 'one'}, {'word': 'two'}]
         >>> tuples = zip(stream, repeat(conf['count_key']))
         >>> counted = parser(stream, conf['count_key'], tuples, **kwargs)
-        >>> next(counted) == {'one': 1}
-        True
         >>> next(counted) == {'two': 2}
         True
+        >>> next(counted) == {'one': 1}
+        True
     """
     if key:
-        keyfunc = itemgetter(key)
-        sorted_stream = sorted(stream, key=keyfunc)
-        grouped = it.groupby(sorted_stream, keyfunc)
-        counted = ({key: len(list(group))} for key, group in grouped)
+        keyfunc = lambda item: item.get(key)
+        grouped = aggregate(stream, ['count'], keyfunc)
+        counted = ({k: v['count']} for k, v in grouped.items())
     else:
-        counted = {kwargs['assign']: len(list(stream))}
+        counted = {kwargs['assign']: sum(1 for _ in stream)}
 
     return counted
 
@@ -97,7 +95,8 @@ def async_pipe(*args, **kwargs):
 
             count_key (str): Item attribute to count by. This will group items
                 in the stream by the given key and report a count for each
-                group (default: None).
+                group, in the order the groups were first seen (default:
+                None).
 
         assign (str): Attribute to assign parsed content. If `count_key` is set,
             this is ignored and the group keys are used instead. (default:
@@ -141,7 +140,8 @@ def pipe(*args, **kwargs):
 
             count_key (str): Item attribute to count by. This will group items
                 in the stream by the given key and report a count for each
-                group (default: None).
+                group, in the order the groups were first seen (default:
+                None).
 
         assign (str): Attribute to assign parsed content. If `count_key` is set,
             this is ignored and the group keys are used instead. (default:
@@ -156,9 +156,9 @@ def pipe(*args, **kwargs):
         True
         >>> stream = [{'word': 'two'}, {'word': 'one'}, {'word': 'two'}]
         >>> counted = pipe(stream, conf={'count_key': 'word'})
-        >>> next(counted) == {'one': 1}
-        True
         >>> next(counted) == {'two': 2}
         True
+        >>> next(counted) == {'one': 1}
+        True
     """
     return parser(*args, **kwargs)
@@ -31,12 +31,14 @@ from meza.process import merge
 from . import processor
 from riko import ENCODING
 from riko.bado import coroutine, return_value, io
+from riko.parsers import CSVConsumer
 from riko.utils import fetch, auto_close, get_abspath
 
 OPTS = {'ftype': 'none'}
 DEFAULTS = {
     'delimiter': ',', 'quotechar': '"', 'encoding': ENCODING, 'skip_rows': 0,
-    'sanitize': True, 'dedupe': True, 'col_names': None, 'has_header': True}
+    'sanitize': True, 'dedupe': True, 'col_names': None, 'has_header': True,
+    'revalidate': False}
 
 logger = gogo.Gogo(__name__, monolog=True).logger
 
@@ -84,11 +86,17 @@ def async_parser(_, objconf, skip=False, **kwargs):
         stream = kwargs['stream']
     else:
         url = get_abspath(objconf.url)
-        r = yield io.async_url_open(url)
         first_row, custom_header = objconf.skip_rows, objconf.col_names
         renamed = {'first_row': first_row, 'custom_header': custom_header}
         rkwargs = merge([objconf, renamed])
-        stream = auto_close(read_csv(r, **rkwargs), r)
+        key = 'csv:%r' % sorted(rkwargs.items())
+        revalidate = objconf.revalidate
+
+        # parse the rows while the response is still arriving
+        consumer = CSVConsumer(**rkwargs)
+        args = (url, consumer)
+        rows = yield io.async_url_parse(*args, revalidate=revalidate, key=key)
+        stream = iter(rows)
 
     return_value(stream)
 
@@ -125,7 +133,14 @@ def parser(_, objconf, skip=False, **kwargs):
 
         f = fetch(decode=True, **objconf)
         rkwargs = merge([objconf, renamed])
-        stream = auto_close(read_csv(f, **rkwargs), f)
+        key = 'csv:%r' % sorted(rkwargs.items())
+        items = f.get_items(key)
+
+        if items is None:
+            stream = auto_close(f.tee_items(read_csv(f, **rkwargs), key), f)
+        else:
+            f.close()
+            stream = iter(items)
 
     return stream
 
@@ -142,7 +157,7 @@ def async_pipe(*args, **kwargs):
     Kwargs:
         conf (dict): The pipe configuration. Must contain the key 'url'. May
             contain the keys 'delimiter', 'quotechar', 'encoding', 'skip_rows',
-            'sanitize', 'dedupe', 'col_names', or 'has_header'.
+            'sanitize', 'dedupe', 'col_names', 'has_header', or 'revalidate'.
 
             url (str): The csv file to fetch
             delimiter (str): Field delimiter (default: ',').
@@ -157,6 +172,9 @@ def async_pipe(*args, **kwargs):
 
             dedupe (bool): Deduplicate column names (default: False).
             col_names (List[str]): Custom column names (default: None).
+            revalidate (bool): Send the validators (`ETag`/`Last-Modified`)
+                of the last response, and reuse its rows if the file wasn't
+                modified (default: False).
 
     Returns:
         dict: twisted.internet.defer.Deferred item
@@ -193,7 +211,7 @@ def pipe(*args, **kwargs):
     Kwargs:
         conf (dict): The pipe configuration. Must contain the key 'url'. May
             contain the keys 'delimiter', 'quotechar', 'encoding', 'skip_rows',
-            'sanitize', 'dedupe', 'col_names', or 'has_header'.
+            'sanitize', 'dedupe', 'col_names', 'has_header', or 'revalidate'.
 
             url (str): The csv file to fetch
             delimiter (str): Field delimiter (default: ',').
@@ -208,6 +226,9 @@ def pipe(*args, **kwargs):
 
             dedupe (bool): Deduplicate column names (default: False).
             col_names (List[str]): Custom column names (default: None).
+            revalidate (bool): Send the validators (`ETag`/`Last-Modified`)
+                of the last response, and reuse its rows if the file wasn't
+                modified (default: False).
 
     Yields:
         dict: item
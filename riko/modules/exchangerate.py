@@ -15,6 +15,9 @@ Examples:
         >>> next(pipe({'content': 'GBP'}, conf={'url': url}))['exchangerate']
         Decimal('1.545801')
 
+The rate table of each `url` and `params` is fetched once and shared by all
+pipes in the process until it is `ttl` seconds old.
+
 Attributes:
     OPTS (dict): The default pipe options
     DEFAULTS (dict): The default parser options
@@ -26,14 +29,16 @@ import pygogo as gogo
 
 from json import loads
 from decimal import Decimal
+from threading import Lock
+from time import time
 
 from builtins import *  # noqa # pylint: disable=unused-import
 from ijson import items
 from meza.compat import decode
 
 from . import processor
-from riko.bado import coroutine, return_value, requests as treq, io
-from riko.utils import fetch, get_abspath
+from riko.bado import coroutine, return_value, requests as treq, io, util
+from riko.utils import fetch, get_abspath, make_hashable
 
 EXCHANGE_API_BASE = 'http://finance.yahoo.com/webservice'
 EXCHANGE_API = '%s/v1/symbols/allcurrencies/quote' % EXCHANGE_API_BASE
@@ -46,11 +51,19 @@ DEFAULTS = {
     'delay': 0,
     'memoize': False,
     'precision': 6,
+    'ttl': 300,
     'url': EXCHANGE_API,
     'params': {'format': 'json'}}
 
 logger = gogo.Gogo(__name__, monolog=True).logger
 
+# rate tables keyed by (url, params), the fetches still in progress, and the
+# locks guarding the fetch of each table
+_TABLES = {}
+_PENDING = {}
+_LOCKS = {}
+_LOCK = Lock()
+
 
 def parse_response(json):
     resources = json['list']['resources']
@@ -58,6 +71,141 @@ def parse_response(json):
     return {i['symbol']: Decimal(i['price']) for i in fields}
 
 
+class RateTable(object):
+    """Parsed exchange rates along with the rates calculated from them
+
+    Examples:
+        >>> table = RateTable({'GBP=X': Decimal('0.5')}, ttl=60)
+        >>> table.calc_rate('GBP', 'USD', Decimal('0.01'))
+        Decimal('2.00')
+        >>> table.expired
+        False
+    """
+    def __init__(self, rates, ttl=0):
+        self.rates = rates
+        self.expires = time() + ttl
+        self.calculated = {}
+
+    @property
+    def expired(self):
+        return time() >= self.expires
+
+    def calc_rate(self, from_cur, to_cur, places):
+        key = (from_cur, to_cur, places)
+
+        try:
+            rate = self.calculated[key]
+        except KeyError:
+            rate = calc_rate(from_cur, to_cur, self.rates, places=places)
+            self.calculated[key] = rate
+
+        return rate
+
+
+def get_table_key(objconf):
+    return (objconf.url, make_hashable(objconf.params))
+
+
+def get_cached_table(key):
+    table = _TABLES.get(key)
+    return None if table is None or table.expired else table
+
+
+def set_table(key, rates, ttl=None):
+    table = RateTable(rates, ttl or 0)
+
+    if ttl:
+        _TABLES[key] = table
+
+    return table
+
+
+def get_lock(key):
+    """Returns the lock guarding the fetch of a rate table"""
+    with _LOCK:
+        return _LOCKS.setdefault(key, Lock())
+
+
+def fetch_table(key, objconf):
+    decode = objconf.url.startswith('http')
+
+    with fetch(decode=decode, **objconf) as f:
+        json = next(items(f, ''))
+
+    return set_table(key, parse_response(json), objconf.ttl)
+
+
+def get_table(objconf):
+    """Fetches (or looks up) the rate table of `objconf.url`
+
+    Examples:
+        >>> from riko import get_path
+        >>> from meza.fntools import Objectify
+        >>>
+        >>> conf = {'url': get_path('quote.json'), 'ttl': 60}
+        >>> table = get_table(Objectify(conf))
+        >>> get_table(Objectify(conf)) is table
+        True
+    """
+    key = get_table_key(objconf)
+    table = get_cached_table(key)
+
+    if table is None and objconf.ttl:
+        # only one thread fetches a given table
+        with get_lock(key):
+            table = get_cached_table(key) or fetch_table(key, objconf)
+    elif table is None:
+        # an uncached table can't be shared, so there's nothing to wait for
+        table = fetch_table(key, objconf)
+
+    return table
+
+
+@coroutine
+def async_fetch_table(key, objconf):
+    try:
+        if objconf.url.startswith('http'):
+            r = yield treq.get(objconf.url, params=objconf.params)
+            json = yield treq.json(r)
+        else:
+            url = get_abspath(objconf.url)
+            content = yield io.async_url_read(url, delay=objconf.delay)
+            json = loads(decode(content))
+
+        table = set_table(key, parse_response(json), objconf.ttl)
+    except Exception as e:
+        for d in _PENDING.pop(key):
+            d.errback(e)
+
+        raise
+    else:
+        for d in _PENDING.pop(key):
+            d.callback(table)
+
+    return_value(table)
+
+
+@coroutine
+def async_get_table(objconf):
+    """Asynchronously fetches (or looks up) the rate table of `objconf.url`.
+    Concurrent requests for the same table share a single fetch.
+    """
+    key = get_table_key(objconf)
+    table = get_cached_table(key)
+
+    if table is not None:
+        pass
+    elif key in _PENDING:
+        d = util.Deferred()
+        _PENDING[key].append(d)
+        table = yield d
+    else:
+        _PENDING[key] = []
+        table = yield async_fetch_table(key, objconf)
+
+    return_value(table)
+
+
 def calc_rate(from_cur, to_cur, rates, places=Decimal('0.0001')):
     def get_rate(currency):
         rate = rates.get('%s=X' % currency, Decimal('nan'))
@@ -125,18 +273,10 @@ def async_parser(base, objconf, skip=False, **kwargs):
         rate = kwargs['stream']
     elif same_currency:
         rate = Decimal(1)
-    elif objconf.url.startswith('http'):
-        r = yield treq.get(objconf.url, params=objconf.params)
-        json = yield treq.json(r)
     else:
-        url = get_abspath(objconf.url)
-        content = yield io.async_url_read(url, delay=objconf.delay)
-        json = loads(decode(content))
-
-    if not (skip or same_currency):
+        table = yield async_get_table(objconf)
         places = Decimal(10) ** -objconf.precision
-        rates = parse_response(json)
-        rate = calc_rate(base, objconf.currency, rates, places=places)
+        rate = table.calc_rate(base, objconf.currency, places)
 
     return_value(rate)
 
@@ -176,15 +316,9 @@ def parser(base, objconf, skip=False, **kwargs):
     elif same_currency:
         rate = Decimal(1)
     else:
-        decode = objconf.url.startswith('http')
-
-        with fetch(decode=decode, **objconf) as f:
-            json = next(items(f, ''))
-
-    if not (skip or same_currency):
+        table = get_table(objconf)
         places = Decimal(10) ** -objconf.precision
-        rates = parse_response(json)
-        rate = calc_rate(base, objconf.currency, rates, places=places)
+        rate = table.calc_rate(base, objconf.currency, places)
 
     return rate
 
@@ -200,7 +334,7 @@ def async_pipe(*args, **kwargs):
 
     Kwargs:
         conf (dict): The pipe configuration. May contain the keys 'url',
-            'params', 'currency', 'delay', 'memoize', or 'field'.
+            'params', 'currency', 'delay', 'memoize', 'ttl', or 'field'.
 
             url (str): The exchange rate API url (default:
                 http://finance.yahoo.com...)
@@ -215,6 +349,10 @@ def async_pipe(*args, **kwargs):
             memoize (bool): Cache the exchange rate API response (default:
                 False).
 
+            ttl (int): Number of seconds to share the parsed exchange rates
+                between items and pipes. Set to 0 to fetch the rates for each
+                item (default: 300).
+
         field (str): Item attribute from which to obtain the string to be
             formatted (default: 'content')
 
@@ -256,7 +394,7 @@ def pipe(*args, **kwargs):
 
     Kwargs:
         conf (dict): The pipe configuration. May contain the keys 'url',
-            'params', 'currency', 'delay', 'memoize', or 'field'.
+            'params', 'currency', 'delay', 'memoize', 'ttl', or 'field'.
 
             url (str): The exchange rate API url (default:
                 http://finance.yahoo.com...)
@@ -271,6 +409,10 @@ def pipe(*args, **kwargs):
             memoize (bool): Cache the exchange rate API response (default:
                 False).
 
+            ttl (int): Number of seconds to share the parsed exchange rates
+                between items and pipes. Set to 0 to fetch the rates for each
+                item (default: 300).
+
         field (str): Item attribute from which to obtain the string to be
             formatted (default: 'content')
 
@@ -35,7 +35,7 @@ from riko.parsers import parse_rss
 from riko.utils import gen_entries, get_abspath
 
 OPTS = {'ftype': 'none'}
-DEFAULTS = {'delay': 0}
+DEFAULTS = {'delay': 0, 'parser': 'auto', 'revalidate': False}
 logger = gogo.Gogo(__name__, monolog=True).logger
 intersection = [
     'author', 'author.name', 'author.uri', 'dc:creator', 'id', 'link',
@@ -82,8 +82,9 @@ def async_parser(_, objconf, skip=False, **kwargs):
         stream = kwargs['stream']
     else:
         url = get_abspath(objconf.url)
-        content = yield io.async_url_read(url, delay=objconf.delay)
-        parsed = parse_rss(content)
+        rkwargs = {'delay': objconf.delay, 'revalidate': objconf.revalidate}
+        content = yield io.async_url_read(url, **rkwargs)
+        parsed = parse_rss(content, objconf.parser)
         stream = gen_entries(parsed)
 
     return_value(stream)
@@ -134,12 +135,20 @@ def async_pipe(*args, **kwargs):
 
     Kwargs:
         conf (dict): The pipe configuration. Must contain the key 'url'. May
-            contain the key 'delay'.
+            contain the keys 'delay', 'parser', or 'revalidate'.
 
             url (str): The web site to fetch.
             delay (flt): Amount of time to sleep (in secs) before fetching the
                 url. Useful for simulating network latency. Default: 0.
 
+            parser (str): The feed parser to use. Either 'lxml' (fast, and
+                streams the entries) or 'auto', i.e., speedparser if it's
+                installed and feedparser otherwise (default: 'auto').
+
+            revalidate (bool): Send the validators (`ETag`/`Last-Modified`)
+                of the last response, and reuse its entries if the feed
+                wasn't modified (default: False).
+
 
     Returns:
         Deferred: twisted.internet.defer.Deferred iterator of items
@@ -176,12 +185,20 @@ def pipe(*args, **kwargs):
 
     Kwargs:
         conf (dict): The pipe configuration. Must contain the key 'url'. May
-            contain the key 'delay'.
+            contain the keys 'delay', 'parser', or 'revalidate'.
 
             url (str): The web site to fetch.
             delay (flt): Amount of time to sleep (in secs) before fetching the
                 url. Useful for simulating network latency. Default: 0.
 
+            parser (str): The feed parser to use. Either 'lxml' (fast, and
+                streams the entries) or 'auto', i.e., speedparser if it's
+                installed and feedparser otherwise (default: 'auto').
+
+            revalidate (bool): Send the validators (`ETag`/`Last-Modified`)
+                of the last response, and reuse its entries if the feed
+                wasn't modified (default: False).
+
     Returns:
         dict: an iterator of items
 
@@ -196,5 +213,9 @@ def pipe(*args, **kwargs):
         >>> keys = next(pipe(conf={'url': url, 'memoize': True})).keys()
         >>> set(keys).issuperset(intersection)
         True
+        >>>
+        >>> keys = next(pipe(conf={'url': url, 'parser': 'lxml'})).keys()
+        >>> set(keys).issuperset(intersection)
+        True
     """
     return parser(*args, **kwargs)
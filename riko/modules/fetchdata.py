@@ -30,16 +30,31 @@ from os import path as p
 import pygogo as gogo
 
 from builtins import *  # noqa # pylint: disable=unused-import
+from meza.fntools import listize
 
 from . import processor
 from riko.bado import coroutine, return_value, io
-from riko.parsers import any2dict
+from riko.parsers import any2dict, any2consumer
 from riko.utils import fetch, get_abspath
 
 OPTS = {'ftype': 'none'}
 logger = gogo.Gogo(__name__, monolog=True).logger
 
 
+def gen_stream(f, ext, html5=False, path=None, iterparse=False):
+    """Lazily parses a file, closing it once all items have been read.
+
+    JSON arrays (and repeating XML elements if `iterparse` is True) are
+    streamed one element at a time, so items are available before the entire
+    file has been parsed.
+    """
+    with f:
+        content = any2dict(f, ext, html5, path=path, iterparse=iterparse)
+
+        for item in listize(content):
+            yield item
+
+
 @coroutine
 def async_parser(_, objconf, skip=False, **kwargs):
     """ Asynchronously parses the pipe content
@@ -63,7 +78,7 @@ def async_parser(_, objconf, skip=False, **kwargs):
         >>> from meza.fntools import Objectify
         >>>
         >>> def run(reactor):
-        ...     callback = lambda x: print(x[0]['title'])
+        ...     callback = lambda x: print(next(x)['title'])
         ...     url = get_path('gigs.json')
         ...     objconf = Objectify({'url': url, 'path': 'value.items'})
         ...     d = async_parser(None, objconf, stream={})
@@ -81,9 +96,19 @@ def async_parser(_, objconf, skip=False, **kwargs):
     else:
         url = get_abspath(objconf.url)
         ext = p.splitext(url)[1].lstrip('.')
-        f = yield io.async_url_open(url)
-        stream = any2dict(f, ext, objconf.html5, path=objconf.path)
-        f.close()
+        consumer = any2consumer(ext, objconf.path, objconf.iterparse)
+        revalidate = objconf.revalidate
+
+        if consumer:
+            # parse the items while the response is still arriving
+            key = 'fetchdata:%r' % [ext, objconf.path, objconf.iterparse]
+            ukwargs = {'revalidate': revalidate, 'key': key}
+            parsed = yield io.async_url_parse(url, consumer, **ukwargs)
+            stream = iter(parsed)
+        else:
+            f = yield io.async_url_open(url, revalidate=revalidate)
+            args = (objconf.html5, objconf.path, objconf.iterparse)
+            stream = gen_stream(f, ext, *args)
 
     return_value(stream)
 
@@ -110,7 +135,7 @@ def parser(_, objconf, skip=False, **kwargs):
         >>> url = get_path('gigs.json')
         >>> objconf = Objectify({'url': url, 'path': 'value.items'})
         >>> result = parser(None, objconf, stream={})
-        >>> result[0]['title'] == 'Business System Analyst'
+        >>> next(result)['title'] == 'Business System Analyst'
         True
     """
     if skip:
@@ -119,9 +144,16 @@ def parser(_, objconf, skip=False, **kwargs):
         url = get_abspath(objconf.url)
         ext = p.splitext(url)[1].lstrip('.')
 
-        with fetch(**objconf) as f:
-            ext = ext or f.ext
-            stream = any2dict(f, ext, objconf.html5, path=objconf.path)
+        f = fetch(**objconf)
+        args = [ext or f.ext, objconf.html5, objconf.path, objconf.iterparse]
+        key = 'fetchdata:%r' % args
+        items = f.get_items(key)
+
+        if items is None:
+            stream = f.tee_items(gen_stream(f, *args), key)
+        else:
+            f.close()
+            stream = iter(items)
 
     return stream
 
@@ -137,13 +169,21 @@ def async_pipe(*args, **kwargs):
 
     Kwargs:
         conf (dict): The pipe configuration. Must contain the key 'url'. May
-            contain the keys 'path' or 'html5'.
+            contain the keys 'path', 'html5', 'iterparse', or 'revalidate'.
 
             url (str): The web site to fetch
             path (str): Dot separated path to extract (default: None, i.e.,
-                return entire page)
+                return entire page). JSON arrays are streamed one element
+                at a time.
 
             html5 (bool): Use the HTML5 parser (default: False)
+            iterparse (bool): Incrementally parse XML, yielding every element
+                matching `path` as soon as it's parsed (default: False, i.e.,
+                parse the entire document and return the first match)
+
+            revalidate (bool): Send the validators (`ETag`/`Last-Modified`)
+                of the last response, and reuse its items if the url wasn't
+                modified (default: False)
 
     Returns:
         Deferred: twisted.internet.defer.Deferred stream of items
@@ -181,13 +221,21 @@ def pipe(*args, **kwargs):
 
     Kwargs:
         conf (dict): The pipe configuration. Must contain the key 'url'. May
-            contain the keys 'path' or 'html5'.
+            contain the keys 'path', 'html5', 'iterparse', or 'revalidate'.
 
             url (str): The web site to fetch
             path (str): Dot separated path to extract (default: None, i.e.,
-                return entire page)
+                return entire page). JSON arrays are streamed one element
+                at a time.
 
             html5 (bool): Use the HTML5 parser (default: False)
+            iterparse (bool): Incrementally parse XML, yielding every element
+                matching `path` as soon as it's parsed (default: False, i.e.,
+                parse the entire document and return the first match)
+
+            revalidate (bool): Send the validators (`ETag`/`Last-Modified`)
+                of the last response, and reuse its items if the url wasn't
+                modified (default: False)
 
     Returns:
         dict: an iterator of items
@@ -208,6 +256,9 @@ def pipe(*args, **kwargs):
         >>> conf = {'url': get_path('schools.xml'), 'path': 'data.row'}
         >>> next(pipe(conf=conf))['district_name'] == 'Turkana'
         True
+        >>> conf['iterparse'] = True
+        >>> [i['district_name'] for i in pipe(conf=conf)][1] == 'Marsabit'
+        True
 
     """
     return parser(*args, **kwargs)
@@ -98,7 +98,7 @@ def async_parser(_, objconf, skip=False, **kwargs):
         stream = kwargs['stream']
     else:
         url = get_abspath(objconf.url)
-        content = yield io.async_url_read(url)
+        content = yield io.async_url_read(url, revalidate=objconf.revalidate)
         parsed = get_string(content, objconf.start, objconf.end)
         detagged = get_text(parsed) if objconf.detag else parsed
         splits = detagged.split(objconf.token) if objconf.token else [detagged]
@@ -135,14 +135,24 @@ def parser(_, objconf, skip=False, **kwargs):
     if skip:
         stream = kwargs['stream']
     else:
+        assign = kwargs['assign']
+        args = [objconf.start, objconf.end, objconf.detag, objconf.token]
+        key = 'fetchpage:%r' % (args + [assign])
+
         with fetch(decode=True, **objconf) as f:
-            sliced = betwix(f, objconf.start, objconf.end, True)
-            content = '\n'.join(sliced)
+            items = f.get_items(key)
 
-        parsed = get_string(content, objconf.start, objconf.end)
-        detagged = get_text(parsed) if objconf.detag else parsed
-        splits = detagged.split(objconf.token) if objconf.token else [detagged]
-        stream = ({kwargs['assign']: chunk} for chunk in splits)
+            if items is None:
+                sliced = betwix(f, objconf.start, objconf.end, True)
+                content = '\n'.join(sliced)
+                parsed = get_string(content, objconf.start, objconf.end)
+                detagged = get_text(parsed) if objconf.detag else parsed
+                token = objconf.token
+                splits = detagged.split(token) if token else [detagged]
+                items = [{assign: chunk} for chunk in splits]
+                f.set_items(items, key)
+
+        stream = iter(items)
 
     return stream
 
@@ -158,7 +168,8 @@ def async_pipe(*args, **kwargs):
 
     Kwargs:
         conf (dict): The pipe configuration. Must contain the key 'url'. May
-            contain the keys 'start', 'end', 'token', or 'detag'.
+            contain the keys 'start', 'end', 'token', 'detag', or
+            'revalidate'.
 
             url (str): The web site to fetch
             start (str): The starting string to fetch (exclusive, default:
@@ -167,6 +178,9 @@ def async_pipe(*args, **kwargs):
             end (str): The ending string to fetch (exclusive, default: None).
             token (str): The tokenizer delimiter string (default: None).
             detag (bool): Remove html tags from content (default: False).
+            revalidate (bool): Send the validators (`ETag`/`Last-Modified`)
+                of the last response, and reuse its items if the page wasn't
+                modified (default: False).
 
         assign (str): Attribute to assign parsed content (default: content)
 
@@ -207,7 +221,8 @@ def pipe(*args, **kwargs):
 
     Kwargs:
         conf (dict): The pipe configuration. Must contain the key 'url'. May
-            contain the keys 'start', 'end', 'token', or 'detag'.
+            contain the keys 'start', 'end', 'token', 'detag', or
+            'revalidate'.
 
             url (str): The web site to fetch
             start (str): The starting string to fetch (exclusive, default:
@@ -216,6 +231,9 @@ def pipe(*args, **kwargs):
             end (str): The ending string to fetch (exclusive, default: None).
             token (str): The tokenizer delimiter string (default: None).
             detag (bool): Remove html tags from content (default: False).
+            revalidate (bool): Send the validators (`ETag`/`Last-Modified`)
+                of the last response, and reuse its items if the page wasn't
+                modified (default: False).
 
         assign (str): Attribute to assign parsed content (default: content)
 
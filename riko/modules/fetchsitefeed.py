@@ -48,6 +48,7 @@ from riko.parsers import parse_rss
 from riko.bado import coroutine, return_value, io
 
 OPTS = {'ftype': 'none'}
+DEFAULTS = {'parser': 'auto'}
 logger = gogo.Gogo(__name__, monolog=True).logger
 
 
@@ -93,7 +94,7 @@ def async_parser(_, objconf, skip=False, **kwargs):
         rss = yield autorss.async_get_rss(url)
         link = get_abspath(next(rss)['link'])
         content = yield io.async_url_read(link)
-        parsed = parse_rss(content)
+        parsed = parse_rss(content, objconf.parser)
         stream = gen_entries(parsed)
 
     return_value(stream)
@@ -136,7 +137,7 @@ def parser(_, objconf, skip=False, **kwargs):
     return stream
 
 
-@processor(isasync=True, **OPTS)
+@processor(DEFAULTS, isasync=True, **OPTS)
 def async_pipe(*args, **kwargs):
     """A source that fetches and parses the first feed found on a site.
 
@@ -145,9 +146,13 @@ def async_pipe(*args, **kwargs):
         kwargs (dict): The keyword arguments passed to the wrapper.
 
     Kwargs:
-        conf (dict): The pipe configuration. Must contain the key 'url'.
+        conf (dict): The pipe configuration. Must contain the key 'url'. May
+            contain the key 'parser'.
 
             url (str): The web site to fetch
+            parser (str): The feed parser to use. Either 'lxml' (fast, and
+                streams the entries) or 'auto', i.e., speedparser if it's
+                installed and feedparser otherwise (default: 'auto').
 
     Returns:
         dict: twisted.internet.defer.Deferred an iterator of items
@@ -173,7 +178,7 @@ def async_pipe(*args, **kwargs):
     return async_parser(*args, **kwargs)
 
 
-@processor(**OPTS)
+@processor(DEFAULTS, **OPTS)
 def pipe(*args, **kwargs):
     """A source that fetches and parses the first feed found on a site.
 
@@ -182,9 +187,13 @@ def pipe(*args, **kwargs):
         kwargs (dict): The keyword arguments passed to the wrapper
 
     Kwargs:
-        conf (dict): The pipe configuration. Must contain the key 'url'.
+        conf (dict): The pipe configuration. Must contain the key 'url'. May
+            contain the key 'parser'.
 
             url (str): The web site to fetch
+            parser (str): The feed parser to use. Either 'lxml' (fast, and
+                streams the entries) or 'auto', i.e., speedparser if it's
+                installed and feedparser otherwise (default: 'auto').
 
     Yields:
         dict: item
@@ -51,7 +51,7 @@ COMBINE_BOOLEAN = {'and': all, 'or': any}
 SWITCH = {
     'contains': lambda x, y: x and y.lower() in x.lower(),
     'doesnotcontain': lambda x, y: x and y.lower() not in x.lower(),
-    'matches': lambda x, y: re.search(y, x),
+    'matches': lambda x, y: isinstance(x, str) and re.search(y, x),
     'eq': op.eq,
     'is': op.eq,
     'isnot': op.ne,
@@ -69,44 +69,197 @@ logger = gogo.Gogo(__name__, monolog=True).logger
 is_iterable = lambda item: ITER_ATTRS.intersection(dir(item))
 
 
-def _parse_x_y(_x, _y):
+# The relative cost of evaluating each kind of predicate. Rules are
+# evaluated cheapest first so that `combine` can short-circuit early.
+COSTS = {'const': 0, 'truthy': 0, 'text': 1, 'matches': 2, 'num': 3, 'date': 4}
+DECIMAL_ERRORS = (InvalidOperation, TypeError, ValueError)
+DATE_ERRORS = (ValueError, KeyError, IndexError, TypeError)
+
+# Since rules are reordered, a predicate must not raise on a value that an
+# earlier rule would have otherwise short-circuited
+PREDICATE_ERRORS = (AttributeError, TypeError, ValueError)
+
+
+def parse_value(value):
+    """Parses a rule value as both a Decimal and a date
+
+    Args:
+        value (scalar): The rule value
+
+    Returns:
+        Tuple(Decimal, date, Exception): The Decimal (or None), the date (or
+            None), and the error raised while parsing the date (or None)
+
+    Examples:
+        >>> y_num, y_date, y_error = parse_value('web')
+        >>> y_num is None
+        True
+        >>> y_error is None
+        False
+    """
     try:
-        x = Decimal(_x)
-        y = Decimal(_y)
-    except (InvalidOperation, TypeError, ValueError):
+        y_num = Decimal(value)
+    except DECIMAL_ERRORS:
+        y_num = None
+
+    try:
+        y_date, y_error = cast_date(value)['date'], None
+    except Exception as e:
+        y_date, y_error = None, e
+
+    return y_num, y_date, y_error
+
+
+def get_parser(value):
+    """Creates a function that parses a field value in the same way as the
+    (constant) rule value, i.e., as a Decimal, date, or as is. The rule value
+    is only parsed once.
+
+    Args:
+        value (scalar): The rule value
+
+    Returns:
+        Tuple(str, func): The parsed type ('num', 'date', or 'text') and a
+            function of 1 arg (the field value) that returns a tuple of the
+            parsed field value and the parsed rule value
+
+    Examples:
+        >>> kind, parse = get_parser('3')
+        >>> kind
+        'num'
+        >>> parse('5') == (Decimal('5'), Decimal('3'))
+        True
+        >>> parse('five') == ('five', '3')
+        True
+    """
+    y_num, y_date, y_error = parse_value(value)
+
+    def parse_date(x):
         try:
-            x = cast_date(_x)['date']
-            y = cast_date(_y)['date']
-        except (ValueError, KeyError, IndexError, TypeError):
-            x, y = _x, _y
+            parsed = cast_date(x)['date']
+        except DATE_ERRORS:
+            parsed = None
+        else:
+            if y_error and not isinstance(y_error, DATE_ERRORS):
+                raise y_error
 
-    return x, y
+        return (x, value) if y_error or parsed is None else (parsed, y_date)
 
+    def parse_num(x):
+        try:
+            parsed = (Decimal(x), y_num)
+        except DECIMAL_ERRORS:
+            parsed = parse_date(x)
 
-def parse_rule(rule, item, **kwargs):
-    truthy_like = rule.op in {'truthy', 'falsy'}
-    _x, _y = item.get(rule.field, **kwargs), rule.value
-    has_value = _y is not None
+        return parsed
 
-    if has_value and not truthy_like:
-        x, y = _parse_x_y(_x, _y)
+    if y_num is not None:
+        kind, parse = 'num', parse_num
+    elif y_error is None:
+        kind, parse = 'date', parse_date
     else:
-        x, y = _x, _y
+        kind, parse = 'text', lambda x: (x, value)
+
+    return kind, parse
+
 
-    if has_value or truthy_like:
-        operation = SWITCH.get(rule.op)
+def get_contains(ruleop, value, parse, get):
+    """Creates a case insensitive (doesnot)contains predicate. The rule value
+    is only lowercased once.
 
-    if truthy_like:
-        result = operation(x)
-    elif has_value:
+    Args:
+        ruleop (str): The rule op (either 'contains' or 'doesnotcontain')
+        value (str): The rule value
+        parse (func): The field value parser (see `get_parser`)
+        get (func): Function of 1 arg (item) that returns the field value
+
+    Returns:
+        func: A function of 1 arg (item) that returns whether the item
+            satisfies the rule
+
+    Examples:
+        >>> get = lambda item: item['title']
+        >>> kind, parse = get_parser('WEB')
+        >>> contains = get_contains('contains', 'WEB', parse, get)
+        >>> contains({'title': 'web dev'})
+        True
+    """
+    needle = value.lower() if hasattr(value, 'lower') else None
+
+    if ruleop == 'contains':
+        found = lambda x, y: y in x
+    else:
+        found = lambda x, y: y not in x
+
+    def predicate(item):
         try:
-            result = operation(x, y)
-        except AttributeError:
+            x, y = parse(get(item))
+            lowered = needle if needle and y is value else y.lower()
+            result = bool(x) and found(x.lower(), lowered)
+        except PREDICATE_ERRORS:
             result = False
+
+        return result
+
+    return predicate
+
+
+def get_predicate(rule, **kwargs):
+    """Compiles a rule into a predicate
+
+    Args:
+        rule (obj): The rule (an Objectify instance)
+        kwargs (dict): Keyword arguments passed to `DotDict.get`
+
+    Returns:
+        Tuple(int, func): The relative cost of the predicate, and a function
+            of 1 arg (item) that returns whether the item satisfies the rule
+
+    Examples:
+        >>> from meza.fntools import Objectify
+        >>> from riko.dotdict import DotDict
+        >>>
+        >>> rule = {'field': 'title', 'op': 'matches', 'value': '^[0-9]'}
+        >>> cost, predicate = get_predicate(Objectify(rule))
+        >>> bool(predicate(DotDict({'title': '1st place'})))
+        True
+        >>> rule = {'field': 'x', 'op': 'greater', 'value': '3'}
+        >>> cost, predicate = get_predicate(Objectify(rule))
+        >>> predicate(DotDict({'x': '10'}))
+        True
+    """
+    field, value = rule.field, rule.value
+    get = lambda item: item.get(field, **kwargs)
+    operation = SWITCH.get(rule.op)
+
+    if rule.op in {'truthy', 'falsy'}:
+        kind = 'truthy'
+        predicate = lambda item: operation(get(item))
+    elif value is None:
+        kind = 'const'
+        predicate = lambda item: False
+    elif rule.op == 'matches':
+        # `re.search` only works with (unparsed) text
+        kind, regex = 'matches', re.compile(value)
+
+        def predicate(item):
+            x = get(item)
+            return isinstance(x, str) and bool(regex.search(x))
+    elif rule.op in {'contains', 'doesnotcontain'}:
+        kind, parse = get_parser(value)
+        predicate = get_contains(rule.op, value, parse, get)
     else:
-        result = False
+        kind, parse = get_parser(value)
 
-    return result
+        def predicate(item):
+            try:
+                result = operation(*parse(get(item)))
+            except PREDICATE_ERRORS:
+                result = False
+
+            return result
+
+    return COSTS[kind], predicate
 
 
 def parser(stream, rules, tuples, **kwargs):
@@ -149,12 +302,16 @@ def parser(stream, rules, tuples, **kwargs):
     dynamic = any('subkey' in v for v in conf.values() if is_iterable(v))
     objconf = None if dynamic else parse_conf({}, conf=conf, objectify=True)
 
+    # cheapest rules first
+    compiled = [get_predicate(rule, **kwargs) for rule in rules]
+    predicates = [p for _, p in sorted(compiled, key=op.itemgetter(0))]
+
     for item in stream:
         if dynamic:
             objconf = parse_conf(item, conf=conf, objectify=True)
 
         permit = objconf.mode == 'permit'
-        results = (parse_rule(rule, item, **kwargs) for rule in rules)
+        results = (predicate(item) for predicate in predicates)
 
         try:
             result = COMBINE_BOOLEAN[objconf.combine](results)
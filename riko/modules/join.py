@@ -28,16 +28,20 @@ from __future__ import (
 
 import pygogo as gogo
 
-from itertools import product
+from collections import defaultdict
+from itertools import groupby
 
 from builtins import *  # noqa # pylint: disable=unused-import
 from meza.process import merge, join
 
 from . import operator
+from riko.utils import make_hashable
 
 # disable `dictize` since we do not need to access the configuration
 OPTS = {'dictize': False}
-DEFAULTS = {'join_key': None, 'lower': False}
+DEFAULTS = {
+    'join_key': None, 'lower': False, 'strategy': 'hash',
+    'join_type': 'inner'}
 logger = gogo.Gogo(__name__, monolog=True).logger
 
 
@@ -86,28 +90,137 @@ def parser(stream, objconf, tuples, **kwargs):
         >>> len(list(joined))
         4
     """
-    def compare(x, y):
-        if objconf.lower:
-            x_value, y_value = x.get(x_key, ''), y.get(y_key, '')
-            equal = x_value.lower() == y_value.lower()
-        else:
-            equal = x.get(x_key) == y.get(y_key)
-
-        return equal
-
     if objconf.join_key or objconf.other_join_key:
         x_key = objconf.join_key or objconf.other_join_key
         y_key = objconf.other_join_key or x_key
-        prod = product(stream, kwargs['other'])
-
-        joined = (
-            merge([x, y]) for x, y in prod if compare(x, y))
+        x_keyfunc = get_keyfunc(x_key, objconf.lower)
+        y_keyfunc = get_keyfunc(y_key, objconf.lower)
+        joiner = merge_join if objconf.strategy == 'merge' else hash_join
+        left = objconf.join_type == 'left'
+        args = (stream, kwargs['other'], x_keyfunc, y_keyfunc)
+        joined = joiner(*args, left=left)
     else:
         joined = join(stream, kwargs['other'])
 
     return joined
 
 
+def get_keyfunc(key, lower=False):
+    if lower:
+        keyfunc = lambda item: item.get(key, '').lower()
+    else:
+        keyfunc = lambda item: make_hashable(item.get(key))
+
+    return keyfunc
+
+
+def hash_join(stream, other, x_keyfunc, y_keyfunc, left=False):
+    """Joins two streams by building an index of `other` and then probing it
+    with each item of `stream`. Only `other` is held in memory.
+
+    Examples:
+        >>> from operator import itemgetter
+        >>>
+        >>> stream = [{'x': 1, 'a': 'b'}, {'x': 2, 'a': 'c'}]
+        >>> other = [{'x': 1, 'y': 'z'}, {'x': 1, 'y': 'w'}]
+        >>> keyfunc = itemgetter('x')
+        >>> joined = hash_join(stream, other, keyfunc, keyfunc)
+        >>> [item['y'] for item in joined]
+        ['z', 'w']
+        >>> joined = hash_join(stream, other, keyfunc, keyfunc, left=True)
+        >>> [item.get('y') for item in joined]
+        ['z', 'w', None]
+    """
+    index = defaultdict(list)
+
+    for y in other:
+        index[y_keyfunc(y)].append(y)
+
+    for x in stream:
+        for joined in gen_joined(x, index.get(x_keyfunc(x)), left):
+            yield joined
+
+
+def merge_join(stream, other, x_keyfunc, y_keyfunc, left=False):
+    """Joins two streams which are both sorted (ascending) by their join key.
+    Only the `other` items that share the current join key are held in memory.
+    Items without a join key (i.e., whose key is None) can't be ordered, so
+    they are set aside and (like `hash_join`) joined with each other once
+    `stream` is exhausted.
+
+    Examples:
+        >>> from operator import itemgetter
+        >>>
+        >>> stream = [{'x': 1, 'a': 'b'}, {'x': 2, 'a': 'c'}, {'x': 3}]
+        >>> other = [{'x': 1, 'y': 'z'}, {'x': 1, 'y': 'w'}, {'x': 3}]
+        >>> keyfunc = itemgetter('x')
+        >>> joined = merge_join(stream, other, keyfunc, keyfunc)
+        >>> [(item['x'], item.get('y')) for item in joined]
+        [(1, 'z'), (1, 'w'), (3, None)]
+        >>> joined = merge_join(stream, other, keyfunc, keyfunc, left=True)
+        >>> [item.get('a') for item in joined]
+        ['b', 'b', 'c', None]
+        >>> stream = [{'a': 'b'}, {'x': 1, 'a': 'c'}, {'x': 2, 'a': 'd'}]
+        >>> other = [{'x': 1, 'y': 'z'}, {'y': 'w'}, {'x': 3, 'y': 'v'}]
+        >>> keyfunc = lambda item: item.get('x')
+        >>> joined = merge_join(stream, other, keyfunc, keyfunc)
+        >>> [(item['a'], item['y']) for item in joined]
+        [('c', 'z'), ('b', 'w')]
+        >>> joined = merge_join(stream, other, keyfunc, keyfunc, left=True)
+        >>> [(item['a'], item.get('y')) for item in joined]
+        [('c', 'z'), ('d', None), ('b', 'w')]
+    """
+    unkeyed, pending = [], []
+    keyed = gen_keyed(other, y_keyfunc, unkeyed)
+    groups = ((key, list(group)) for key, group in groupby(keyed, y_keyfunc))
+    group_key, group = next(groups, (None, []))
+
+    for x in stream:
+        x_key = x_keyfunc(x)
+
+        if x_key is None:
+            pending.append(x)
+            continue
+
+        # advance to the first group whose key isn't less than `x_key`
+        while group and group_key < x_key:
+            group_key, group = next(groups, (None, []))
+
+        matches = group if group_key == x_key else []
+
+        for joined in gen_joined(x, matches, left):
+            yield joined
+
+    if pending:
+        # collect the remaining unkeyed `other` items
+        for _ in keyed:
+            pass
+
+    for x in pending:
+        for joined in gen_joined(x, unkeyed, left):
+            yield joined
+
+
+def gen_keyed(items, keyfunc, unkeyed):
+    """Yields the items that have a join key, and sets aside the others by
+    appending them to `unkeyed`"""
+    for item in items:
+        if keyfunc(item) is None:
+            unkeyed.append(item)
+        else:
+            yield item
+
+
+def gen_joined(x, matches, left=False):
+    """Yields `x` merged with each of its matches (or just `x` if it has no
+    matches and this is a left join)"""
+    if matches:
+        for y in matches:
+            yield merge([x, y])
+    elif left:
+        yield merge([x])
+
+
 @operator(DEFAULTS, isasync=True, **OPTS)
 def async_pipe(*args, **kwargs):
     """An aggregator that asynchronously merges multiple source streams together.
@@ -126,6 +239,14 @@ def async_pipe(*args, **kwargs):
             lower (str): Transform values to lower case before comparing
                 (for joining purposes, default: False)
 
+            strategy (str): Either 'hash' or 'merge'. 'hash' indexes `other`
+                by its join key. 'merge' requires both `items` and `other`
+                to be sorted (ascending) by their join key, but only holds
+                items with the same join key in memory (default: 'hash').
+
+            join_type (str): Either 'inner' or 'left'. 'left' also emits the
+                `items` that have no match in `other` (default: 'inner').
+
 
         other (Iter[dict]): stream to join
 
@@ -172,6 +293,14 @@ def pipe(*args, **kwargs):
             lower (str): Transform values to lower case before comparing
                 (for joining purposes, default: False)
 
+            strategy (str): Either 'hash' or 'merge'. 'hash' indexes `other`
+                by its join key. 'merge' requires both `items` and `other`
+                to be sorted (ascending) by their join key, but only holds
+                items with the same join key in memory (default: 'hash').
+
+            join_type (str): Either 'inner' or 'left'. 'left' also emits the
+                `items` that have no match in `other` (default: 'inner').
+
         other (Iter[dict]): stream to join
 
     Yields:
@@ -193,5 +322,12 @@ def pipe(*args, **kwargs):
         True
         >>> next(joined) == {'count': 6, 'x': 'foo-1', 'sum': 1, 'y': 'FOO-1'}
         True
+        >>> other = [{'y': 'foo-%s' % x, 'count': x + 5} for x in range(3, 9)]
+        >>> conf = {
+        ...     'join_key': 'x', 'other_join_key': 'y', 'strategy': 'merge',
+        ...     'join_type': 'left'}
+        >>> joined = pipe(items, conf=conf, other=other)
+        >>> [item.get('count') for item in joined]
+        [None, None, None, 8, 9]
     """
     return parser(*args, **kwargs)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# vim: sw=4:ts=4:expandtab
+"""
+riko.modules.max
+~~~~~~~~~~~~~~~~
+Provides functions for finding the maximum of the items in a stream.
+
+Examples:
+    basic usage::
+
+        >>> from decimal import Decimal
+        >>> from riko.modules.max import pipe
+        >>>
+        >>> stream = pipe({'content': x} for x in range(5))
+        >>> next(stream) == {'max': Decimal('4')}
+        True
+
+Attributes:
+    OPTS (dict): The default pipe options
+    DEFAULTS (dict): The default parser options
+"""
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals)
+
+import pygogo as gogo
+
+from builtins import *  # noqa # pylint: disable=unused-import
+
+from . import operator
+from .aggregate import make_parser
+
+OPTS = {}
+DEFAULTS = {'max_key': 'content', 'group_key': None}
+logger = gogo.Gogo(__name__, monolog=True).logger
+parser = make_parser('max')
+
+
+@operator(DEFAULTS, isasync=True, **OPTS)
+def async_pipe(*args, **kwargs):
+    """An aggregator that asynchronously and eagerly finds the maximum of
+    fields of items in a stream. Note that this pipe is not lazy.
+
+    Args:
+        items (Iter[dict]): The source.
+        kwargs (dict): The keyword arguments passed to the wrapper
+
+    Kwargs:
+        conf (dict): The pipe configuration. See `pipe`.
+        assign (str): Attribute to assign parsed content (default: max)
+
+    Returns:
+        Deferred: twisted.internet.defer.Deferred iterator of the max
+
+    Examples:
+        >>> from decimal import Decimal
+        >>> from riko.bado import react
+        >>> from riko.bado.mock import FakeReactor
+        >>>
+        >>> def run(reactor):
+        ...     callback = lambda x: print(next(x) == {'max': Decimal('4')})
+        ...     items = ({'content': x} for x in range(5))
+        ...     d = async_pipe(items)
+        ...     return d.addCallbacks(callback, logger.error)
+        >>>
+        >>> try:
+        ...     react(run, _reactor=FakeReactor())
+        ... except SystemExit:
+        ...     pass
+        ...
+        True
+    """
+    return parser(*args, **kwargs)
+
+
+@operator(DEFAULTS, **OPTS)
+def pipe(*args, **kwargs):
+    """An aggregator that eagerly finds the maximum of fields of items in a
+    stream. Note that this pipe is not lazy. Use `riko.modules.aggregate` to
+    compute several aggregates in a single pass.
+
+    Args:
+        items (Iter[dict]): The source.
+        kwargs (dict): The keyword arguments passed to the wrapper
+
+    Kwargs:
+        conf (dict): The pipe configuration. May contain the keys 'max_key' or
+            'group_key'.
+
+            max_key (str): Item attribute to aggregate (default: 'content').
+
+            group_key (str): Item attribute to group by. This will group items
+                in the stream by the given key and report the maximum of each
+                group, in the order the groups were first seen (default:
+                None).
+
+        assign (str): Attribute to assign parsed content. If `group_key` is
+            set, this is ignored and the group keys are used instead.
+            (default: max)
+
+    Yields:
+        dict: the max
+
+    Examples:
+        >>> from decimal import Decimal
+        >>>
+        >>> stream = ({'content': x} for x in range(5))
+        >>> next(pipe(stream)) == {'max': Decimal('4')}
+        True
+        >>> stream = [
+        ...     {'amount': 2, 'x': 'two'},
+        ...     {'amount': 1, 'x': 'one'},
+        ...     {'amount': 4, 'x': 'two'}]
+        >>> conf = {'max_key': 'amount', 'group_key': 'x'}
+        >>> aggregated = pipe(stream, conf=conf)
+        >>> next(aggregated) == {'two': Decimal('4')}
+        True
+        >>> next(aggregated) == {'one': Decimal('1')}
+        True
+    """
+    return parser(*args, **kwargs)
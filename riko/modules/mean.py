@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# vim: sw=4:ts=4:expandtab
+"""
+riko.modules.mean
+~~~~~~~~~~~~~~~~~
+Provides functions for averaging the items in a stream.
+
+Examples:
+    basic usage::
+
+        >>> from decimal import Decimal
+        >>> from riko.modules.mean import pipe
+        >>>
+        >>> stream = pipe({'content': x} for x in range(5))
+        >>> next(stream) == {'mean': Decimal('2')}
+        True
+
+Attributes:
+    OPTS (dict): The default pipe options
+    DEFAULTS (dict): The default parser options
+"""
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals)
+
+import pygogo as gogo
+
+from builtins import *  # noqa # pylint: disable=unused-import
+
+from . import operator
+from .aggregate import make_parser
+
+OPTS = {}
+DEFAULTS = {'mean_key': 'content', 'group_key': None}
+logger = gogo.Gogo(__name__, monolog=True).logger
+parser = make_parser('mean')
+
+
+@operator(DEFAULTS, isasync=True, **OPTS)
+def async_pipe(*args, **kwargs):
+    """An aggregator that asynchronously and eagerly averages
+    fields of items in a stream. Note that this pipe is not lazy.
+
+    Args:
+        items (Iter[dict]): The source.
+        kwargs (dict): The keyword arguments passed to the wrapper
+
+    Kwargs:
+        conf (dict): The pipe configuration. See `pipe`.
+        assign (str): Attribute to assign parsed content (default: mean)
+
+    Returns:
+        Deferred: twisted.internet.defer.Deferred iterator of the mean
+
+    Examples:
+        >>> from decimal import Decimal
+        >>> from riko.bado import react
+        >>> from riko.bado.mock import FakeReactor
+        >>>
+        >>> def run(reactor):
+        ...     callback = lambda x: print(next(x) == {'mean': Decimal('2')})
+        ...     items = ({'content': x} for x in range(5))
+        ...     d = async_pipe(items)
+        ...     return d.addCallbacks(callback, logger.error)
+        >>>
+        >>> try:
+        ...     react(run, _reactor=FakeReactor())
+        ... except SystemExit:
+        ...     pass
+        ...
+        True
+    """
+    return parser(*args, **kwargs)
+
+
+@operator(DEFAULTS, **OPTS)
+def pipe(*args, **kwargs):
+    """An aggregator that eagerly averages fields of items in a
+    stream. Note that this pipe is not lazy. Use `riko.modules.aggregate` to
+    compute several aggregates in a single pass.
+
+    Args:
+        items (Iter[dict]): The source.
+        kwargs (dict): The keyword arguments passed to the wrapper
+
+    Kwargs:
+        conf (dict): The pipe configuration. May contain the keys 'mean_key' or
+            'group_key'.
+
+            mean_key (str): Item attribute to aggregate (default: 'content').
+
+            group_key (str): Item attribute to group by. This will group items
+                in the stream by the given key and report the average of each
+                group, in the order the groups were first seen (default:
+                None).
+
+        assign (str): Attribute to assign parsed content. If `group_key` is
+            set, this is ignored and the group keys are used instead.
+            (default: mean)
+
+    Yields:
+        dict: the mean
+
+    Examples:
+        >>> from decimal import Decimal
+        >>>
+        >>> stream = ({'content': x} for x in range(5))
+        >>> next(pipe(stream)) == {'mean': Decimal('2')}
+        True
+        >>> stream = [
+        ...     {'amount': 2, 'x': 'two'},
+        ...     {'amount': 1, 'x': 'one'},
+        ...     {'amount': 4, 'x': 'two'}]
+        >>> conf = {'mean_key': 'amount', 'group_key': 'x'}
+        >>> aggregated = pipe(stream, conf=conf)
+        >>> next(aggregated) == {'two': Decimal('3')}
+        True
+        >>> next(aggregated) == {'one': Decimal('1')}
+        True
+    """
+    return parser(*args, **kwargs)
@@ -23,7 +23,6 @@ Attributes:
 from __future__ import (
     absolute_import, division, print_function, unicode_literals)
 
-import re
 import pygogo as gogo
 
 from functools import reduce
@@ -31,6 +30,7 @@ from builtins import *  # noqa # pylint: disable=unused-import
 
 from . import processor
 from riko.bado import coroutine, return_value, itertools as ait
+from riko.utils import get_regex
 
 OPTS = {
     'listize': True, 'ftype': 'text', 'field': 'content', 'extract': 'rule'}
@@ -39,12 +39,12 @@ DEFAULTS = {}
 logger = gogo.Gogo(__name__, monolog=True).logger
 
 PARAMS = {
-    'first': lambda word, rule: re.split(rule.find, word, maxsplit=1),
-    'last': lambda word, rule: re.split(rule.find, word)}
+    'first': lambda word, rule: get_regex(rule.find).split(word, maxsplit=1),
+    'last': lambda word, rule: get_regex(rule.find).split(word)}
 
 AT_PARAMS = {
-    'first': lambda word, rule: re.search(rule.find, word),
-    'last': lambda word, rule: re.findall(rule.find, word)}
+    'first': lambda word, rule: get_regex(rule.find).search(word),
+    'last': lambda word, rule: get_regex(rule.find).findall(word)}
 
 OPS = {
     'before': lambda splits, rule: rule.find.join(splits[:len(splits) - 1]),
@@ -35,7 +35,8 @@ from functools import reduce
 from builtins import *  # noqa # pylint: disable=unused-import
 
 from . import processor
-from riko.utils import get_new_rule, substitute, multi_substitute, group_by
+from riko.utils import (
+    get_new_rule, substitute, multi_substitute, group_by, cached, get_rule_key)
 from riko.bado import coroutine, return_value, itertools as ait
 from riko.dotdict import DotDict
 from meza.process import merge
@@ -43,6 +44,53 @@ from meza.process import merge
 OPTS = {'listize': True, 'extract': 'rule', 'emit': True}
 DEFAULTS = {'convert': True, 'multi': False}
 logger = gogo.Gogo(__name__, monolog=True).logger
+_SUBSTITUTIONS_CACHE = {}
+
+
+def get_substitutions(rules, multi=False):
+    """Compiles and groups the rules by field (and flags if `multi`). The
+    result is cached by rule definition, so it is only computed once per
+    pipe invocation unless the rules are item dependent.
+
+    Args:
+        rules (List[obj]): the parsed rules (Objectify instances).
+        multi (bool): Group rules with the same flags so they can be
+            applied in a single pass by `multi_substitute`
+
+    Returns:
+        List[Tuple(str, list)]: The field and the rules (or groups of rules
+            if `multi`) to apply to it
+
+    Examples:
+        >>> rules = [
+        ...     {'field': 'a', 'match': 'x', 'replace': 'y'},
+        ...     {'field': 'b', 'match': 'y', 'replace': 'z'},
+        ...     {'field': 'a', 'match': 'z', 'replace': 'x'}]
+        >>> substitutions = get_substitutions(rules)
+        >>> [(field, len(rules)) for field, rules in substitutions] == [
+        ...     ('a', 2), ('b', 1)]
+        True
+        >>> get_substitutions(rules) is substitutions
+        True
+    """
+    key = (tuple(map(get_rule_key, rules)), multi)
+    return cached(_SUBSTITUTIONS_CACHE, key, _get_substitutions, rules, multi)
+
+
+def _get_substitutions(rules, multi=False):
+    new_rules = [get_new_rule(r, recompile=not multi) for r in rules]
+    substitutions = []
+
+    for _, field_rules in group_by(new_rules, 'field'):
+        if multi:
+            grouped = group_by(field_rules, 'flags')
+            group_rules = [g[1] for g in grouped]
+        else:
+            group_rules = field_rules
+
+        substitutions.append((field_rules[0]['field'], group_rules))
+
+    return substitutions
 
 
 @coroutine
@@ -87,15 +135,12 @@ def async_parser(item, rules, skip=False, **kwargs):
         worldwide
     """
     multi = kwargs['conf']['multi']
-    recompile = not multi
+    reducer = multi_substitute if multi else substitute
 
     @coroutine
-    def async_reducer(item, rules):
-        field = rules[0]['field']
+    def async_reducer(item, substitution):
+        field, group_rules = substitution
         word = item.get(field, **kwargs)
-        grouped = group_by(rules, 'flags')
-        group_rules = [g[1] for g in grouped] if multi else rules
-        reducer = multi_substitute if multi else substitute
         replacement = yield ait.coop_reduce(reducer, group_rules, word)
         combined = merge([item, {field: replacement}])
         return_value(DotDict(combined))
@@ -103,10 +148,8 @@ def async_parser(item, rules, skip=False, **kwargs):
     if skip:
         item = kwargs['stream']
     else:
-        new_rules = [get_new_rule(r, recompile=recompile) for r in rules]
-        grouped = group_by(new_rules, 'field')
-        field_rules = [g[1] for g in grouped]
-        item = yield ait.async_reduce(async_reducer, field_rules, item)
+        substitutions = get_substitutions(rules, multi)
+        item = yield ait.async_reduce(async_reducer, substitutions, item)
 
     return_value(item)
 
@@ -143,24 +186,19 @@ def parser(item, rules, skip=False, **kwargs):
         True
     """
     multi = kwargs['conf']['multi']
-    recompile = not multi
+    reducer = multi_substitute if multi else substitute
 
-    def meta_reducer(item, rules):
-        field = rules[0]['field']
+    def meta_reducer(item, substitution):
+        field, group_rules = substitution
         word = item.get(field, **kwargs)
-        grouped = group_by(rules, 'flags')
-        group_rules = [g[1] for g in grouped] if multi else rules
-        reducer = multi_substitute if multi else substitute
         replacement = reduce(reducer, group_rules, word)
         return DotDict(merge([item, {field: replacement}]))
 
     if skip:
         item = kwargs['stream']
     else:
-        new_rules = [get_new_rule(r, recompile=recompile) for r in rules]
-        grouped = group_by(new_rules, 'field')
-        field_rules = [g[1] for g in grouped]
-        item = reduce(meta_reducer, field_rules, item)
+        substitutions = get_substitutions(rules, multi)
+        item = reduce(meta_reducer, substitutions, item)
 
     return item
 
@@ -5,6 +5,11 @@ riko.modules.sort
 ~~~~~~~~~~~~~~~~~
 Provides functions for sorting a stream by an item field.
 
+Streams that don't fit in memory can be sorted by setting `max_items` or
+`max_memory`. Once the budget is exceeded, sorted runs of the stream are
+spilled to temporary files and then merged. If only the first (or last) few
+items are needed, set `limit` to keep just those items in a bounded heap.
+
 Examples:
     basic usage::
 
@@ -13,6 +18,10 @@ Examples:
         >>> items = [{'content': 'b'}, {'content': 'a'}, {'content': 'c'}]
         >>> next(pipe(items)) == {'content': 'a'}
         True
+        >>> next(pipe(items, conf={'max_items': 2})) == {'content': 'a'}
+        True
+        >>> list(pipe(items, conf={'limit': -1})) == [{'content': 'c'}]
+        True
 
 Attributes:
     OPTS (dict): The default pipe options
@@ -21,25 +30,236 @@ Attributes:
 from __future__ import (
     absolute_import, division, print_function, unicode_literals)
 
+import pickle
+import heapq
 import pygogo as gogo
 
-from functools import reduce
+from itertools import chain, islice
+from tempfile import TemporaryFile
+from sys import getsizeof
 
 from builtins import *  # noqa # pylint: disable=unused-import
 
 from . import operator
-from riko.bado import itertools as ait
+from riko.bado.util import maybeDeferred
 from riko.utils import def_itemgetter as itemgetter
 
 OPTS = {'listize': True, 'extract': 'rule'}
 DEFAULTS = {'rule': {'sort_dir': 'asc', 'sort_key': 'content'}}
 logger = gogo.Gogo(__name__, monolog=True).logger
 
+# number of items used to estimate the item size when `max_memory` is set
+SAMPLE_SIZE = 64
+
+# number of (key, index, item) records pickled together when spilling a run
+CHUNK_SIZE = 256
+
+
+class Descending(object):
+    """Wraps a sort key so that it sorts in reverse order
+
+    Examples:
+        >>> sorted([1, 3, 2], key=Descending)
+        [3, 2, 1]
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __getstate__(self):
+        return (self.value,)
+
+    def __setstate__(self, state):
+        self.value = state[0]
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+def get_keyfunc(rules):
+    """Combines sort rules into a single composite key function. Like
+    successive (stable) sorts, the last rule has the highest precedence.
+
+    Args:
+        rules (List[obj]): the sort rules (Objectify instances).
+
+    Returns:
+        func: A function that receives an item and returns its sort key
+
+    Examples:
+        >>> from meza.fntools import Objectify
+        >>>
+        >>> rules = [
+        ...     Objectify({'sort_key': 'b', 'sort_dir': 'desc'}),
+        ...     Objectify({'sort_key': 'a', 'sort_dir': 'asc'})]
+        >>> items = [{'a': 1, 'b': 1}, {'a': 2, 'b': 0}, {'a': 1, 'b': 2}]
+        >>> sorted(items, key=get_keyfunc(rules)) == [
+        ...     {'a': 1, 'b': 2}, {'a': 1, 'b': 1}, {'a': 2, 'b': 0}]
+        True
+    """
+    keyfuncs = []
+
+    for rule in reversed(rules):
+        getter = itemgetter(rule.sort_key, _type=rule.type)
+
+        if rule.sort_dir == 'desc':
+            getter = lambda item, getter=getter: Descending(getter(item))
+
+        keyfuncs.append(getter)
+
+    return lambda item: tuple(keyfunc(item) for keyfunc in keyfuncs)
+
+
+def getsize(obj):
+    """Estimates the memory used by an object (including its contents)
+
+    Examples:
+        >>> getsize({'content': 'a'}) > getsize({})
+        True
+    """
+    size = getsizeof(obj)
+
+    if hasattr(obj, 'items'):
+        size += sum(getsize(k) + getsize(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(getsize(v) for v in obj)
+
+    return size
+
+
+def spill(run):
+    """Writes a sorted run to a temporary file
+
+    Args:
+        run (List[tuple]): The sorted (key, index, item) records
+
+    Returns:
+        file: The temporary file positioned at its beginning
+    """
+    f = TemporaryFile()
+
+    for pos in range(0, len(run), CHUNK_SIZE):
+        pickle.dump(run[pos:pos + CHUNK_SIZE], f, pickle.HIGHEST_PROTOCOL)
+
+    f.seek(0)
+    return f
+
+
+def read_run(f):
+    """Reads back the records of a run written by `spill`"""
+    try:
+        while True:
+            for record in pickle.load(f):
+                yield record
+    except EOFError:
+        pass
+    finally:
+        f.close()
 
-def reducer(stream, rule):
-    reverse = rule.sort_dir == 'desc'
-    keyfunc = itemgetter(rule.sort_key, _type=rule.type)
-    return sorted(stream, key=keyfunc, reverse=reverse)
+
+def external_sort(stream, keyfunc, max_items):
+    """Sorts a stream holding at most `max_items` items in memory at a time.
+    If the stream is longer, it is split into sorted runs which are written
+    to temporary files and then lazily k-way merged. The sort is stable.
+
+    Args:
+        stream (Iter[dict]): The items to sort
+        keyfunc (func): Receives an item and returns its sort key
+        max_items (int): The maximum number of items to sort in memory
+
+    Returns:
+        Iter[dict]: The sorted items
+
+    Examples:
+        >>> stream = ({'x': x % 3, 'y': x} for x in range(10))
+        >>> keyfunc = lambda item: item['x']
+        >>> [i['y'] for i in external_sort(stream, keyfunc, 4)]
+        [0, 3, 6, 9, 1, 4, 7, 2, 5, 8]
+    """
+    # the index breaks ties so that items are never compared directly
+    records = ((keyfunc(item), i, item) for i, item in enumerate(stream))
+    run = sorted(islice(records, max_items))
+
+    if len(run) < max_items:
+        return (record[2] for record in run)
+
+    files = []
+
+    while run:
+        files.append(spill(run))
+        run = sorted(islice(records, max_items))
+
+    merged = heapq.merge(*map(read_run, files))
+    return (record[2] for record in merged)
+
+
+def top_k(stream, keyfunc, limit):
+    """Returns the first (or last) items of a sorted stream without sorting
+    the entire stream. Uses O(n log k) time and O(k) memory. The sort is
+    stable.
+
+    Args:
+        stream (Iter[dict]): The items to sort
+        keyfunc (func): Receives an item and returns its sort key
+        limit (int): The number of items to return. If negative, the last
+            `-limit` items are returned.
+
+    Returns:
+        Iter[dict]: The sorted items
+
+    Examples:
+        >>> stream = [{'x': x % 3, 'y': x} for x in range(10)]
+        >>> keyfunc = lambda item: item['x']
+        >>> [i['y'] for i in top_k(stream, keyfunc, 3)]
+        [0, 3, 6]
+        >>> [i['y'] for i in top_k(stream, keyfunc, -3)]
+        [2, 5, 8]
+    """
+    # the index breaks ties so that items are never compared directly
+    records = ((keyfunc(item), i, item) for i, item in enumerate(stream))
+
+    if limit > 0:
+        top = heapq.nsmallest(limit, records)
+    else:
+        top = reversed(heapq.nlargest(-limit, records))
+
+    return (record[2] for record in top)
+
+
+def get_max_items(stream, max_items=0, max_memory=0):
+    """Converts a memory budget into a maximum number of items by sampling
+    the stream
+
+    Args:
+        stream (Iter[dict]): The items to sort
+        max_items (int): The maximum number of items to hold in memory
+        max_memory (int): The (approximate) maximum number of bytes to hold
+            in memory
+
+    Returns:
+        Tuple(int, Iter[dict]): The maximum number of items (0 if unlimited)
+            and the stream
+
+    Examples:
+        >>> stream = ({'content': 'a'} for _ in range(10))
+        >>> max_items, stream = get_max_items(stream, max_memory=1024)
+        >>> 0 < max_items < 10
+        True
+        >>> len(list(stream))
+        10
+    """
+    if max_memory:
+        sample = list(islice(stream, SAMPLE_SIZE))
+        stream = chain(sample, stream)
+        item_size = sum(map(getsize, sample)) / (len(sample) or 1)
+        limit = max(int(max_memory // (item_size or 1)), 1)
+        max_items = min(max_items, limit) if max_items else limit
+
+    return max_items, stream
 
 
 def async_parser(stream, rules, tuples, **kwargs):
@@ -62,7 +282,7 @@ def async_parser(stream, rules, tuples, **kwargs):
         conf (dict): The pipe configuration.
 
     Returns:
-        List(dict): Deferred output stream
+        Deferred: twisted.internet.defer.Deferred output stream
 
     Examples:
         >>> from itertools import repeat
@@ -71,7 +291,7 @@ def async_parser(stream, rules, tuples, **kwargs):
         >>> from meza.fntools import Objectify
         >>>
         >>> def run(reactor):
-        ...     callback = lambda x: print(x[0] == {'content': 4})
+        ...     callback = lambda x: print(next(x) == {'content': 4})
         ...     kwargs = {'sort_key': 'content', 'sort_dir': 'desc'}
         ...     rule = Objectify(kwargs)
         ...     stream = ({'content': x} for x in range(5))
@@ -88,7 +308,7 @@ def async_parser(stream, rules, tuples, **kwargs):
         ...         pass
         True
     """
-    return ait.async_reduce(reducer, rules, stream)
+    return maybeDeferred(parser, stream, rules, tuples, **kwargs)
 
 
 def parser(stream, rules, tuples, **kwargs):
@@ -111,7 +331,7 @@ def parser(stream, rules, tuples, **kwargs):
         conf (dict): The pipe configuration.
 
     Returns:
-        List(dict): The output stream
+        Iter(dict): The output stream
 
     Examples:
         >>> from meza.fntools import Objectify
@@ -121,10 +341,38 @@ def parser(stream, rules, tuples, **kwargs):
         >>> rule = Objectify(kwargs)
         >>> stream = ({'content': x} for x in range(5))
         >>> tuples = zip(stream, repeat(rule))
-        >>> parser(stream, [rule], tuples, **kwargs)[0] == {'content': 4}
+        >>> next(parser(stream, [rule], tuples, **kwargs)) == {'content': 4}
         True
+        >>> stream = ({'content': x} for x in range(5))
+        >>> tuples = zip(stream, repeat(rule))
+        >>> kwargs['conf'] = {'max_items': 2}
+        >>> sorted_stream = parser(stream, [rule], tuples, **kwargs)
+        >>> [item['content'] for item in sorted_stream]
+        [4, 3, 2, 1, 0]
+        >>> stream = ({'content': x} for x in range(5))
+        >>> tuples = zip(stream, repeat(rule))
+        >>> kwargs['conf'] = {'limit': 2}
+        >>> sorted_stream = parser(stream, [rule], tuples, **kwargs)
+        >>> [item['content'] for item in sorted_stream]
+        [4, 3]
     """
-    return reduce(reducer, rules, stream)
+    conf = kwargs.get('conf') or {}
+    limit = int(conf.get('limit') or 0)
+    max_items = int(conf.get('max_items') or 0)
+    max_memory = int(conf.get('max_memory') or 0)
+    keyfunc = get_keyfunc(rules)
+
+    if limit:
+        sorted_stream = top_k(stream, keyfunc, limit)
+    else:
+        max_items, stream = get_max_items(stream, max_items, max_memory)
+
+        if max_items:
+            sorted_stream = external_sort(stream, keyfunc, max_items)
+        else:
+            sorted_stream = iter(sorted(stream, key=keyfunc))
+
+    return sorted_stream
 
 
 @operator(DEFAULTS, isasync=True, **OPTS)
@@ -137,7 +385,8 @@ def async_pipe(*args, **kwargs):
         kwargs (dict): The keyword arguments passed to the wrapper
 
     Kwargs:
-        conf (dict): The pipe configuration. May contain the key 'rule'
+        conf (dict): The pipe configuration. May contain the keys 'rule',
+            'limit', 'max_items', or 'max_memory'.
 
             rule (dict): The sort configuration, can be either a dict or list
                 of dicts (default: {'sort_dir': 'asc', 'sort_key': 'content'}).
@@ -153,6 +402,20 @@ def async_pipe(*args, **kwargs):
                 sort_dir (str): The sort direction. Must be either 'asc' or
                     'desc' (default: 'asc').
 
+            limit (int): The number of items to return. If negative, the
+                last `-limit` items are returned. Only these items are held
+                in memory, so `max_items` and `max_memory` are ignored
+                (default: 0, i.e., return all items).
+
+            max_items (int): The maximum number of items to sort in memory.
+                Longer streams are sorted in runs that are spilled to
+                temporary files and then merged (default: 0, i.e., no limit).
+
+            max_memory (int): The approximate number of bytes to use when
+                sorting in memory. The corresponding number of items is
+                estimated from the first items of the stream (default: 0,
+                i.e., no limit).
+
     Returns:
         Deferred: twisted.internet.defer.Deferred stream
 
@@ -186,7 +449,8 @@ def pipe(*args, **kwargs):
         kwargs (dict): The keyword arguments passed to the wrapper
 
     Kwargs:
-        conf (dict): The pipe configuration. May contain the key 'rule'
+        conf (dict): The pipe configuration. May contain the keys 'rule',
+            'limit', 'max_items', or 'max_memory'.
 
             rule (dict): The sort configuration, can be either a dict or list
                 of dicts (default: {'sort_dir': 'asc', 'sort_key': 'content'}).
@@ -199,6 +463,20 @@ def pipe(*args, **kwargs):
                 sort_dir (str): The sort direction. Must be either 'asc' or
                     'desc'.
 
+            limit (int): The number of items to return. If negative, the
+                last `-limit` items are returned. Only these items are held
+                in memory, so `max_items` and `max_memory` are ignored
+                (default: 0, i.e., return all items).
+
+            max_items (int): The maximum number of items to sort in memory.
+                Longer streams are sorted in runs that are spilled to
+                temporary files and then merged (default: 0, i.e., no limit).
+
+            max_memory (int): The approximate number of bytes to use when
+                sorting in memory. The corresponding number of items is
+                estimated from the first items of the stream (default: 0,
+                i.e., no limit).
+
     Yields:
         dict: an item
 
@@ -216,5 +494,9 @@ def pipe(*args, **kwargs):
         >>> rule = {'sort_key': 'name', 'sort_dir': 'desc'}
         >>> next(pipe(items, conf={'rule': rule}))['name'] == 'sue'
         True
+        >>> conf = {'rule': rule, 'max_items': 1}
+        >>> [item['name'] for item in pipe(items, conf=conf)] == [
+        ...     'sue', 'bill', 'adam']
+        True
     """
     return parser(*args, **kwargs)
@@ -9,6 +9,10 @@ Use split when you want to perform different operations on data from the same
 stream. The Union module is the reverse of Split, it merges multiple input
 streams into a single combined stream.
 
+The copies are lazy. Items are buffered only until every copy has read them,
+so memory use depends on how far apart the copies are consumed rather than on
+the number of copies.
+
 Examples:
     basic usage::
 
@@ -25,8 +29,8 @@ Attributes:
 from __future__ import (
     absolute_import, division, print_function, unicode_literals)
 
-
-from copy import deepcopy
+from copy import copy, deepcopy
+from itertools import tee
 
 from builtins import *  # noqa # pylint: disable=unused-import
 
@@ -35,6 +39,7 @@ import pygogo as gogo
 
 OPTS = {'extract': 'splits', 'ptype': 'int', 'objectify': False}
 DEFAULTS = {'splits': 2}
+COPIERS = {'deep': deepcopy, 'shallow': copy, 'none': None}
 logger = gogo.Gogo(__name__, monolog=True).logger
 
 
@@ -67,28 +72,42 @@ def parser(stream, splits, tuples, **kwargs):
         >>> streams = parser(stream, conf['splits'], tuples, **kwargs)
         >>> next(next(streams)) == {'x': 0}
         True
+        >>> stream = [{'x': {'y': 1}}]
+        >>> kwargs = {'conf': {'copy': 'none'}}
+        >>> stream1, stream2 = parser(stream, 2, None, **kwargs)
+        >>> next(stream1) is next(stream2)
+        True
     """
-    source = list(stream)
+    conf = kwargs.get('conf') or {}
+    copier = COPIERS[conf.get('copy') or 'shallow']
 
-    # deepcopy each item so that each split is independent
-    for num in range(splits):
-        yield map(deepcopy, source)
+    # Each split reads from a shared buffer and copies the items it reads,
+    # so no split holds more than the items it is currently using
+    for split in tee(stream, splits):
+        yield map(copier, split) if copier else split
 
 
 @operator(DEFAULTS, isasync=True, **OPTS)
 def async_pipe(*args, **kwargs):
-    """An operator that asynchronously and eagerly splits a stream into identical
-    copies. Note that this pipe is not lazy.
+    """An operator that asynchronously splits a stream into identical copies.
 
     Args:
         items (Iter[dict]): The source stream.
         kwargs (dict): The keyword arguments passed to the wrapper
 
     Kwargs:
-        conf (dict): The pipe configuration. May contain the key 'splits'.
+        conf (dict): The pipe configuration. May contain the keys 'splits'
+            or 'copy'.
 
             splits (int): the number of copies to create (default: 2).
 
+            copy (str): How to copy the items of each split. Must be one of
+                'shallow', 'deep', or 'none'. A 'shallow' copy shares nested
+                values between splits, and 'none' shares the items
+                themselves. This is safe since riko pipes don't modify their
+                input items, but use 'deep' if another consumer may
+                (default: 'shallow').
+
     Returns:
         Deferred: twisted.internet.defer.Deferred iterable of streams
 
@@ -113,18 +132,25 @@ def async_pipe(*args, **kwargs):
 
 @operator(DEFAULTS, **OPTS)
 def pipe(*args, **kwargs):
-    """An operator that eagerly splits a stream into identical copies.
-    Note that this pipe is not lazy.
+    """An operator that splits a stream into identical copies.
 
     Args:
         items (Iter[dict]): The source stream.
         kwargs (dict): The keyword arguments passed to the wrapper
 
     Kwargs:
-        conf (dict): The pipe configuration. May contain the key 'splits'.
+        conf (dict): The pipe configuration. May contain the keys 'splits'
+            or 'copy'.
 
             splits (int): the number of copies to create (default: 2).
 
+            copy (str): How to copy the items of each split. Must be one of
+                'shallow', 'deep', or 'none'. A 'shallow' copy shares nested
+                values between splits, and 'none' shares the items
+                themselves. This is safe since riko pipes don't modify their
+                input items, but use 'deep' if another consumer may
+                (default: 'shallow').
+
     Yields:
         Iter(dict): a stream of items
 
@@ -135,5 +161,10 @@ def pipe(*args, **kwargs):
         True
         >>> len(list(pipe(items, conf={'splits': '3'})))
         3
+        >>> stream1, stream2 = pipe(items)
+        >>> item = next(stream1)
+        >>> item['x'] = 10
+        >>> next(stream2) == {'x': 0}
+        True
     """
     return parser(*args, **kwargs)
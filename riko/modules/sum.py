@@ -21,14 +21,13 @@ Attributes:
 from __future__ import (
     absolute_import, division, print_function, unicode_literals)
 
-import itertools as it
 import pygogo as gogo
 
-from operator import itemgetter
 from decimal import Decimal
 from builtins import *  # noqa # pylint: disable=unused-import
 
 from . import operator
+from riko.utils import aggregate
 
 OPTS = {}
 DEFAULTS = {'sum_key': 'content', 'group_key': None}
@@ -79,15 +78,16 @@ def parser(stream, objconf, tuples, **kwargs):
         >>> next(summed) == {'two': Decimal('2')}
         True
     """
-    _sum = lambda group: sum(Decimal(g[objconf.sum_key]) for g in group)
+    group_key, sum_key = objconf.group_key, objconf.sum_key
+    keyfunc = (lambda item: item.get(group_key)) if group_key else None
+    valuefunc = lambda item: item.get(sum_key)
+    aggregated = aggregate(stream, ['sum'], keyfunc, valuefunc)
 
-    if objconf.group_key:
-        keyfunc = itemgetter(objconf.group_key)
-        sorted_stream = sorted(stream, key=keyfunc)
-        grouped = it.groupby(sorted_stream, keyfunc)
-        summed = ({key: _sum(group)} for key, group in grouped)
+    if group_key:
+        summed = ({k: v['sum']} for k, v in aggregated.items())
     else:
-        summed = {kwargs['assign']: _sum(stream)}
+        totals = aggregated.get(None, {'sum': Decimal(0)})
+        summed = {kwargs['assign']: totals['sum']}
 
     return summed
 
@@ -95,7 +95,7 @@ def parser(stream, objconf, tuples, **kwargs):
 @operator(DEFAULTS, isasync=True, **OPTS)
 def async_pipe(*args, **kwargs):
     """An aggregator that asynchronously and eagerly sums fields of items
-    in a stream. Note that this pipe is not lazy if `group_key` is specified.
+    in a stream. Note that this pipe is not lazy.
 
     Args:
         items (Iter[dict]): The source.
@@ -109,7 +109,8 @@ def async_pipe(*args, **kwargs):
 
             group_key (str): Item attribute to sum by. This will group items
                 in the stream by the given key and report a sum for each
-                group (default: None).
+                group, in the order the groups were first seen (default:
+                None).
 
         assign (str): Attribute to assign parsed content. If `sum_key` is set,
             this is ignored and the group keys are used instead. (default:
@@ -141,7 +142,7 @@ def async_pipe(*args, **kwargs):
 @operator(DEFAULTS, **OPTS)
 def pipe(*args, **kwargs):
     """An aggregator that eagerly sums fields of items in a stream.
-    Note that this pipe is not lazy if `group_key` is specified.
+    Note that this pipe is not lazy.
 
     Args:
         items (Iter[dict]): The source.
@@ -155,7 +156,8 @@ def pipe(*args, **kwargs):
 
             group_key (str): Item attribute to sum by. This will group items
                 in the stream by the given key and report a sum for each
-                group (default: None).
+                group, in the order the groups were first seen (default:
+                None).
 
         assign (str): Attribute to assign parsed content. If `sum_key` is set,
             this is ignored and the group keys are used instead. (default:
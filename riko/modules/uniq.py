@@ -28,12 +28,15 @@ from __future__ import (
 
 import pygogo as gogo
 
-from collections import deque
+from collections import OrderedDict
 from builtins import *  # noqa # pylint: disable=unused-import
 from . import operator
+from riko.utils import BloomFilter, make_hashable
 
 OPTS = {}
-DEFAULTS = {'uniq_key': 'content', 'limit': 1024}
+DEFAULTS = {
+    'uniq_key': 'content', 'limit': 1024, 'mode': 'exact',
+    'error_rate': 0.001}
 logger = gogo.Gogo(__name__, monolog=True).logger
 
 
@@ -69,16 +72,43 @@ def parser(stream, objconf, tuples, **kwargs):
         >>> list(parser(stream, objconf, tuples, **kwargs)) == [
         ...     {'x': 0, 'mod': 0}, {'x': 1, 'mod': 1}]
         True
+        >>> # the oldest values are forgotten once `limit` is reached
+        >>> objconf = Objectify({'uniq_key': 'x', 'limit': 2})
+        >>> stream = ({'x': x} for x in [0, 1, 2, 0, 2])
+        >>> tuples = zip(stream, repeat(objconf))
+        >>> [i['x'] for i in parser(stream, objconf, tuples, **kwargs)]
+        [0, 1, 2, 0]
+        >>> conf = {'uniq_key': 'mod', 'limit': 256, 'mode': 'bloom'}
+        >>> objconf = Objectify(conf, error_rate=0.001)
+        >>> stream = ({'x': x, 'mod': x % 2} for x in range(5))
+        >>> tuples = zip(stream, repeat(objconf))
+        >>> list(parser(stream, objconf, tuples, **kwargs)) == [
+        ...     {'x': 0, 'mod': 0}, {'x': 1, 'mod': 1}]
+        True
     """
     key, limit = objconf.uniq_key, int(objconf.limit)
-    seen = deque(maxlen=limit)
+
+    if objconf.mode == 'bloom':
+        # fixed memory, but may drop an item it has never seen before
+        seen = BloomFilter(limit, float(objconf.error_rate))
+    else:
+        # remembers the `limit` most recently added values
+        seen = OrderedDict()
 
     for item in stream:
-        value = item.get(key)
+        value = make_hashable(item.get(key))
+
+        if value in seen:
+            continue
+        elif objconf.mode == 'bloom':
+            seen.add(value)
+        else:
+            seen[value] = None
+
+            if len(seen) > limit:
+                seen.popitem(last=False)
 
-        if value not in seen:
-            seen.append(value)
-            yield item
+        yield item
 
 
 @operator(DEFAULTS, isasync=True, **OPTS)
@@ -91,13 +121,23 @@ def async_pipe(*args, **kwargs):
         kwargs (dict): The keyword arguments passed to the wrapper
 
     Kwargs:
-        conf (dict): The pipe configuration. May contain the keys 'uniq_key' or
-            'limit'.
+        conf (dict): The pipe configuration. May contain the keys 'uniq_key',
+            'limit', 'mode', or 'error_rate'.
 
             uniq_key (str): Item attribute which should be unique (default:
                 'content').
-            limit (int): Maximum number of unique items to track (default:
-                1024)
+            limit (int): Maximum number of unique items to track. In 'bloom'
+                mode, the number of unique items the filter is sized for
+                (default: 1024)
+
+            mode (str): Either 'exact' or 'bloom'. 'exact' tracks the `limit`
+                most recent unique values. 'bloom' uses a fixed memory Bloom
+                filter which is suitable for unbounded streams, but may
+                (wrongly) drop a small fraction of unique items (default:
+                'exact').
+
+            error_rate (float): The Bloom filter's false positive rate once it
+                holds `limit` items (default: 0.001)
 
     Returns:
         Deferred: twisted.internet.defer.Deferred stream
@@ -132,13 +172,23 @@ def pipe(*args, **kwargs):
         kwargs (dict): The keyword arguments passed to the wrapper
 
     Kwargs:
-        conf (dict): The pipe configuration. May contain the keys 'uniq_key' or
-            'limit'.
+        conf (dict): The pipe configuration. May contain the keys 'uniq_key',
+            'limit', 'mode', or 'error_rate'.
 
             uniq_key (str): Item attribute which should be unique (default:
                 'content').
-            limit (int): Maximum number of unique items to track (default:
-                1024)
+            limit (int): Maximum number of unique items to track. In 'bloom'
+                mode, the number of unique items the filter is sized for
+                (default: 1024)
+
+            mode (str): Either 'exact' or 'bloom'. 'exact' tracks the `limit`
+                most recent unique values. 'bloom' uses a fixed memory Bloom
+                filter which is suitable for unbounded streams, but may
+                (wrongly) drop a small fraction of unique items (default:
+                'exact').
+
+            error_rate (float): The Bloom filter's false positive rate once it
+                holds `limit` items (default: 0.001)
 
     Yields:
         dict: an item
@@ -52,7 +52,8 @@ from builtins import *  # noqa # pylint: disable=unused-import
 
 from . import processor
 from riko.utils import fetch, get_abspath
-from riko.parsers import xml2etree, etree2dict, xpath
+from riko.parsers import (
+    xml2etree, etree2dict, xpath, get_tags, iterxml, XMLConsumer)
 from riko.bado import coroutine, return_value, util, io
 from meza.compat import encode
 
@@ -65,6 +66,14 @@ logger = gogo.Gogo(__name__, monolog=True).logger
 # TODO: clean html with Tidy
 
 
+def gen_elements(f, tags):
+    """Incrementally parses an XML file, closing it once all elements have
+    been read"""
+    with f:
+        for element in iterxml(f, tags):
+            yield element
+
+
 @coroutine
 def async_parser(_, objconf, skip=False, **kwargs):
     """ Asynchronously parses the pipe content
@@ -124,17 +133,25 @@ def async_parser(_, objconf, skip=False, **kwargs):
         url = get_abspath(objconf.url)
         ext = splitext(url)[1].lstrip('.')
         xml = (ext == 'xml') or objconf.strict
+        tags = objconf.iterparse and xml and get_tags(objconf.xpath or '')
 
         try:
-            f = yield io.async_url_open(url)
-            tree = yield util.xml2etree(f, xml=xml)
+            if tags:
+                # parse the items while the response is still arriving
+                parsed = yield io.async_url_parse(url, XMLConsumer(tags))
+                items = iter(parsed)
+            else:
+                f = yield io.async_url_open(url)
+                tree = yield util.xml2etree(f, xml=xml)
         except Exception as e:
             logger.error(e)
             logger.error(traceback.format_exc())
 
-        elements = xpath(tree, objconf.xpath)
-        f.close()
-        items = map(util.etree2dict, elements)
+        if not tags:
+            elements = xpath(tree, objconf.xpath)
+            f.close()
+            items = map(util.etree2dict, elements)
+
         stringified = ({kwargs['assign']: encode(i)} for i in items)
         stream = stringified if objconf.stringify else items
 
@@ -162,6 +179,10 @@ def parser(_, objconf, skip=False, **kwargs):
         >>> title = 'Running “Native” Data Wrangling Applications'
         >>> next(result)['title'][:44] == title
         True
+        >>> objconf.iterparse = True
+        >>> result = parser(None, objconf, stream={})
+        >>> next(result)['title'][:44] == title
+        True
     """
     if skip:
         stream = kwargs['stream']
@@ -169,10 +190,14 @@ def parser(_, objconf, skip=False, **kwargs):
         url = get_abspath(objconf.url)
         ext = splitext(url)[1].lstrip('.')
         xml = (ext == 'xml') or objconf.strict
+        tags = objconf.iterparse and xml and get_tags(objconf.xpath or '')
 
-        with fetch(**objconf) as f:
-            root = xml2etree(f, xml=xml, html5=objconf.html5).getroot()
-            elements = xpath(root, objconf.xpath)
+        if tags:
+            elements = gen_elements(fetch(**objconf), tags)
+        else:
+            with fetch(**objconf) as f:
+                root = xml2etree(f, xml=xml, html5=objconf.html5).getroot()
+                elements = xpath(root, objconf.xpath)
 
         items = map(etree2dict, elements)
         stringified = ({kwargs['assign']: str(i)} for i in items)
@@ -192,7 +217,8 @@ def async_pipe(*args, **kwargs):
 
     Kwargs:
         conf (dict): The pipe configuration. Must contain the key 'url'. May
-            contain the keys 'xpath', 'html5', or 'stringify'.
+            contain the keys 'xpath', 'strict', 'html5', 'iterparse', or
+            'stringify'.
 
             url (str): The web site to fetch
             xpath (str): The XPATH to extract (default: None, i.e., return
@@ -200,6 +226,9 @@ def async_pipe(*args, **kwargs):
 
             strict (bool): Use the strict XML parser (default: False)
             html5 (bool): Use the HTML5 parser (default: False)
+            iterparse (bool): Incrementally parse XML, yielding each element
+                as soon as it's parsed. Only simple xpaths, e.g.,
+                '/rss/channel/item', are supported (default: False)
             stringify (bool): Return the web site as a string (default: False)
 
         assign (str): Attribute to assign parsed content (default: content)
@@ -251,7 +280,8 @@ def pipe(*args, **kwargs):
 
     Kwargs:
         conf (dict): The pipe configuration. Must contain the key 'url'. May
-            contain the keys 'xpath', 'html5', or 'stringify'.
+            contain the keys 'xpath', 'strict', 'html5', 'iterparse', or
+            'stringify'.
 
             url (str): The web site to fetch
             xpath (str): The XPATH to extract (default: None, i.e., return
@@ -259,6 +289,9 @@ def pipe(*args, **kwargs):
 
             strict (bool): Use the strict XML parser (default: False)
             html5 (bool): Use the HTML5 parser (default: False)
+            iterparse (bool): Incrementally parse XML, yielding each element
+                as soon as it's parsed. Only simple xpaths, e.g.,
+                '/rss/channel/item', are supported (default: False)
             stringify (bool): Return the web site as a string (default: False)
 
         assign (str): Attribute to assign parsed content (default: content)
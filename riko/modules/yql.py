@@ -47,20 +47,35 @@ from __future__ import (
 
 import pygogo as gogo
 
+from io import BytesIO
+
 from builtins import *  # noqa # pylint: disable=unused-import
 
 from . import processor
-from riko.parsers import xml2etree, etree2dict
+from riko.parsers import xml2etree, etree2dict, iterxml
 from riko.utils import fetch
 from riko.bado import coroutine, return_value, util, requests as treq
 
 OPTS = {'ftype': 'none'}
 
 # we use the default format of xml since json looses some structure
-DEFAULTS = {'url': 'http://query.yahooapis.com/v1/public/yql', 'debug': False}
+DEFAULTS = {
+    'url': 'http://query.yahooapis.com/v1/public/yql', 'debug': False,
+    'iterparse': False}
+
+# the path to each result
+RESULT_TAGS = ['*', 'results', '*']
 logger = gogo.Gogo(__name__, monolog=True).logger
 
 
+def gen_results(f):
+    """Incrementally parses the query results, closing the response once
+    all results have been read"""
+    with f:
+        for element in iterxml(f, RESULT_TAGS):
+            yield element
+
+
 @coroutine
 def async_parser(_, objconf, skip=False, **kwargs):
     """ Asynchronously parses the pipe content
@@ -119,9 +134,13 @@ def async_parser(_, objconf, skip=False, **kwargs):
             r = yield treq.get(objconf.url, params=params)
             f = yield treq.content(r)
 
-        tree = yield util.xml2etree(f)
-        results = next(tree.getElementsByTagName('results'))
-        stream = map(util.etree2dict, results.childNodes)
+        if objconf.iterparse:
+            f = BytesIO(f) if hasattr(f, 'decode') else f
+            stream = map(etree2dict, gen_results(f))
+        else:
+            tree = yield util.xml2etree(f)
+            results = next(tree.getElementsByTagName('results'))
+            stream = map(util.etree2dict, results.childNodes)
 
     return_value(stream)
 
@@ -160,6 +179,24 @@ def parser(_, objconf, skip=False, **kwargs):
         >>>
         >>> next(result)['title']
         'Bring pizza home'
+        >>> objconf.iterparse = True
+        >>>
+        >>> with fetch(url) as f:
+        ...     kwargs = {'stream': {}, 'response': f}
+        ...     result = parser(None, objconf, **kwargs)
+        ...     next(result)['title']
+        'Bring pizza home'
+        >>> # the response is closed once all results have been read
+        >>> with fetch(url) as r:
+        ...     f = BytesIO(r.read())
+        >>>
+        >>> result = parser(None, objconf, stream={}, response=f)
+        >>> f.closed
+        False
+        >>> len(list(result)) > 1
+        True
+        >>> f.closed
+        True
     """
     if skip:
         stream = kwargs['stream']
@@ -174,10 +211,12 @@ def parser(_, objconf, skip=False, **kwargs):
 
             f = fetch(params=params, **objconf)
 
-        # TODO: consider paging for large result sets
-        root = xml2etree(f).getroot()
-        results = root.find('results')
-        stream = map(etree2dict, results)
+        if objconf.iterparse:
+            stream = map(etree2dict, gen_results(f))
+        else:
+            root = xml2etree(f).getroot()
+            results = root.find('results')
+            stream = map(etree2dict, results)
 
     return stream
 
@@ -193,13 +232,15 @@ def async_pipe(*args, **kwargs):
 
     Kwargs:
         conf (dict): The pipe configuration. Must contain the key 'query'. May
-            contain the keys 'url' or 'debug'.
+            contain the keys 'url', 'debug', or 'iterparse'.
 
             url (str): The API to query (default:
                 'http://query.yahooapis.com/v1/public/yql')
 
             query (str): The API query
             debug (bool): Enable diagnostics mode (default: False)
+            iterparse (bool): Incrementally parse the response, yielding
+                each result as soon as it's parsed (default: False)
 
         assign (str): Attribute to assign parsed content (default: content)
         response (str): The API query response (used for offline testing)
@@ -246,13 +287,15 @@ def pipe(*args, **kwargs):
 
     Kwargs:
         conf (dict): The pipe configuration. Must contain the key 'query'. May
-            contain the keys 'url' or 'debug'.
+            contain the keys 'url', 'debug', or 'iterparse'.
 
             url (str): The API to query (default:
                 'http://query.yahooapis.com/v1/public/yql')
 
             query (str): The API query
             debug (bool): Enable diagnostics mode (default: False)
+            iterparse (bool): Incrementally parse the response, yielding
+                each result as soon as it's parsed (default: False)
 
         assign (str): Attribute to assign parsed content (default: content)
         response (str): The API query response (used for offline testing)
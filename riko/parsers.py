@@ -9,10 +9,18 @@ from __future__ import (
     absolute_import, division, print_function, unicode_literals)
 
 import re
-
-from io import StringIO
+import csv
+
+from codecs import getincrementaldecoder
+from copy import copy
+from functools import partial
+from itertools import chain, repeat
+from importlib import import_module
+from io import BytesIO, StringIO
 from html.entities import name2codepoint
 from html.parser import HTMLParser
+from calendar import timegm
+from time import gmtime
 
 try:
     from urllib.error import URLError
@@ -22,11 +30,18 @@ except ImportError:
 import pygogo as gogo
 
 from builtins import *  # noqa # pylint: disable=unused-import
+from riko import ENCODING
 from riko.utils import fetch
-from meza.fntools import Objectify, remove_keys, listize
+from meza.fntools import Objectify, remove_keys, listize, dedupe, underscorify
 from meza.process import merge
-from meza.compat import decode
-from ijson import items
+from meza.compat import decode, encode
+from riko.cast import parse_date
+from ijson.common import ObjectBuilder
+
+try:
+    from ijson.utils import sendable_list
+except ImportError:
+    sendable_list = None
 
 logger = gogo.Gogo(__name__, verbose=False, monolog=True).logger
 
@@ -60,11 +75,92 @@ else:
 
 rssparser = speedparser or feedparser
 
+# ijson backends, fastest first
+JSON_BACKENDS = ['yajl2_c', 'yajl2_cffi', 'yajl2', 'python']
+
+
+def get_json_backend(backends=None):
+    """Imports the fastest available ijson backend
+
+    Args:
+        backends (List[str]): The backend names to try in order of preference
+            (default: JSON_BACKENDS)
+
+    Returns:
+        Tuple(str, module): The backend name and module
+
+    Examples:
+        >>> name, backend = get_json_backend(['nonexistent', 'python'])
+        >>> name
+        'python'
+        >>> backend.__name__
+        'ijson.backends.python'
+    """
+    for name in backends or JSON_BACKENDS:
+        try:
+            backend = import_module('ijson.backends.%s' % name)
+        except ImportError:
+            continue
+        else:
+            return name, backend
+
+    raise ImportError('No ijson backends available')
+
+
+JSON_BACKEND, ijson = get_json_backend()
+logger.debug('json parser: ijson %s', JSON_BACKEND)
+
 
 NAMESPACES = {
     'owl': 'http://www.w3.org/2002/07/owl#',
     'xhtml': 'http://www.w3.org/1999/xhtml'}
 
+DC_NS = 'http://purl.org/dc/elements/1.1/'
+XHTML_NS = 'http://www.w3.org/1999/xhtml'
+
+# The tags of feed entries (RSS items and Atom entries)
+ENTRY_TAGS = {'item', 'entry'}
+
+# The namespaces of RSS (0.9x, 1.0, and 2.0) and Atom (0.3 and 1.0) elements
+FEED_NAMESPACES = [
+    '', 'http://purl.org/rss/1.0/', 'http://backend.userland.com/rss2',
+    'http://purl.org/atom/ns#', 'http://www.w3.org/2005/Atom']
+
+# Entry child tags and the key they are stored under
+FEED_KEYS = {
+    'title': 'title',
+    'guid': 'id',
+    'id': 'id',
+    'description': 'summary',
+    'summary': 'summary',
+    'content': 'content',
+    'pubDate': 'published',
+    'published': 'published',
+    'issued': 'published',
+    'updated': 'updated',
+    'modified': 'updated',
+    'author': 'author',
+    'link': 'link',
+    'category': 'tags',
+}
+
+ENTRY_KEYS = {
+    (ns, tag): key for ns in FEED_NAMESPACES for tag, key in FEED_KEYS.items()}
+ENTRY_KEYS.update({
+    (DC_NS, 'date'): 'updated',
+    (DC_NS, 'creator'): 'author',
+    (DC_NS, 'subject'): 'tags',
+    ('http://www.itunes.com/dtds/podcast-1.0.dtd', 'author'): 'author',
+    ('http://purl.org/rss/1.0/modules/content/', 'encoded'): 'content'})
+
+# The (US) time zones defined by RFC-822
+RFC822_ZONES = {
+    'EST': '-0500', 'EDT': '-0400', 'CST': '-0600', 'CDT': '-0500',
+    'MST': '-0700', 'MDT': '-0600', 'PST': '-0800', 'PDT': '-0700'}
+
+AUTHOR_EMAIL = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+SIMPLE_TAG = re.compile(r'^[\w.:*-]+$')
+
 ESCAPE = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&apos;'}
 
 SKIP_SWITCH = {
@@ -97,22 +193,303 @@ def get_text(html, convert_charrefs=False):
     return parser.data.getvalue()
 
 
-def parse_rss(url=None, **kwargs):
+def gen_rss_entries(url=None, **kwargs):
+    try:
+        f = fetch(decode(url), **kwargs)
+    except (ValueError, URLError):
+        f = BytesIO(url if hasattr(url, 'decode') else encode(url))
+        entries = gen_feed_entries(f)
+    else:
+        entries = f.get_items('rss:lxml')
+
+        if entries is None:
+            entries = f.tee_items(gen_feed_entries(f), 'rss:lxml')
+
+    with f:
+        for entry in entries:
+            yield entry
+
+
+def parse_rss(url=None, parser=None, **kwargs):
+    """Parses an RSS/Atom feed
+
+    Args:
+        url (str): The feed url or content
+        parser (str): The feed parser to use. Either 'lxml' (which streams
+            the entries) or 'auto', i.e., speedparser if it's installed and
+            feedparser otherwise (default: 'auto').
+
+        kwargs (dict): Keyword arguments passed to `fetch`, e.g.,
+            `revalidate` to reuse the entries of an unmodified feed (see
+            `riko.httpcache`)
+
+    Returns:
+        dict: The parsed feed. At least contains the key 'entries'.
+
+    Examples:
+        >>> from riko import get_path
+        >>>
+        >>> parsed = parse_rss(get_path('feed.xml'), parser='lxml')
+        >>> next(parsed['entries'])['title'] == 'Donations'
+        True
+    """
+    if parser == 'lxml':
+        return {'entries': gen_rss_entries(url, **kwargs)}
+
     try:
         f = fetch(decode(url), **kwargs)
     except (ValueError, URLError):
         parsed = rssparser.parse(url)
     else:
-        content = f.read() if speedparser else f
+        entries = f.get_items('rss:auto')
 
-        try:
-            parsed = rssparser.parse(content)
-        finally:
+        if entries is None:
+            content = f.read() if speedparser else f
+
+            try:
+                parsed = rssparser.parse(content)
+            finally:
+                f.close()
+
+            if not parsed.get('bozo_exception'):
+                f.set_items(parsed['entries'], 'rss:auto')
+        else:
             f.close()
+            parsed = {'entries': entries}
 
     return parsed
 
 
+def _split_tag(tag):
+    if not hasattr(tag, 'partition'):
+        # comments and processing instructions
+        return '', ''
+
+    ns, _, name = tag[1:].partition('}') if tag[:1] == '{' else ('', 0, tag)
+    return ns, name
+
+
+def _get_markup(element):
+    """Returns the (serialized) contents of an xhtml element"""
+    children = list(element)
+    wrapped = len(children) == 1 and _split_tag(children[0].tag)[1] == 'div'
+    parent = children[0] if wrapped else element
+    content = ''.join(etree.tostring(e, encoding='unicode') for e in parent)
+    return re.sub(r' xmlns(:\w+)?="[^"]*"', '', (parent.text or '') + content)
+
+
+def _get_date(date_str):
+    """Parses a date as a (UTC) struct_time, or None if it can't be parsed
+    """
+    zone = date_str.rsplit(' ', 1)[-1]
+
+    if zone in RFC822_ZONES:
+        date_str = '%s%s' % (date_str[:-len(zone)], RFC822_ZONES[zone])
+
+    try:
+        date = parse_date(date_str)
+    except (ValueError, OverflowError, TypeError, AttributeError):
+        tt = None
+    else:
+        tt = gmtime(timegm(date.utctimetuple()))
+
+    return tt
+
+
+def _get_author_detail(author, atom=False):
+    """Parses an RSS author, e.g., 'jo@example.com (Jo Doe)', or an Atom
+    author element"""
+    if atom:
+        detail = {}
+
+        for child in author:
+            key = _split_tag(child.tag)[1]
+            key = 'href' if key == 'uri' else key
+            detail[key] = (child.text or '').strip()
+
+        name, email = detail.get('name'), detail.get('email')
+        text = '%s (%s)' % (name, email) if name and email else name or email
+    else:
+        text = author
+        match = AUTHOR_EMAIL.search(author)
+        email = match.group(0) if match else None
+        name = AUTHOR_EMAIL.sub('', author) if email else author
+        name = name.strip().strip('()<>').strip()
+        detail = {'name': name} if name else {}
+        detail.update({'email': email} if email else {})
+
+    return text, detail
+
+
+def _get_link(element, entry):
+    href = element.get('href') or (element.text or '').strip()
+    rel = element.get('rel', 'alternate')
+
+    if href:
+        link = {'rel': rel, 'type': element.get('type', 'text/html')}
+        link['href'] = href
+        entry.setdefault('links', []).append(link)
+
+        if rel == 'alternate':
+            entry.setdefault('link', href)
+
+
+def _get_text(element):
+    if element.get('type', '') == 'xhtml':
+        text = _get_markup(element)
+    else:
+        text = (element.text or '').strip()
+
+    return text
+
+
+def _add_content(entry, key, element, text):
+    xhtml = element.get('type', '') == 'xhtml'
+    ctype = 'application/xhtml+xml' if xhtml else 'text/html'
+    entry.setdefault(key, []).append({'type': ctype, 'value': text})
+
+
+def _add_tag(entry, key, element, text):
+    term = {'term': text, 'scheme': element.get('domain'), 'label': None}
+    entry.setdefault(key, []).append(term)
+
+
+def _set_author(entry, key, element, text):
+    atom = len(element) > 0
+    text, detail = _get_author_detail(element if atom else text, atom)
+
+    # like feedparser, the last author wins but the first detail is kept
+    entry[key] = text
+
+    if detail:
+        entry.setdefault('author_detail', detail)
+
+
+def _set_date(entry, key, element, text):
+    entry[key] = text
+    tt = _get_date(text)
+    entry.update({'%s_parsed' % key: tt} if tt else {})
+
+
+def _set_text(entry, key, element, text):
+    if text or key not in entry:
+        entry[key] = text
+
+
+# Functions that set an entry key from an element (and its text)
+ENTRY_SETTERS = {
+    'content': _add_content,
+    'tags': _add_tag,
+    'author': _set_author,
+    'published': _set_date,
+    'updated': _set_date}
+
+
+def feed_entry2dict(element):
+    """Converts an RSS item or Atom entry element into a dict with the same
+    (essential) keys as feedparser's entries, e.g., 'title', 'link', 'id',
+    'summary', 'author', 'author_detail', and 'published_parsed'.
+
+    Args:
+        element (obj): The item or entry element
+
+    Returns:
+        dict: The entry
+
+    Examples:
+        >>> item = etree.fromstring(
+        ...     '<item><title>Hi</title><guid>http://a.com/1</guid>'
+        ...     '<author>jo@a.com (Jo)</author>'
+        ...     '<pubDate>Tue, 02 Dec 2014 10:30:00 GMT</pubDate></item>')
+        >>> entry = feed_entry2dict(item)
+        >>> entry['title'] == 'Hi'
+        True
+        >>> entry['link'] == 'http://a.com/1'
+        True
+        >>> entry['author_detail'] == {'name': 'Jo', 'email': 'jo@a.com'}
+        True
+        >>> tuple(entry['published_parsed'])
+        (2014, 12, 2, 10, 30, 0, 1, 336, 0)
+    """
+    entry, guidislink = {}, False
+
+    for child in element:
+        ns, tag = _split_tag(child.tag)
+        key = ENTRY_KEYS.get((ns, tag))
+
+        if not key:
+            continue
+        elif key == 'link':
+            _get_link(child, entry)
+            continue
+
+        setter = ENTRY_SETTERS.get(key, _set_text)
+        setter(entry, key, child, _get_text(child))
+
+        if tag == 'guid':
+            guidislink = child.get('isPermaLink', 'true') != 'false'
+
+    if guidislink and 'link' not in entry:
+        entry['link'] = entry['id']
+
+    if 'summary' not in entry and entry.get('content'):
+        entry['summary'] = entry['content'][0]['value']
+
+    entry['guidislink'] = guidislink
+    return entry
+
+
+def _remove_previous(element):
+    """Removes an element's previous siblings (lxml only)"""
+    try:
+        parent = element.getparent()
+    except AttributeError:
+        parent = None
+
+    while parent is not None and element.getprevious() is not None:
+        del parent[0]
+
+
+def gen_feed_entries(f):
+    """Incrementally parses an RSS or Atom feed, generating each entry as
+    soon as it is parsed. Parsed entries are cleared from the tree, so memory
+    use is proportional to the size of a single entry.
+
+    Args:
+        f (obj): A file like object
+
+    Yields:
+        dict: The feed entries (see `feed_entry2dict`)
+
+    Examples:
+        >>> from io import BytesIO
+        >>>
+        >>> f = BytesIO(
+        ...     b'<feed xmlns="http://www.w3.org/2005/Atom"><entry>'
+        ...     b'<title>Hi</title><link href="http://a.com/1"/></entry>'
+        ...     b'</feed>')
+        >>> entry = next(gen_feed_entries(f))
+        >>> entry['link'] == 'http://a.com/1'
+        True
+    """
+    depth = 0
+
+    for event, element in etree.iterparse(f, events=('start', 'end')):
+        is_entry = _split_tag(element.tag)[1] in ENTRY_TAGS
+
+        if event == 'start':
+            depth += is_entry
+        elif is_entry:
+            depth -= 1
+
+            if not depth:
+                yield feed_entry2dict(element)
+                element.clear()
+                _remove_previous(element)
+        elif not depth:
+            element.clear()
+
+
 def xpath(tree, path='/', pos=0, namespace=None):
     try:
         elements = tree.xpath(path)
@@ -159,6 +536,172 @@ def xml2etree(f, xml=True, html5=False):
     return element_tree
 
 
+def get_tags(path='', sep='/'):
+    """Converts a simple (absolute) xpath into a list of tag names. Only
+    paths consisting of child steps are supported.
+
+    Args:
+        path (str): The path, e.g., '/rss/channel/item'
+        sep (str): The path separator (default: '/')
+
+    Returns:
+        List[str]: The tag names (or None if the path isn't supported)
+
+    Examples:
+        >>> get_tags('/rss/channel/item') == ['rss', 'channel', 'item']
+        True
+        >>> get_tags('data.row', '.') == ['data', 'row']
+        True
+        >>> get_tags('//item') is None
+        True
+    """
+    stripped = path[1:] if path.startswith(sep) else path
+    tags = stripped.split(sep) if stripped else []
+    return tags if all(map(SIMPLE_TAG.match, tags)) else None
+
+
+def _localname(tag):
+    return tag.rsplit('}', 1)[-1].rsplit(':', 1)[-1]
+
+
+class ElementMatcher(object):
+    """Tracks the parser events of an XML document in order to find the
+    elements located at `tags`
+
+    Args:
+        tags (List[str]): The tag names (starting with the root element) of
+            the elements to find. Namespaces are ignored, and '*' matches any
+            tag.
+    """
+    def __init__(self, tags):
+        self.patterns = [_localname(tag) for tag in tags]
+        self.depth, self.level = len(self.patterns), 0
+        self.ancestors, self.matched = [], [True]
+
+    def update(self, event, element):
+        """Updates the state with a ('start' or 'end') parser event
+
+        Returns:
+            Tuple(bool, bool): Whether `element` is finished (and should be
+                released once it's no longer needed) and whether it's a
+                matching element
+        """
+        if event == 'start':
+            if self.level < self.depth:
+                tag = _localname(element.tag)
+                pattern = self.patterns[self.level]
+                is_match = self.matched[-1] and pattern in {'*', tag}
+                self.ancestors.append(element)
+                self.matched.append(is_match)
+
+            self.level += 1
+            return False, False
+
+        self.level -= 1
+
+        if self.level >= self.depth:
+            # a descendant of a matching element
+            return False, False
+
+        self.ancestors.pop()
+        return True, self.matched.pop() and self.level == self.depth - 1
+
+    def release(self, element):
+        """Clears a finished element and detaches it from its parent"""
+        element.clear()
+
+        if self.ancestors:
+            self.ancestors[-1].remove(element)
+
+
+def iterxml(f, tags):
+    """Incrementally parses an XML file, generating each element located at
+    `tags` as soon as its end tag is parsed. The element is then cleared
+    (once the next element is requested), so memory use is proportional to
+    the size of a single element rather than the entire document.
+
+    Args:
+        f (obj): A file like object
+        tags (List[str]): The tag names (starting with the root element) of
+            the elements to generate. Namespaces are ignored, and '*' matches
+            any tag.
+
+    Yields:
+        obj: The matching elements
+
+    Examples:
+        >>> from io import BytesIO
+        >>>
+        >>> f = BytesIO(b'<a><b><c>1</c><c>2</c></b><c>3</c></a>')
+        >>> [e.text for e in iterxml(f, ['a', 'b', 'c'])] == ['1', '2']
+        True
+        >>> f = BytesIO(b'<a><b><c>1</c><c>2</c></b><c>3</c></a>')
+        >>> [e.tag for e in iterxml(f, ['*', '*'])] == ['b', 'c']
+        True
+    """
+    matcher = ElementMatcher(tags)
+
+    for event, element in etree.iterparse(f, events=('start', 'end')):
+        finished, is_match = matcher.update(event, element)
+
+        if is_match:
+            yield element
+
+        if finished:
+            # the element is no longer needed
+            matcher.release(element)
+
+
+class XMLConsumer(object):
+    """Incrementally parses XML data as it is fed (e.g., as it arrives from
+    the network), collecting each element located at `tags`. Only the
+    unfinished elements are kept in memory.
+
+    Args:
+        tags (List[str]): The tag names of the elements to collect (see
+            `iterxml`)
+
+        transform (func): Converts the elements into items (default:
+            `etree2dict`)
+
+    Examples:
+        >>> consumer = XMLConsumer(['a', 'b', 'c'])
+        >>> consumer.feed(b'<a><b><c>1</c><c>')
+        >>> consumer.feed(b'2</c></b><c>3</c></a>')
+        >>> consumer.close() == ['1', '2']
+        True
+    """
+    def __init__(self, tags, transform=None):
+        self.parser = etree.XMLPullParser(events=('start', 'end'))
+        self.matcher = ElementMatcher(tags)
+        self.transform = transform or etree2dict
+        self.items = []
+
+    def _read_events(self):
+        for event, element in self.parser.read_events():
+            finished, is_match = self.matcher.update(event, element)
+
+            if is_match:
+                self.items.append(self.transform(element))
+
+            if finished:
+                self.matcher.release(element)
+
+    def feed(self, data):
+        self.parser.feed(data)
+        self._read_events()
+
+    def close(self):
+        """Finishes parsing
+
+        Returns:
+            List[obj]: The collected items
+        """
+        self.parser.close()
+        self._read_events()
+        return self.items
+
+
 def _make_content(i, value=None, tag='content', append=True, strip=False):
     content = i.get(tag)
 
@@ -196,17 +739,369 @@ def etree2dict(element):
     return i
 
 
-def any2dict(f, ext='xml', html5=False, path=None):
+class RecordingReader(object):
+    """A file like object that records the data read from `f` so that it can
+    be replayed"""
+    def __init__(self, f):
+        self.f = f
+        self.recorded = []
+
+    def read(self, size=-1):
+        chunk = self.f.read(size)
+        self.recorded.append(chunk)
+        return chunk
+
+    def replay(self):
+        return ReplayReader(self.f, self.recorded)
+
+
+class ReplayReader(object):
+    """A file like object that reads `recorded` before reading the rest of
+    `f`"""
+    def __init__(self, f, recorded):
+        self.f = f
+        self.buffered = recorded[0][:0].join(recorded) if recorded else None
+
+    def read(self, size=-1):
+        if self.buffered:
+            if size is None or size < 0:
+                chunk, self.buffered = self.buffered + self.f.read(), None
+            else:
+                chunk = self.buffered[:size]
+                self.buffered = self.buffered[size:]
+        else:
+            chunk = self.f.read(size)
+
+        return chunk
+
+
+def get_json_event(f, path=''):
+    """Finds the parser event of the JSON value located at `path` without
+    consuming `f`. Only the data up to the start of the value is read
+    (and buffered).
+
+    Args:
+        f (obj): A file like object
+        path (str): Dot separated path to the value (default: '', i.e., the
+            document root)
+
+    Returns:
+        Tuple(str, obj): The ijson event (e.g., 'start_array', 'start_map',
+            'string', or None if `path` wasn't found) and a file like object
+            containing all the data in `f`
+
+    Examples:
+        >>> from io import BytesIO
+        >>> f = BytesIO(b'{"value": {"items": [1, 2]}}')
+        >>> event, reader = get_json_event(f, 'value.items')
+        >>> event
+        'start_array'
+        >>> reader.read() == b'{"value": {"items": [1, 2]}}'
+        True
+    """
+    recorder = RecordingReader(f)
+    events = ijson.parse(recorder)
+    event = next((e for prefix, e, _ in events if prefix == path), None)
+    return event, recorder.replay()
+
+
+def gen_json_items(f, path=''):
+    """Lazily parses the JSON value located at `path`. If the value is an
+    array, its elements are generated one at a time. Otherwise the entire
+    value is generated.
+
+    Args:
+        f (obj): A file like object
+        path (str): Dot separated path to the value (default: '', i.e., the
+            document root)
+
+    Yields:
+        obj: The parsed value(s)
+
+    Examples:
+        >>> from io import BytesIO
+        >>> f = BytesIO(b'{"value": {"items": [{"a": 1}, {"a": 2}]}}')
+        >>> items = gen_json_items(f, 'value.items')
+        >>> next(items) == {'a': 1}
+        True
+        >>> next(items) == {'a': 2}
+        True
+        >>> f = BytesIO(b'{"value": {"items": [{"a": 1}, {"a": 2}]}}')
+        >>> next(gen_json_items(f, 'value')) == {'items': [{'a': 1}, {'a': 2}]}
+        True
+    """
+    event, reader = get_json_event(f, path)
+
+    if event == 'start_array':
+        prefix = '%s.item' % path if path else 'item'
+    else:
+        prefix = path
+
+    for item in ijson.items(reader, prefix):
+        yield item
+
+        if prefix == path:
+            break
+
+
+class JSONConsumer(object):
+    """Incrementally parses JSON data as it is fed (e.g., as it arrives from
+    the network), collecting the value located at `path`. If the value is an
+    array, its elements are collected one at a time (see `gen_json_items`).
+
+    Only the unparsed data is buffered if the ijson backend supports
+    coroutines (ijson >= 3). Otherwise, the data is buffered and parsed once
+    the consumer is closed.
+
+    Args:
+        path (str): Dot separated path to the value (default: '', i.e., the
+            document root)
+
+    Examples:
+        >>> consumer = JSONConsumer('value.items')
+        >>> consumer.feed(b'{"value": {"items": [{"a": 1}, ')
+        >>> consumer.feed(b'{"a": 2}]}}')
+        >>> consumer.close() == [{'a': 1}, {'a': 2}]
+        True
+        >>> consumer = JSONConsumer('value')
+        >>> consumer.feed(b'{"value": {"items": [1, 2]}}')
+        >>> consumer.close() == [{'items': [1, 2]}]
+        True
+    """
+    def __init__(self, path=''):
+        self.path = path
+        self.items = []
+        self.prefix = self.builder = None
+        self.done = False
+
+        if sendable_list and hasattr(ijson, 'parse_coro'):
+            self.events = sendable_list()
+            self.coro = ijson.parse_coro(self.events)
+            self.buffered = None
+        else:
+            self.buffered = BytesIO()
+
+    def _append(self, value):
+        self.items.append(value)
+        self.done = self.prefix == self.path
+
+    def _update(self, prefix, event, value):
+        starts, ends = {'start_map', 'start_array'}, {'end_map', 'end_array'}
+
+        if self.done:
+            return
+        elif self.builder:
+            self.depth += (event in starts) - (event in ends)
+
+            if self.depth:
+                self.builder.event(event, value)
+            else:
+                self._append(self.builder.value)
+                self.builder = None
+
+            return
+        elif self.prefix is None and prefix != self.path:
+            return
+        elif self.prefix is None and event == 'start_array':
+            self.prefix = '%s.item' % self.path if self.path else 'item'
+            return
+        elif self.prefix is None:
+            self.prefix = self.path
+
+        if prefix == self.prefix and event in starts:
+            self.builder, self.depth = ObjectBuilder(), 1
+            self.builder.event(event, value)
+        elif prefix == self.prefix and event not in ends:
+            self._append(value)
+
+    def _read_events(self):
+        for event in self.events:
+            self._update(*event)
+
+        del self.events[:]
+
+    def feed(self, data):
+        if self.buffered is not None:
+            self.buffered.write(data)
+        else:
+            self.coro.send(data)
+            self._read_events()
+
+    def close(self):
+        """Finishes parsing
+
+        Returns:
+            List[obj]: The collected items
+        """
+        if self.buffered is not None:
+            self.buffered.seek(0)
+            self.items = list(gen_json_items(self.buffered, self.path))
+        else:
+            self.coro.close()
+            self._read_events()
+
+        return self.items
+
+
+class CSVConsumer(object):
+    """Incrementally parses csv data as it is fed (e.g., as it arrives from
+    the network), collecting the same rows as `meza.io.read_csv`. Only the
+    last incomplete record is buffered.
+
+    Args:
+        encoding (str): The data encoding (default: ENCODING)
+        delimiter (str): Field delimiter (default: ',')
+        quotechar (str): Quote character (default: '"')
+        first_row (int): The number of lines to skip (default: 0)
+        has_header (bool): Has header row (default: True)
+        custom_header (List[str]): Custom header names (default: None)
+        sanitize (bool): Underscorify and lowercase field names
+            (default: False)
+
+        dedupe (bool): Deduplicate field names (default: False)
+
+    Examples:
+        >>> consumer = CSVConsumer(sanitize=True)
+        >>> consumer.feed(b'Some Name,Note\\r\\nfoo,"a\\r')
+        >>> consumer.feed(b'\\nb"\\r\\n,\\r\\nbar,c')
+        >>> consumer.close() == [
+        ...     {'some_name': 'foo', 'note': 'a\\nb'},
+        ...     {'some_name': 'bar', 'note': 'c'}]
+        True
+    """
+    def __init__(self, encoding=ENCODING, delimiter=',', quotechar='"',
+                 first_row=0, has_header=True, custom_header=None,
+                 sanitize=False, dedupe=False, **kwargs):
+        self.decoder = getincrementaldecoder(encoding)()
+        self.kwargs = {'delimiter': delimiter, 'quotechar': quotechar}
+        self.quotechar = quotechar
+        self.skip = first_row or 0
+        self.has_header = has_header
+        self.custom_header = custom_header
+        self.sanitize = sanitize
+        self.dedupe = dedupe
+        self.header = None
+        self.line = self.record = ''
+        self.rows = []
+
+    def _set_header(self, names):
+        if self.has_header or self.custom_header:
+            names = self.custom_header or names
+            stripped = (name for name in names if name.strip())
+            uscored = underscorify(stripped) if self.sanitize else stripped
+            self.header = list(dedupe(uscored) if self.dedupe else uscored)
+        else:
+            self.header = ['column_%i' % (n + 1) for n in range(len(names))]
+
+    def _parse(self, records):
+        for row in csv.reader(records, **self.kwargs):
+            if self.header is None:
+                self._set_header(row)
+
+                if self.has_header:
+                    continue
+
+            if row:
+                values = chain(row, repeat(None))
+                record = {k: v for k, v in zip(self.header, values) if k}
+
+                # skip empty rows
+                if any(v.strip() for v in record.values() if v):
+                    self.rows.append(record)
+
+    def _gen_records(self, lines):
+        for line in lines:
+            if self.skip:
+                self.skip -= 1
+                continue
+
+            self.record += line
+
+            # a quoted field may span several lines
+            if not self.record.count(self.quotechar) % 2:
+                yield self.record
+                self.record = ''
+
+    def _split(self, text, final=False):
+        # like a file opened with universal newlines
+        text = self.line + text
+        held = '\r' if text.endswith('\r') and not final else ''
+        text = text[:-1] if held else text
+        lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        self.line = lines.pop() + held
+        return ['%s\n' % line for line in lines]
+
+    def feed(self, data):
+        lines = self._split(self.decoder.decode(data))
+        self._parse(list(self._gen_records(lines)))
+
+    def close(self):
+        """Finishes parsing
+
+        Returns:
+            List[dict]: The collected rows
+        """
+        lines = self._split(self.decoder.decode(b'', True), True)
+        lines += [self.line] if self.line else []
+        records = list(self._gen_records(lines))
+
+        # an unbalanced quote runs to the end of the data
+        records += [self.record] if self.record else []
+        self.line = self.record = ''
+        self._parse(records)
+        return self.rows
+
+
+def any2consumer(ext='xml', path=None, iterparse=False):
+    """Creates a consumer that incrementally parses the same items as
+    `any2dict`, if the file type and options allow it.
+
+    Args:
+        ext (str): The file type
+        path (str): Dot separated path to the items
+        iterparse (bool): Incrementally parse XML files (default: False)
+
+    Returns:
+        obj: An `XMLConsumer` or `JSONConsumer` (or None if the items can't
+            be parsed incrementally)
+
+    Examples:
+        >>> consumer = any2consumer('json', 'value.items')
+        >>> consumer.feed(b'{"value": {"items": [{"a": 1}]}}')
+        >>> consumer.close() == [{'a': 1}]
+        True
+        >>> any2consumer('xml', 'channel.item') is None
+        True
+    """
+    path = path or ''
+    tags = get_tags(path, '.') if iterparse and ext == 'xml' else None
+
+    if tags is not None:
+        # the path is relative to the root element
+        consumer = XMLConsumer(['*'] + tags)
+    elif ext == 'json':
+        consumer = JSONConsumer(path)
+    else:
+        consumer = None
+
+    return consumer
+
+
+def any2dict(f, ext='xml', html5=False, path=None, iterparse=False):
     path = path or ''
+    tags = get_tags(path, '.') if iterparse and ext == 'xml' else None
 
-    if ext in {'xml', 'html'}:
+    if tags is not None:
+        # the path is relative to the root element
+        content = map(etree2dict, iterxml(f, ['*'] + tags))
+    elif ext in {'xml', 'html'}:
         xml = ext == 'xml'
         root = xml2etree(f, xml, html5).getroot()
         replaced = '/'.join(path.split('.'))
         tree = next(xpath(root, replaced)) if replaced else root
         content = etree2dict(tree)
     elif ext == 'json':
-        content = next(items(f, path))
+        content = gen_json_items(f, path)
     else:
         raise TypeError("Invalid file type: '%s'" % ext)
 
@@ -255,6 +1150,69 @@ def parse_conf(item, **kwargs):
     return objectified
 
 
+def is_item_dependent(conf):
+    """Determines whether parsing `conf` depends on the item, i.e., whether
+    `conf` references an item field (via 'subkey') or another pipe's output
+    (via 'terminal')
+
+    Examples:
+        >>> is_item_dependent({'find': 'a', 'replace': 'b'})
+        False
+        >>> is_item_dependent({'find': {'subkey': 'title'}})
+        True
+        >>> is_item_dependent({'value': {'terminal': 'date'}})
+        True
+    """
+    if hasattr(conf, 'keys'):
+        dependent = bool({'subkey', 'terminal'}.intersection(conf))
+        values = conf.values()
+    elif isinstance(conf, (list, tuple)):
+        dependent, values = False, conf
+    else:
+        dependent, values = False, []
+
+    return dependent or any(map(is_item_dependent, values))
+
+
+def get_conf_parser(conf=None, **kwargs):
+    """Creates a function that parses `conf` for a given item. Confs that
+    don't depend on the item are only parsed once.
+
+    Args:
+        conf (dict): The conf to parse
+        kwargs (dict): Keyword arguments passed to `parse_conf`
+
+    Returns:
+        func: A function of 1 arg (item) that returns the parsed `conf`
+
+    Examples:
+        >>> from riko.dotdict import DotDict
+        >>>
+        >>> item = DotDict({'title': 'b'})
+        >>> conf = DotDict({'find': 'a', 'replace': {'subkey': 'title'}})
+        >>> parse = get_conf_parser(conf, objectify=True)
+        >>> parse(item).replace == 'b'
+        True
+        >>> parse = get_conf_parser(DotDict({'find': 'a'}), objectify=True)
+        >>> parse(item).find == 'a'
+        True
+        >>> parse(item) is parse(item)
+        False
+    """
+    if is_item_dependent(conf):
+        parser = partial(parse_conf, conf=conf, **kwargs)
+    else:
+        parsed = parse_conf(None, conf=conf, **kwargs)
+
+        # pipes may change their conf, so each item gets its own copy
+        if isinstance(parsed, Objectify):
+            parser = lambda item: Objectify(parsed.data)
+        else:
+            parser = lambda item: copy(parsed)
+
+    return parser
+
+
 def get_skip(item, skip_if=None, **kwargs):
     item = item or {}
 
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# vim: sw=4:ts=4:expandtab
+"""
+riko.pools
+~~~~~~~~~~
+Provides a registry of named, persistent worker pools
+
+Pools are created the first time they are requested, and are then reused by
+every parallel pipe (or collection) that asks for the same name. All pools
+of the process wide `registry` are shut down when the interpreter exits. A
+PoolRegistry can also be used as a context manager to scope its pools to a
+block.
+
+Examples:
+    basic usage::
+
+        >>> from riko.pools import PoolRegistry, get_pool
+        >>>
+        >>> get_pool() is get_pool('default')
+        True
+        >>> get_pool(threads=False) is get_pool()
+        False
+        >>>
+        >>> with PoolRegistry() as pools:
+        ...     pool = pools.get('feeds', workers=2)
+        ...     pool.map(abs, [-1, -2])
+        ...     pools.get('feeds') is pool
+        [1, 2]
+        True
+        >>> pools.stats()
+        {}
+
+Attributes:
+    registry (obj): The PoolRegistry shared by all pipes in this process
+"""
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals)
+
+import atexit
+
+from multiprocessing import Pool, cpu_count
+from multiprocessing.dummy import Pool as ThreadPool
+from os import getpid
+from threading import Lock
+
+import pygogo as gogo
+
+from builtins import *  # noqa # pylint: disable=unused-import
+
+logger = gogo.Gogo(__name__, monolog=True).logger
+
+
+def get_pool_size(threads=True):
+    multiplier = 2 if threads else 1
+    return cpu_count() * multiplier
+
+
+class PoolRegistry(object):
+    """A collection of named thread and process pools that are created on
+    first use
+
+    Args:
+        workers (int): The default number of workers of a thread pool. A
+            process pool has half as many (default: twice the number of
+            cpus).
+    """
+    def __init__(self, workers=None):
+        self.workers = workers
+        self.pools = {}
+        self.pid = getpid()
+        self.lock = Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get(self, name='default', threads=True, workers=None):
+        """Returns a named pool (creating it if it doesn't exist)
+
+        Args:
+            name (str): The pool name (default: 'default')
+            threads (bool): Get a thread pool instead of a process pool
+                (default: True)
+
+            workers (int): The number of workers a newly created pool gets
+                (default: see `PoolRegistry`). An existing pool keeps its
+                size.
+
+        Returns:
+            obj: A multiprocessing(.dummy) Pool
+        """
+        key = (name, threads)
+
+        with self.lock:
+            if self.pid != getpid():
+                # a forked process can't use its parent's workers
+                self.pools, self.pid = {}, getpid()
+
+            if key not in self.pools:
+                if self.workers and not workers:
+                    workers = self.workers if threads else self.workers // 2
+
+                workers = workers or get_pool_size(threads)
+                pool_cls = ThreadPool if threads else Pool
+                self.pools[key] = pool_cls(workers or 1)
+                logger.debug('Created %s pool with %i workers', key, workers)
+
+        return self.pools[key]
+
+    def close(self, name=None):
+        """Shuts down the named pools (or all pools), waiting for any
+        running tasks to finish
+
+        Args:
+            name (str): The name of the pools to shut down (default: None,
+                i.e., all pools)
+        """
+        with self.lock:
+            if self.pid != getpid():
+                self.pools, self.pid = {}, getpid()
+
+            keys = [k for k in self.pools if name in {None, k[0]}]
+            pools = [self.pools.pop(k) for k in keys]
+
+        for pool in pools:
+            pool.close()
+            pool.join()
+
+    def stats(self):
+        """Returns the number of workers of each pool"""
+        return {
+            '%s (%s)' % (name, 'threads' if threads else 'processes'):
+            len(pool._pool) for (name, threads), pool in self.pools.items()}
+
+
+registry = PoolRegistry()
+atexit.register(registry.close)
+
+
+def get_pool(name='default', threads=True, workers=None):
+    """Returns a named pool of the process wide registry (see
+    `PoolRegistry.get`)
+    """
+    return registry.get(name, threads, workers)
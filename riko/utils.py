@@ -13,17 +13,24 @@ import sys
 import itertools as it
 import fcntl
 
-from math import isnan
+from math import isnan, ceil, log
+from collections import OrderedDict
+from decimal import Decimal
 from functools import partial
 from operator import itemgetter
-from os import O_NONBLOCK, path as p
+from os import O_NONBLOCK, getpid, path as p
 from io import BytesIO, StringIO, TextIOBase
+from threading import Lock
+from time import sleep
 
 from six.moves.urllib.request import urlopen
+from six.moves.urllib.error import URLError, HTTPError
 
 import requests
 import pygogo as gogo
 
+from requests.adapters import HTTPAdapter
+
 try:
     import __builtin__ as _builtins
 except ImportError:
@@ -37,11 +44,31 @@ from meza.compat import decode
 from meza.fntools import SleepyDict, dfilter
 from riko import ENCODING
 from riko.cast import cast
+from riko.httpcache import get_cache, get_validators, make_record
 
 logger = gogo.Gogo(__name__, verbose=False, monolog=True).logger
 
 DEF_NS = 'https://github.com/nerevu/riko'
 
+# The in-process caches of compiled regexes and rules are cleared once they
+# reach this size
+MAX_CACHED_RULES = 1024
+_REGEX_CACHE = {}
+_RULE_CACHE = {}
+
+RULE_KEYS = (
+    'field', 'match', 'replace', 'default', 'casematch', 'singlelinematch',
+    'singlematch', 'seriesmatch', 'offset')
+
+RESPLIT = re.compile(r'\$(\d+)')
+
+# The number of hosts to keep connection pools for, and the number of
+# connections to keep alive per host
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 16
+_SESSIONS = {}
+_SESSION_LOCK = Lock()
+
 
 def get_abspath(url):
     url = 'http://%s' % url if url and '://' not in url else url
@@ -93,6 +120,135 @@ class Chainable(object):
             return Chainable(self.method(args[0], self.data, **kwargs))
 
 
+class BloomFilter(object):
+    """A fixed size set-like object that may report false positives, but
+    never false negatives.
+
+    Args:
+        capacity (int): The number of items expected to be added. Adding more
+            items than this increases the false positive rate.
+
+        error_rate (float): The desired false positive rate at `capacity`
+            (default: 0.001).
+
+    Examples:
+        >>> bloom = BloomFilter(100)
+        >>> bloom.add('hello')
+        >>> 'hello' in bloom
+        True
+        >>> 'world' in bloom
+        False
+        >>> (bloom.num_bits, bloom.num_hashes)
+        (1438, 10)
+    """
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(int(capacity), 1)
+        num_bits = -capacity * log(error_rate) / pow(log(2), 2)
+        self.num_bits = int(ceil(num_bits))
+        self.num_hashes = max(int(round(num_bits / capacity * log(2))), 1)
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, value):
+        # Kirsch-Mitzenmacher double hashing
+        first = hash(value)
+        second = hash((value, self.num_bits)) | 1
+
+        for i in range(self.num_hashes):
+            yield (first + i * second) % self.num_bits
+
+    def add(self, value):
+        for pos in self._positions(value):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value):
+        positions = self._positions(value)
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in positions)
+
+
+def cached(cache, key, func, *args, **kwargs):
+    """Looks up `key` in a (bounded) cache, calling `func` on a miss
+
+    Args:
+        cache (dict): The cache
+        key (obj): The (hashable) cache key
+        func (func): Computes the value
+        args (tuple): Positional arguments passed to `func`
+        kwargs (dict): Keyword arguments passed to `func`
+
+    Returns:
+        obj: The cached value
+
+    Examples:
+        >>> cache = {}
+        >>> cached(cache, 'a', lambda: ['hello'])
+        ['hello']
+        >>> cached(cache, 'a', lambda: ['world'])
+        ['hello']
+    """
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+
+    if len(cache) >= MAX_CACHED_RULES:
+        cache.clear()
+
+    value = cache[key] = func(*args, **kwargs)
+    return value
+
+
+def get_regex(pattern, flags=0):
+    """Compiles a regex, caching the result
+
+    Examples:
+        >>> get_regex('[aeiou]').split('hello') == ['h', 'll', '']
+        True
+        >>> get_regex('[aiou]') is get_regex('[aiou]')
+        True
+    """
+    key = (pattern, flags)
+    return cached(_REGEX_CACHE, key, re.compile, pattern, flags)
+
+
+def get_rule_key(rule):
+    """Returns a hashable key identifying a regex rule definition
+
+    Examples:
+        >>> get_rule_key({'match': 'a'}) == get_rule_key({'match': 'a'})
+        True
+        >>> get_rule_key({'match': 'a'}) == get_rule_key({'match': 'b'})
+        False
+    """
+    return tuple(make_hashable(rule.get(k)) for k in RULE_KEYS)
+
+
+def make_hashable(value):
+    """Converts (nested) dicts, lists, and sets into hashable equivalents
+
+    Examples:
+        >>> make_hashable('hello') == 'hello'
+        True
+        >>> make_hashable({'a': [1, 2]}) == make_hashable({'a': [1, 2]})
+        True
+        >>> hash(make_hashable({'a': [1, {2}]})) is not None
+        True
+    """
+    try:
+        hash(value)
+    except TypeError:
+        if hasattr(value, 'keys'):
+            items = ((k, make_hashable(v)) for k, v in value.items())
+            hashable = ('dict', frozenset(items))
+        elif hasattr(value, 'issubset'):
+            hashable = ('set', frozenset(value))
+        else:
+            hashable = ('list', tuple(make_hashable(v) for v in value))
+    else:
+        hashable = value
+
+    return hashable
+
+
 def invert_dict(d):
     return {v: k for k, v in d.items()}
 
@@ -205,12 +361,16 @@ def get_response_content_type(response):
 
 
 def get_response_encoding(response, def_encoding=ENCODING):
-    info = response.info()
-
     try:
-        encoding = info.getencoding()
+        info = response.info()
     except AttributeError:
-        encoding = info.get_charset()
+        # a requests response
+        info = encoding = None
+    else:
+        try:
+            encoding = info.getencoding()
+        except AttributeError:
+            encoding = info.get_charset()
 
     encoding = None if encoding == '7bit' else encoding
 
@@ -229,6 +389,109 @@ def get_response_encoding(response, def_encoding=ENCODING):
     return extracted
 
 
+def get_session():
+    """Returns the requests session shared by all fetches in this process.
+    Its connections are kept alive and reused, so repeated requests to the
+    same host skip the TCP (and TLS) handshake.
+
+    Returns:
+        obj: A requests.Session instance
+
+    Examples:
+        >>> get_session() is get_session()
+        True
+    """
+    pid = getpid()
+
+    # a forked process must not share its parent's sockets
+    if pid not in _SESSIONS:
+        with _SESSION_LOCK:
+            if pid not in _SESSIONS:
+                session = requests.Session()
+                kwargs = {'pool_maxsize': POOL_MAXSIZE}
+                adapter = HTTPAdapter(POOL_CONNECTIONS, **kwargs)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _SESSIONS.clear()
+                _SESSIONS[pid] = session
+
+    return _SESSIONS[pid]
+
+
+def get_response(url, **kwargs):
+    """Sends a GET request with the shared session (see `get_session`).
+    Failures raise the same urllib errors that `urlopen` does, so callers
+    needn't know which library fetched the url.
+
+    Args:
+        url (str): The url to fetch
+        kwargs (dict): Keyword arguments passed to `requests.Session.get`
+
+    Returns:
+        obj: A requests.Response instance
+
+    Raises:
+        HTTPError: If the response status is an error (4xx or 5xx)
+        URLError: If the request fails, e.g., the host is unreachable
+
+    Examples:
+        >>> try:
+        ...     get_response('http://127.0.0.1:1/feed.xml', timeout=1)
+        ... except URLError:
+        ...     print('unreachable')
+        unreachable
+    """
+    try:
+        r = get_session().get(url, **kwargs)
+        r.raise_for_status()
+    except requests.HTTPError as e:
+        status = e.response.status_code
+        headers = e.response.headers
+        raise HTTPError(url, status, e.response.reason, headers, None)
+    except requests.RequestException as e:
+        raise URLError(e)
+
+    return r
+
+
+def get_pool_stats(session=None):
+    """Returns the connection pool statistics of a requests session
+
+    Args:
+        session (obj): A requests.Session instance (default: the shared
+            session, see `get_session`)
+
+    Returns:
+        dict: The number of hosts with a connection pool, `requests` made,
+            `connections` created, `open` (idle keep-alive) connections, and
+            the `reuse_ratio`, i.e., the fraction of requests that reused a
+            connection.
+
+    Examples:
+        >>> stats = get_pool_stats(requests.Session())
+        >>> stats['requests'], stats['reuse_ratio']
+        (0, 0)
+    """
+    session = session or get_session()
+    adapters = {id(a): a for a in session.adapters.values()}.values()
+    stats = {'hosts': 0, 'requests': 0, 'connections': 0, 'open': 0}
+
+    for adapter in adapters:
+        pools = adapter.poolmanager.pools
+
+        for key in pools.keys():
+            pool = pools[key]
+            idle = list(pool.pool.queue) if pool.pool else []
+            stats['hosts'] += 1
+            stats['requests'] += pool.num_requests
+            stats['connections'] += pool.num_connections
+            stats['open'] += sum(1 for c in idle if c and c.sock)
+
+    reused = stats['requests'] - stats['connections']
+    stats['reuse_ratio'] = reused / stats['requests'] if reused > 0 else 0
+    return stats
+
+
 # https://docs.python.org/3.3/reference/expressions.html#examples
 def auto_close(stream, f):
     try:
@@ -246,11 +509,15 @@ class fetch(TextIOBase):
 
         self.r = None
         self.ext = None
+        self.delay = delay
         self.context = SleepyDict(delay=delay) if delay else None
         self.decode = decode
         self.def_encoding = kwargs.get('encoding', ENCODING)
         self.cache_type = kwargs.get('cache_type')
         self.timeout = kwargs.get('timeout')
+        self.revalidate = kwargs.get('revalidate')
+        self.url = self.record = None
+        self.not_modified = False
 
         if self.cache_type:
             memoizer = memoize(**kwargs)
@@ -263,7 +530,7 @@ class fetch(TextIOBase):
 
         response = opener(get_abspath(url), **params)
         wrapper = StringIO if self.decode else BytesIO
-        f = wrapper(response) if self.cache_type else response
+        f = response if hasattr(response, 'read') else wrapper(response)
         self.close = f.close
         self.read = f.read
         self.readline = f.readline
@@ -280,11 +547,103 @@ class fetch(TextIOBase):
         self.r.close() if self.r else None
         self.close()
 
+    def get_items(self, key=''):
+        """Returns the items previously parsed from an unmodified response
+        (or None)
+
+        Args:
+            key (str): Identifies the parser (and its options)
+        """
+        if self.not_modified:
+            items = get_cache().get_items(self.record, key)
+        else:
+            items = None
+
+        return items
+
+    def tee_items(self, items, key=''):
+        """Yields the items parsed from the response, and caches them once
+        they have all been read (if the response can be revalidated).
+
+        Args:
+            items (Iter[dict]): The parsed items
+            key (str): Identifies the parser (and its options)
+        """
+        if self.record:
+            cached = []
+
+            for item in items:
+                cached.append(item)
+                yield item
+
+            self.set_items(cached, key)
+        else:
+            for item in items:
+                yield item
+
+    def set_items(self, items, key=''):
+        """Caches the items parsed from the response (if it can be
+        revalidated)
+
+        Args:
+            items (List[dict]): The parsed items
+            key (str): Identifies the parser (and its options)
+        """
+        if self.record:
+            get_cache().set_items(self.url, items, key)
+
+    def read_revalidated(self, r, cache, record=None):
+        """Reads the body of a conditional GET response, reusing the cached
+        body if the response is `304 Not Modified`, and caching it otherwise
+        (if it has a validator).
+
+        Args:
+            r (obj): The requests.Response
+            cache (obj): The HTTPCache
+            record (dict): The cache record the request was validated with
+
+        Returns:
+            Tuple(bytes, dict): The body and the (new) cache record
+        """
+        if record and r.status_code == 304:
+            cache.hits += 1
+            self.not_modified = True
+            text = record['body']
+
+            # a 304 response needn't repeat the entity headers
+            if record.get('content_type'):
+                r.headers['Content-Type'] = record['content_type']
+        else:
+            cache.misses += 1
+            text = r.content
+            record = make_record(self.url, r.headers, text)
+            cache.set(self.url, record) if record else None
+
+        return text, record
+
     def open(self, url, **params):
-        if url.startswith('http') and params:
-            r = requests.get(url, params=params, stream=True)
-            r.raw.decode_content = self.decode
-            response = r.text if self.cache_type else r.raw
+        self.url = url
+
+        if url.startswith('http'):
+            sleep(self.delay) if self.delay else None
+
+            # key the cache on the full url so each query gets its own record
+            prepared = requests.Request('GET', url, params=params).prepare()
+            self.url = prepared.url
+            cache = get_cache() if self.revalidate else None
+            record = cache.get(self.url) if cache else None
+            kwargs = {'stream': True, 'timeout': self.timeout}
+            kwargs['headers'] = get_validators(record)
+            r = get_response(self.url, **kwargs)
+            r.raw.decode_content = True
+
+            if cache:
+                text, record = self.read_revalidated(r, cache, record)
+            else:
+                text = r.content if self.cache_type else None
+
+            self.record = record
+            fp = body = r.raw
         else:
             try:
                 r = urlopen(url, context=self.context, timeout=self.timeout)
@@ -292,16 +651,17 @@ class fetch(TextIOBase):
                 r = urlopen(url, timeout=self.timeout)
 
             text = r.read() if self.cache_type else None
+            fp, body = r.fp, r
 
-            if self.decode:
-                encoding = get_response_encoding(r, self.def_encoding)
+        if self.decode:
+            encoding = get_response_encoding(r, self.def_encoding)
 
-                if text:
-                    response = decode(text, encoding)
-                else:
-                    response = reencode(r.fp, encoding, decode=True)
+            if text is None:
+                response = reencode(fp, encoding, decode=True)
             else:
-                response = text or r
+                response = decode(text, encoding)
+        else:
+            response = body if text is None else text
 
         content_type = get_response_content_type(r)
 
@@ -332,6 +692,91 @@ def def_itemgetter(attr, default=0, _type=None):
     return keyfunc
 
 
+def aggregate(stream, aggregates, keyfunc=None, valuefunc=None, sort=False):
+    """Computes aggregates of a stream in a single pass. Only the running
+    totals of each group are held in memory.
+
+    Args:
+        stream (Iter[dict]): The items to aggregate
+        aggregates (Seq[str]): The aggregates to compute. Any of 'count',
+            'sum', 'mean', 'min', or 'max'.
+
+        keyfunc (func): Receives an item and returns its group. If not set,
+            all items are put in a single group (default: None).
+
+        valuefunc (func): Receives an item and returns the value to aggregate.
+            Items whose value is None are counted, but otherwise ignored.
+            Values are converted to Decimal (default: None).
+
+        sort (bool): Order the groups by key instead of by when they were first
+            seen. Only the group keys are sorted, not the stream. Items missing
+            a group key are ordered first (default: False).
+
+    Returns:
+        OrderedDict: The aggregates of each group (keyed by `aggregates`)
+
+    Examples:
+        >>> stream = [
+        ...     {'amount': 2, 'x': 'two'},
+        ...     {'amount': 1, 'x': 'one'},
+        ...     {'amount': 4, 'x': 'two'},
+        ...     {'x': 'two'}]
+        >>> keyfunc, valuefunc = itemgetter('x'), lambda i: i.get('amount')
+        >>> aggregates = ['count', 'sum', 'mean', 'max']
+        >>> aggregated = aggregate(stream, aggregates, keyfunc, valuefunc)
+        >>> list(aggregated) == ['two', 'one']
+        True
+        >>> aggregated['two'] == {
+        ...     'count': 3, 'sum': Decimal('6'), 'mean': Decimal('3'),
+        ...     'max': Decimal('4')}
+        True
+        >>> aggregate(stream, ['count']) == {None: {'count': 4}}
+        True
+        >>> sorted_groups = aggregate(stream, ['count'], keyfunc, sort=True)
+        >>> list(sorted_groups) == ['one', 'two']
+        True
+    """
+    groups = OrderedDict()
+    keyfunc = keyfunc or (lambda item: None)
+
+    for item in stream:
+        key = keyfunc(item)
+
+        try:
+            totals = groups[key]
+        except KeyError:
+            totals = groups[key] = {
+                'count': 0, 'values': 0, 'sum': Decimal(0), 'min': None,
+                'max': None}
+
+        totals['count'] += 1
+        value = valuefunc(item) if valuefunc else None
+
+        if value is not None:
+            value = Decimal(value)
+            totals['values'] += 1
+            totals['sum'] += value
+
+            if totals['min'] is None or value < totals['min']:
+                totals['min'] = value
+
+            if totals['max'] is None or value > totals['max']:
+                totals['max'] = value
+
+    for totals in groups.values():
+        values = totals.pop('values')
+        totals['mean'] = totals['sum'] / values if values else None
+
+        for name in set(totals).difference(aggregates):
+            del totals[name]
+
+    if sort:
+        groupkey = lambda group: (group[0] is not None, group[0])
+        groups = OrderedDict(sorted(groups.items(), key=groupkey))
+
+    return groups
+
+
 # TODO: move this to meza.process.group
 def group_by(iterable, attr, default=None):
     keyfunc = def_itemgetter(attr, default)
@@ -474,8 +919,7 @@ def multi_substitute(word, rules):
     tuples = ((p, r['match']) for p, r in enumerate(rules))
     regexes = ('(?P<match_%i>%s)' % (p, r) for p, r in tuples)
     pattern = '|'.join(regexes)
-    regex = re.compile(pattern, flags)
-    resplit = re.compile('\$(\d+)')
+    regex = get_regex(pattern, flags)
 
     # For each match, look-up corresponding replace value in dictionary
     rules_in_series = filter(itemgetter('series'), rules)
@@ -529,8 +973,8 @@ def multi_substitute(word, rules):
             prev_name = name
             prev_is_series = series
 
-            if resplit.findall(rule['replace']):
-                splits = resplit.split(rule['replace'])
+            if RESPLIT.findall(rule['replace']):
+                splits = RESPLIT.split(rule['replace'])
                 words = _gen_words(match, splits)
             else:
                 splits = rule['replace']
@@ -544,7 +988,7 @@ def multi_substitute(word, rules):
             # print('name:', name)
             # print('prereplace:', rule['replace'])
             # print('splits:', splits)
-            # print('resplits:', resplit.findall(rule['replace']))
+            # print('resplits:', RESPLIT.findall(rule['replace']))
             # print('groups:', filter(None, match.groups()))
             # print('i:', i)
             # print('words:', words)
@@ -569,6 +1013,23 @@ def substitute(word, rule):
 
 
 def get_new_rule(rule, recompile=False):
+    """Converts a regex rule definition into the form used by `substitute`
+    and `multi_substitute`. The results are cached by rule definition, so
+    the same rule is only compiled once.
+
+    Examples:
+        >>> rule = {'field': 'content', 'match': 'a', 'replace': 'b'}
+        >>> new_rule = get_new_rule(rule, recompile=True)
+        >>> new_rule['match'].pattern == 'a'
+        True
+        >>> get_new_rule(dict(rule), recompile=True) is new_rule
+        True
+    """
+    key = (get_rule_key(rule), recompile)
+    return cached(_RULE_CACHE, key, _get_new_rule, rule, recompile)
+
+
+def _get_new_rule(rule, recompile=False):
     flags = 0 if rule.get('casematch') else re.IGNORECASE
 
     if not rule.get('singlelinematch'):
@@ -578,11 +1039,11 @@ def get_new_rule(rule, recompile=False):
     count = 1 if rule.get('singlematch') else 0
 
     if recompile and '$' in rule['replace']:
-        replace = re.sub('\$(\d+)', r'\\\1', rule['replace'], 0)
+        replace = RESPLIT.sub(r'\\\1', rule['replace'], 0)
     else:
         replace = rule['replace']
 
-    match = re.compile(rule['match'], flags) if recompile else rule['match']
+    match = get_regex(rule['match'], flags) if recompile else rule['match']
 
     nrule = {
         'match': match,
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# vim: sw=4:ts=4:expandtab
+"""
+tests.test_filter
+~~~~~~~~~~~~~~~~~
+
+Provides filter rule ordering tests.
+"""
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals)
+
+import nose.tools as nt
+
+from itertools import permutations
+
+from builtins import *  # noqa # pylint: disable=unused-import
+
+from riko.modules.filter import pipe
+
+ITEMS = [
+    {'x': 0}, {'x': 'a'}, {'x': 1.5}, {'x': '1.5'}, {'x': None}, {'x': [1]},
+    {'x': {'y': 1}}, {'x': '2015-01-01'}, {'x': 'Jan 1, 2010'}, {}]
+
+RULES = [
+    {'field': 'x', 'op': 'doesnotcontain', 'value': '1.5'},
+    {'field': 'x', 'op': 'contains', 'value': 'a'},
+    {'field': 'x', 'op': 'matches', 'value': ''},
+    {'field': 'x', 'op': 'matches', 'value': '^[0-9]'},
+    {'field': 'x', 'op': 'before', 'value': '2012-01-01'},
+    {'field': 'x', 'op': 'after', 'value': 'yesterday'},
+    {'field': 'x', 'op': 'greater', 'value': '1'},
+    {'field': 'x', 'op': 'atmost', 'value': 'a'},
+    {'field': 'x', 'op': 'is', 'value': '1.5'},
+    {'field': 'x', 'op': 'truthy', 'value': ''}]
+
+
+def check_order(rules, combine):
+    expected = None
+
+    for ordered in permutations(rules):
+        conf = {'rule': list(ordered), 'combine': combine}
+        filtered = list(pipe(ITEMS, conf=conf))
+
+        if expected is None:
+            expected = filtered
+
+        nt.assert_equal(filtered, expected, (ordered, combine))
+
+
+def test_rule_order():
+    """Tests that filtering doesn't depend on the order of the rules"""
+    for pos, rule in enumerate(RULES):
+        for other in RULES[pos + 1:]:
+            for combine in ['and', 'or']:
+                yield check_order, [rule, other], combine
+
+
+def test_mixed_types():
+    """Tests that a rule which can't handle a value doesn't raise"""
+    rules = [
+        {'field': 'x', 'op': 'doesnotcontain', 'value': '1.5'},
+        {'field': 'x', 'op': 'matches', 'value': ''}]
+
+    items = [{'x': 0}, {'x': 'a'}]
+    filtered = list(pipe(items, conf={'rule': rules, 'combine': 'and'}))
+    nt.assert_equal(filtered, [{'x': 'a'}])
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+# vim: sw=4:ts=4:expandtab
+"""
+tests.test_httpcache
+~~~~~~~~~~~~~~~~~~~~
+
+Provides conditional GET (HTTP cache) tests.
+"""
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals)
+
+import nose.tools as nt
+
+from hashlib import sha1
+from os import path as p
+from tempfile import mkdtemp
+from threading import Lock, Thread
+
+from builtins import *  # noqa # pylint: disable=unused-import
+from six.moves.BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from six.moves.urllib.parse import urlparse, parse_qs
+from six.moves.urllib.error import URLError, HTTPError
+
+from riko import httpcache, get_path
+from riko.bado import react, coroutine, _issync
+from riko.bado.io import async_url_parse, BufferConsumer
+from riko.httpcache import HTTPCache, get_cache, make_record
+from riko.modules import fetch, fetchdata, csv, fetchpage
+from riko.parsers import JSONConsumer, parse_rss
+from riko.utils import fetch as fetch_url
+
+DATA_DIR = p.dirname(get_path('feed.xml').replace('file://', ''))
+
+CONTENT_TYPES = {
+    'xml': 'application/rss+xml', 'json': 'application/json',
+    'csv': 'text/csv', 'html': 'text/html'}
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serves the riko data files with an ETag, and answers `304 Not
+    Modified` if the request's `If-None-Match` header matches it. The
+    `file` query parameter selects the file to serve instead of the path."""
+    counts = {200: 0, 304: 0, 404: 0}
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        filename = query['file'][0] if 'file' in query else parsed.path
+        filepath = p.join(DATA_DIR, filename.lstrip('/'))
+
+        if not p.exists(filepath):
+            self.counts[404] += 1
+            self.send_error(404)
+            return
+
+        with open(filepath, 'rb') as f:
+            body = f.read()
+
+        etag = '"%s"' % sha1(body).hexdigest()
+        ext = p.splitext(filepath)[1].lstrip('.')
+
+        if self.headers.get('If-None-Match') == etag:
+            self.counts[304] += 1
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+        else:
+            self.counts[200] += 1
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Type', CONTENT_TYPES[ext])
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def setup_module():
+    global server, base_url
+
+    httpcache.CACHE_DIR = mkdtemp()
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    base_url = 'http://127.0.0.1:%i/' % server.server_port
+    thread = Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+
+def teardown_module():
+    server.shutdown()
+    server.server_close()
+
+
+def check_revalidate(pipe, filename, conf):
+    url = base_url + filename
+    conf = dict(conf, url=url, revalidate=True)
+    cache = get_cache()
+    counts = dict(Handler.counts)
+    hits, misses = cache.hits, cache.misses
+
+    expected = list(pipe(conf=conf))
+    nt.assert_true(expected)
+    nt.assert_equal(Handler.counts[200], counts[200] + 1)
+    nt.assert_equal(cache.misses, misses + 1)
+
+    # corrupt the cached body so that only the cached items can be reused
+    record = cache.get(url)
+    record['body'] = b''
+    cache.set(url, record)
+
+    result = list(pipe(conf=conf))
+    nt.assert_equal(Handler.counts[304], counts[304] + 1)
+    nt.assert_equal(cache.hits, hits + 1)
+    nt.assert_equal(len(result), len(expected))
+    nt.assert_equal(result[0], expected[0])
+
+
+def test_revalidate():
+    """Tests that unmodified responses reuse the cached items"""
+    yield check_revalidate, fetch.pipe, 'feed.xml', {}
+    yield check_revalidate, fetch.pipe, 'gawker.xml', {'parser': 'lxml'}
+    conf = {'path': 'value.items'}
+    yield check_revalidate, fetchdata.pipe, 'gigs.json', conf
+    yield check_revalidate, csv.pipe, 'spreadsheet.csv', {}
+    conf = {'start': '<title>', 'end': '</title>'}
+    yield check_revalidate, fetchpage.pipe, 'cnn.html', conf
+
+
+def test_validators():
+    """Tests that the cached validators are sent"""
+    url = base_url + 'bbc.html'
+    counts = dict(Handler.counts)
+    conf = {'url': url, 'start': '<title>', 'end': '</title>'}
+    expected = next(fetchpage.pipe(conf=conf))
+
+    # without `revalidate` the full response is always fetched
+    next(fetchpage.pipe(conf=conf))
+    nt.assert_equal(Handler.counts[200], counts[200] + 2)
+
+    conf['revalidate'] = True
+    next(fetchpage.pipe(conf=conf))
+    nt.assert_equal(next(fetchpage.pipe(conf=conf)), expected)
+    nt.assert_equal(Handler.counts[200], counts[200] + 3)
+    nt.assert_equal(Handler.counts[304], counts[304] + 1)
+
+
+def test_params():
+    """Tests that requests with different params get their own record"""
+    url = base_url + 'data'
+    counts = dict(Handler.counts)
+    bodies = {}
+
+    for filename in ['feed.xml', 'gawker.xml']:
+        params = {'file': filename}
+
+        with fetch_url(url, params, revalidate=True) as f:
+            bodies[filename] = f.read()
+
+        with open(p.join(DATA_DIR, filename), 'rb') as f:
+            nt.assert_equal(bodies[filename], f.read())
+
+    for filename in ['feed.xml', 'gawker.xml']:
+        with fetch_url(url, {'file': filename}, revalidate=True) as f:
+            nt.assert_true(f.not_modified)
+            nt.assert_equal(f.read(), bodies[filename])
+
+    nt.assert_equal(Handler.counts[200], counts[200] + 2)
+    nt.assert_equal(Handler.counts[304], counts[304] + 2)
+
+
+def test_errors():
+    """Tests that failed requests raise urllib errors, and that feeds which
+    can't be fetched parse as empty"""
+    missing, unreachable = base_url + 'missing.xml', 'http://127.0.0.1:1/'
+
+    with nt.assert_raises(HTTPError) as context:
+        fetch_url(missing)
+
+    nt.assert_equal(context.exception.code, 404)
+    nt.assert_raises(URLError, fetch_url, unreachable, timeout=1)
+
+    for url in [missing, unreachable]:
+        parsed = parse_rss(url)
+        nt.assert_true(parsed['bozo'])
+        nt.assert_equal(list(parsed['entries']), [])
+
+
+def test_eviction():
+    """Tests that the least recently used responses are evicted"""
+    cache = HTTPCache(mkdtemp(), max_size=2500)
+    body = b'x' * 1000
+
+    for name in ['a', 'b', 'c']:
+        url = 'http://example.com/%s' % name
+        cache.set(url, make_record(url, {'ETag': name}, body))
+
+        if name == 'b':
+            # `a` is now more recently used than `b`
+            cache.get('http://example.com/a')
+
+    nt.assert_equal(cache.stats()['evictions'], 1)
+    nt.assert_true(cache.get('http://example.com/a'))
+    nt.assert_is_none(cache.get('http://example.com/b'))
+    nt.assert_true(cache.get('http://example.com/c'))
+    nt.assert_true(cache.stats()['size'] <= 2500)
+
+
+def test_unpicklable():
+    """Tests that items which can't be pickled aren't cached"""
+    cache = HTTPCache(mkdtemp())
+    url = 'http://example.com/a'
+    cache.set(url, make_record(url, {'ETag': 'a'}, b'x'))
+    cache.set_items(url, [{'lock': Lock()}])
+    record = cache.get(url)
+    nt.assert_equal(record['body'], b'x')
+    nt.assert_is_none(cache.get_items(record))
+
+
+def test_async():
+    """Tests that async responses are parsed as they arrive, and that error
+    pages fail instead of being parsed or cached"""
+    if _issync:
+        return
+
+    from twisted.web.error import Error
+
+    results = {}
+
+    @coroutine
+    def run(reactor):
+        url = base_url + 'countries.csv'
+        rows = yield csv.async_pipe(conf={'url': url, 'revalidate': True})
+        results['csv'] = list(rows)
+
+        url = base_url + 'gigs.json'
+        consumer = JSONConsumer('value.items')
+        results['json'] = yield async_url_parse(url, consumer)
+
+        try:
+            yield async_url_parse(base_url + 'missing.xml', BufferConsumer())
+        except Error as e:
+            results['error'] = e
+
+    counts = dict(Handler.counts)
+
+    try:
+        react(run)
+    except SystemExit:
+        pass
+
+    conf = {'url': base_url + 'countries.csv'}
+    nt.assert_true(results['csv'])
+    nt.assert_equal(results['csv'], list(csv.pipe(conf=conf)))
+
+    conf = {'url': base_url + 'gigs.json', 'path': 'value.items'}
+    nt.assert_equal(results['json'], list(fetchdata.pipe(conf=conf)))
+
+    nt.assert_equal(results['error'].status, b'404')
+    nt.assert_equal(Handler.counts[404], counts[404] + 1)
+    nt.assert_is_none(get_cache().get(base_url + 'missing.xml'))
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# vim: sw=4:ts=4:expandtab
+"""
+tests.test_parsers
+~~~~~~~~~~~~~~~~~~
+
+Provides feed, csv, and xml parser conformance tests.
+"""
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals)
+
+import feedparser
+import nose.tools as nt
+
+from io import open
+from unittest import SkipTest
+
+from builtins import *  # noqa # pylint: disable=unused-import
+from chardet import detect
+from meza.compat import decode
+from meza.io import read_csv
+
+from riko import get_path
+from riko.bado import _issync
+from riko.bado.sux import XMLParser, ParseError
+from riko.parsers import parse_rss, CSVConsumer
+from riko.utils import gen_entries
+
+FEEDS = [
+    'Politik.xml',
+    'TheEdTechie.xml',
+    'Topthemen.xml',
+    'autoblog.xml',
+    'bbci.co.uk.xml',
+    'delicious.xml',
+    'feed.xml',
+    'fourtitude.xml',
+    'gawker.xml',
+    'greenhughes.xml',
+    'health.xml',
+    'ouseful.xml',
+    'ouseful_feedburner.xml',
+    'psychemedia_delicious.xml',
+    'psychemedia_slideshare.xml',
+    'topstories.xml',
+    'yodel.xml']
+
+KEYS = ['id', 'link', 'author', 'author.name']
+
+CSV_FILES = [
+    'countries.csv', 'currencies.csv', 'spreadsheet.csv', 'status.csv']
+CSV_OPTS = [
+    {}, {'sanitize': True, 'dedupe': True}, {'first_row': 1},
+    {'has_header': False}, {'custom_header': ['a', 'b', 'c']}]
+
+MARKUP_FILES = [
+    'bbc.html', 'caltrain.html', 'cnn.html', 'sciencedaily.html',
+    'users.jyu.fi.html'] + FEEDS + [
+    'capnorth.xml', 'places.xml', 'podcast.xml', 'schools.xml',
+    'scotland.xml', 'yql.xml']
+
+
+def record(name):
+    def callback(self, *args):
+        self.events.append((name, args, self.saveMark()))
+
+    return callback
+
+
+class RecordingParser(XMLParser):
+    """An XMLParser that records each callback along with its mark"""
+    gotTagStart = record('gotTagStart')
+    gotText = record('gotText')
+    gotEntityReference = record('gotEntityReference')
+    gotComment = record('gotComment')
+    gotCData = record('gotCData')
+    gotDoctype = record('gotDoctype')
+    gotTagEnd = record('gotTagEnd')
+
+    def connectionMade(self):
+        super(RecordingParser, self).connectionMade()
+        self.events = []
+
+
+def normalize(text):
+    return ' '.join(text.split()) if text else text
+
+
+def check_feed(filename):
+    url = get_path(filename)
+    expected = list(gen_entries(feedparser.parse(url)))
+    entries = list(gen_entries(parse_rss(url, parser='lxml')))
+    nt.assert_equal(len(entries), len(expected), filename)
+
+    for entry, exp in zip(entries, expected):
+        nt.assert_equal(normalize(entry['title']), normalize(exp['title']))
+
+        for key in KEYS:
+            nt.assert_equal(entry.get(key), exp.get(key), (filename, key))
+
+        # feedparser gives up on some dates, e.g., 'May 11, 2012 10:01:00 EST'
+        if exp['pubDate']:
+            nt.assert_equal(entry['pubDate'], exp['pubDate'], filename)
+
+        nt.assert_equal('summary' in entry, 'summary' in exp, filename)
+
+
+def test_lxml_feeds():
+    """Tests that the lxml feed parser agrees with feedparser"""
+    for filename in FEEDS:
+        yield check_feed, filename
+
+
+def check_csv(filename, chunk_size):
+    filepath = get_path(filename).replace('file://', '')
+
+    with open(filepath, 'rb') as f:
+        data = f.read()
+
+    for opts in CSV_OPTS:
+        expected = list(read_csv(filepath, encoding='utf-8', **opts))
+        consumer = CSVConsumer(**opts)
+
+        for pos in range(0, len(data), chunk_size):
+            consumer.feed(data[pos:pos + chunk_size])
+
+        nt.assert_equal(consumer.close(), expected, (filename, opts))
+
+
+def test_csv_consumer():
+    """Tests that the csv consumer agrees with meza's csv reader"""
+    for filename in CSV_FILES:
+        for chunk_size in [1, 3, 7, 1024]:
+            yield check_csv, filename, chunk_size
+
+
+def parse_events(content, chunk_size, **kwargs):
+    parser = RecordingParser(**kwargs)
+    parser.encoding = 'utf-8'
+    parser.makeConnection(None)
+
+    try:
+        for pos in range(0, len(content), chunk_size):
+            parser.dataReceived(content[pos:pos + chunk_size])
+
+        parser.connectionLost(None)
+    except ParseError as e:
+        parser.events.append(('ParseError', e.args))
+
+    return parser.events
+
+
+def check_scan(filename, chunk_size):
+    filepath = get_path(filename).replace('file://', '')
+
+    with open(filepath, 'rb') as f:
+        data = f.read()
+
+    content = decode(data, detect(data)['encoding'])
+
+    for lenient in [False, True]:
+        kwargs = {'lenient': lenient}
+        expected = parse_events(content, chunk_size, scan=False, **kwargs)
+        events = parse_events(content, chunk_size, **kwargs)
+        nt.assert_equal(events, expected, (filename, chunk_size, lenient))
+
+
+def test_sux_scan():
+    """Tests that sux's character run scanners agree with its byte loop"""
+    if _issync:
+        # sux parsers are twisted protocols
+        raise SkipTest('Twisted is not installed')
+
+    for filename in MARKUP_FILES:
+        for chunk_size in [1, 3, 7, 1024]:
+            yield check_scan, filename, chunk_size